@@ -0,0 +1,80 @@
+"""Plain HTTP routes served next to the Reflex backend."""
+
+import logging
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.business_date import business_today
+from app.client_index import get_client_index
+from app.contract_store import get_contract_store
+from app.exporter import iter_export_rows, stream_csv, stream_jsonl
+from app.metrics import render_metrics
+from app.repository import get_repository
+from app.signing import verify
+from app.sync import get_cache_sync
+from app.var_profiler import PROFILE_VARS, VAR_PROFILE_SCOPE, var_profile
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson"}
+
+
+async def export_portfolio(request: Request) -> Response:
+    """Streams the client portfolio as CSV or JSONL for a signed export link."""
+    payload = verify(request.query_params.get("token", ""))
+    if payload is None or payload.get("format") not in EXPORT_MEDIA_TYPES:
+        return PlainTextResponse(
+            "Link de exportação inválido ou expirado.", status_code=403
+        )
+    get_cache_sync().sync()
+    logging.info(f"Portfolio export ({payload['format']}) by {payload.get('user')}.")
+    rows = iter_export_rows(
+        get_repository(),
+        get_contract_store(),
+        get_client_index(),
+        search=payload.get("search", ""),
+        sort_field=payload.get("sort") or None,
+        descending=bool(payload.get("descending")),
+    )
+    encode = stream_csv if payload["format"] == "csv" else stream_jsonl
+    filename = f"portfolio-{business_today().isoformat()}.{payload['format']}"
+    return StreamingResponse(
+        encode(rows),
+        media_type=EXPORT_MEDIA_TYPES[payload["format"]],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def metrics(request: Request) -> Response:
+    """Serves this worker's handler and login throttle metrics to Prometheus."""
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+async def var_profile_report(request: Request) -> Response:
+    """Serves the computed-var profile; a POST also starts a new one after.
+
+    Requires a token from ``python -m app.var_profiler``.
+    """
+    if not PROFILE_VARS:
+        return PlainTextResponse(
+            "Set CADASTRO_PROFILE_VARS=1 to profile computed vars.", status_code=404
+        )
+    payload = verify(request.query_params.get("token", ""))
+    if payload is None or payload.get("scope") != VAR_PROFILE_SCOPE:
+        return PlainTextResponse("Token inválido ou expirado.", status_code=403)
+    report = var_profile.report()
+    if request.method == "POST":
+        var_profile.reset()
+    return PlainTextResponse(report)
+
+
+api = Starlette(
+    routes=[
+        Route("/api/export", export_portfolio),
+        Route("/metrics", metrics),
+        Route("/admin/var-profile", var_profile_report, methods=["GET", "POST"]),
+    ]
+)
@@ -4,12 +4,18 @@ from app.states.base_state import BaseState
 from app.states.client_detail_state import ClientDetailState
 from app.states.client_detail_state import ClientDetailState
 from app.states.client_state import ClientState
+from app.states.audit_state import AuditState
 from app.pages.login import login_page
 from app.pages.register import register_page
 from app.pages.dashboard import dashboard_page
 from app.pages.clients_page import clients_page
 from app.pages.audit_trail_page import audit_trail_page
 from app.pages.client_detail_page import client_detail_page
+from app.api import api
+from app.contract_store import run_daily_rollover_task
+from app.middleware import LOG_DELTA_SIZES, DeltaSizeMiddleware
+from app.sync import CacheSyncMiddleware
+from app.var_profiler import PROFILE_VARS, VarProfileMiddleware, enable_var_profiling
 
 
 def index() -> rx.Component:
@@ -20,9 +26,9 @@ def index() -> rx.Component:
     return rx.cond(AuthState.is_authenticated, dashboard_page(), login_page())
 
 
-auth_and_migrate = [BaseState.require_login, ClientState.run_migration_if_needed]
 app = rx.App(
     theme=rx.theme(appearance="light"),
+    api_transformer=api,
     head_components=[
         rx.el.link(rel="preconnect", href="https://fonts.googleapis.com"),
         rx.el.link(rel="preconnect", href="https://fonts.gstatic.com", cross_origin=""),
@@ -32,11 +38,28 @@ app = rx.App(
         ),
     ],
 )
-app.add_page(index, route="/", on_load=auth_and_migrate)
+app.register_lifespan_task(run_daily_rollover_task)
+app.add_middleware(CacheSyncMiddleware())
+if LOG_DELTA_SIZES:
+    app.add_middleware(DeltaSizeMiddleware())
+if PROFILE_VARS:
+    enable_var_profiling()
+    app.add_middleware(VarProfileMiddleware())
+app.add_page(
+    index, route="/", on_load=[BaseState.require_login, ClientState.load_dashboard]
+)
 app.add_page(login_page, route="/login")
 app.add_page(register_page, route="/register")
-app.add_page(clients_page, route="/clientes", on_load=auth_and_migrate)
-app.add_page(audit_trail_page, route="/audit-trail", on_load=auth_and_migrate)
+app.add_page(
+    clients_page,
+    route="/clientes",
+    on_load=[BaseState.require_login, ClientState.load_clients],
+)
+app.add_page(
+    audit_trail_page,
+    route="/audit-trail",
+    on_load=[BaseState.require_login, AuditState.load_audit_events],
+)
 app.add_page(
     client_detail_page,
     route="/clientes/[client_id]",
@@ -0,0 +1,134 @@
+import bisect
+import functools
+import heapq
+import threading
+from array import array
+from typing import Optional
+
+from app.audit_log import AuditLog, get_audit_log
+from app.text import tokenize
+
+SEARCH_FIELDS = ("user", "action", "client_name", "details")
+MAX_PREFIX = 4
+"""Prefixes up to this length get their own posting list."""
+
+
+@functools.lru_cache(maxsize=65536)
+def _token_keys(token: str) -> tuple[str, ...]:
+    """Returns the posting-list keys of one token: its short prefixes and itself."""
+    keys = [token[:length] for length in range(1, min(len(token), MAX_PREFIX) + 1)]
+    if len(token) > MAX_PREFIX:
+        keys.append(token)
+    return tuple(keys)
+
+
+class AuditIndex:
+    """Token/prefix inverted index over audit events, keyed by log sequence number.
+
+    Every accent-folded token of the searchable fields is indexed under its
+    prefixes of length 1..``MAX_PREFIX``, and tokens longer than that also
+    under the full token. Posting lists are ascending ``array("I")`` of
+    sequence numbers, since events are indexed in log order. A query token
+    matches events containing a word that starts with it; all query tokens
+    must match.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: dict[str, array] = {}
+        self._long_terms: list[str] = []
+        self._last_seq = -1
+
+    def __len__(self) -> int:
+        return self._last_seq + 1
+
+    def add(self, seq: int, event: dict):
+        """Indexes an event; events must be added in sequence order."""
+        with self._lock:
+            if seq <= self._last_seq:
+                return
+            keys: set[str] = set()
+            for field in SEARCH_FIELDS:
+                for token in tokenize(event.get(field) or ""):
+                    keys.update(_token_keys(token))
+            for key in keys:
+                postings = self._postings.get(key)
+                if postings is None:
+                    postings = self._postings[key] = array("I")
+                    if len(key) > MAX_PREFIX:
+                        bisect.insort(self._long_terms, key)
+                postings.append(seq)
+            self._last_seq = seq
+
+    def catch_up(self, audit_log: AuditLog):
+        """Indexes every event appended to the log after the last indexed one."""
+        with self._lock:
+            for seq, event in audit_log.iter_events(start=len(self)):
+                self.add(seq, event)
+
+    def _matches(self, token: str) -> list[int] | array:
+        """Returns the ascending sequence numbers of events matching a query token."""
+        if len(token) <= MAX_PREFIX:
+            return self._postings.get(token, array("I"))
+        start = bisect.bisect_left(self._long_terms, token)
+        stop = bisect.bisect_left(self._long_terms, token + "\uffff")
+        terms = self._long_terms[start:stop]
+        if len(terms) == 1:
+            return self._postings[terms[0]]
+        merged: list[int] = []
+        for seq in heapq.merge(*(self._postings[term] for term in terms)):
+            if not merged or merged[-1] != seq:
+                merged.append(seq)
+        return merged
+
+    def search(
+        self, query: str, limit: int, before: Optional[int] = None
+    ) -> Optional[list[int]]:
+        """Returns up to ``limit`` matching sequence numbers, newest first.
+
+        Only events older than ``before`` are returned when it is given.
+        Returns None when the query has no searchable tokens.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        with self._lock:
+            candidates = sorted(
+                (self._matches(token) for token in set(tokens)), key=len
+            )
+        driver, others = candidates[0], candidates[1:]
+        stop = len(driver) if before is None else bisect.bisect_left(driver, before)
+        results: list[int] = []
+        for position in range(stop - 1, -1, -1):
+            seq = driver[position]
+            if all(_contains(other, seq) for other in others):
+                results.append(seq)
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def _contains(postings, seq: int) -> bool:
+    position = bisect.bisect_left(postings, seq)
+    return position < len(postings) and postings[position] == seq
+
+
+def build_audit_index(audit_log: AuditLog) -> AuditIndex:
+    """Builds an index over every event currently in the log."""
+    index = AuditIndex()
+    index.catch_up(audit_log)
+    return index
+
+
+_audit_index: Optional[AuditIndex] = None
+_audit_index_lock = threading.Lock()
+
+
+def get_audit_index() -> AuditIndex:
+    """Returns the process-wide audit index, building it from the log on first use."""
+    global _audit_index
+    if _audit_index is None:
+        with _audit_index_lock:
+            if _audit_index is None:
+                _audit_index = build_audit_index(get_audit_log())
+    return _audit_index
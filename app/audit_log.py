@@ -0,0 +1,377 @@
+import contextlib
+import fcntl
+import json
+import os
+import threading
+import time
+from array import array
+from typing import Iterator, Optional
+
+AUDIT_LOG_DIR = os.environ.get("CADASTRO_AUDIT_LOG_DIR", "audit_log")
+SEGMENT_MAX_BYTES = int(
+    os.environ.get("CADASTRO_AUDIT_SEGMENT_BYTES", 64 * 1024 * 1024)
+)
+SEGMENT_MAX_AGE_SECONDS = int(
+    os.environ.get("CADASTRO_AUDIT_SEGMENT_AGE_SECONDS", 24 * 60 * 60)
+)
+
+_DATA_SUFFIX = ".jsonl"
+_INDEX_SUFFIX = ".idx"
+_LOCK_NAME = ".lock"
+_HEADER_SIZE = 8
+
+
+class _Segment:
+    """One log segment: a JSONL data file plus a packed uint64 offset index.
+
+    The index starts with the segment's creation time in microseconds. It is
+    written by ``create`` before the data file exists, so any segment found
+    in the directory already has it.
+    """
+
+    def __init__(self, directory: str, first_seq: int):
+        self.first_seq = first_seq
+        base = os.path.join(directory, f"{first_seq:020d}")
+        self.data_path = base + _DATA_SUFFIX
+        self.index_path = base + _INDEX_SUFFIX
+        self.offsets: Optional[array] = None
+        self.created: Optional[float] = None
+
+    def _header(self, created: float) -> bytes:
+        self.created = created
+        return array("Q", [int(created * 1_000_000)]).tobytes()
+
+    def create(self):
+        """Creates the segment's files, recording the current time as its creation."""
+        with open(self.index_path, "wb") as f:
+            f.write(self._header(time.time()))
+        open(self.data_path, "ab").close()
+        self.offsets = array("Q")
+
+    def load_offsets(self) -> array:
+        if self.offsets is None:
+            self.offsets = array("Q")
+            self.refresh_offsets()
+        return self.offsets
+
+    def refresh_offsets(self):
+        """Reads offsets other processes appended to the index file since."""
+        offsets = self.load_offsets()
+        try:
+            size = os.path.getsize(self.index_path)
+        except FileNotFoundError:
+            return
+        if size < _HEADER_SIZE:
+            return
+        with open(self.index_path, "rb") as f:
+            if self.created is None:
+                (created,) = array("Q", f.read(_HEADER_SIZE))
+                self.created = created / 1_000_000
+            known = _HEADER_SIZE + len(offsets) * 8
+            if size >= known + 8:
+                f.seek(known)
+                offsets.frombytes(f.read((size - known) // 8 * 8))
+
+    def repair(self):
+        """Rebuilds the offset index if a crash left it out of sync with the data."""
+        offsets = self.load_offsets()
+        size = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+        if self.created is not None:
+            if offsets:
+                with open(self.data_path, "rb") as f:
+                    f.seek(offsets[-1])
+                    f.readline()
+                    if f.tell() == size:
+                        return
+            elif size == 0:
+                return
+        rebuilt = array("Q")
+        with open(self.data_path, "rb") as f:
+            position = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                rebuilt.append(position)
+                position += len(line)
+        with open(self.data_path, "r+b") as f:
+            f.truncate(position)
+        # An index lost with its header can only be dated from now.
+        created = time.time() if self.created is None else self.created
+        with open(self.index_path, "wb") as f:
+            f.write(self._header(created) + rebuilt.tobytes())
+        self.offsets = rebuilt
+
+    def __len__(self) -> int:
+        return len(self.load_offsets())
+
+    def read(self, start: int, stop: int) -> list[dict]:
+        """Reads records ``[start, stop)`` by position within the segment.
+
+        Stops at the end of record ``stop - 1`` rather than at the end of the
+        file, which may already hold lines another process is still writing
+        or has not indexed yet.
+        """
+        offsets = self.load_offsets()
+        if start >= stop:
+            return []
+        with open(self.data_path, "rb") as f:
+            f.seek(offsets[start])
+            if stop < len(offsets):
+                chunk = f.read(offsets[stop] - offsets[start])
+            else:
+                chunk = f.read(offsets[stop - 1] - offsets[start]) + f.readline()
+        return [json.loads(line) for line in chunk.splitlines()[: stop - start]]
+
+    def read_positions(self, positions: list[int]) -> list[dict]:
+        """Reads individual records by position, seeking within one open file."""
+        offsets = self.load_offsets()
+        events = []
+        with open(self.data_path, "rb") as f:
+            for position in positions:
+                f.seek(offsets[position])
+                events.append(json.loads(f.readline()))
+        return events
+
+
+class AuditLog:
+    """Append-only, segmented on-disk audit log.
+
+    Each event is one JSON line appended to the active segment, and its byte
+    offset is appended to the segment's ``.idx`` file, so a write is a pair of
+    sequential appends. Segments rotate once they exceed a size or an age
+    limit, the age counting from the creation time recorded in the index so
+    that it survives restarts. Events are addressed by a global sequence
+    number (their position in the log); reading recent events only touches
+    the newest segment(s).
+
+    Several processes can share the directory: appends take an exclusive
+    ``flock`` and first catch up with what the others wrote, and ``refresh``
+    makes their events visible to readers. An offset is written after its
+    event and readers never read past the last offset they know of, so an
+    event is never visible before it is complete.
+    """
+
+    def __init__(
+        self,
+        directory: str = AUDIT_LOG_DIR,
+        max_segment_bytes: int = SEGMENT_MAX_BYTES,
+        max_segment_age: float = SEGMENT_MAX_AGE_SECONDS,
+    ):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+        self._lock_file = open(os.path.join(directory, _LOCK_NAME), "ab")
+        self._segments = [
+            _Segment(directory, seq) for seq in self._segment_seqs()
+        ] or [_Segment(directory, 0)]
+        self._directory_mtime = os.stat(directory).st_mtime_ns
+        with self._file_lock():
+            if not os.path.exists(self._segments[-1].data_path):
+                self._segments[-1].create()
+            self._segments[-1].repair()
+            self._open_active()
+
+    def _segment_seqs(self) -> list[int]:
+        return sorted(
+            int(name[: -len(_DATA_SUFFIX)])
+            for name in os.listdir(self.directory)
+            if name.endswith(_DATA_SUFFIX)
+        )
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Holds the directory's exclusive lock, shared with other processes."""
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def refresh(self):
+        """Makes events appended by other processes since the last call visible.
+
+        Costs two ``stat`` calls when nothing changed.
+        """
+        with self._lock:
+            mtime = os.stat(self.directory).st_mtime_ns
+            if mtime != self._directory_mtime:
+                self._directory_mtime = mtime
+                last = self._segments[-1].first_seq
+                added = [seq for seq in self._segment_seqs() if seq > last]
+                if added:
+                    self._segments[-1].refresh_offsets()
+                    self._segments.extend(
+                        _Segment(self.directory, seq) for seq in added
+                    )
+                    self._data_file.close()
+                    self._index_file.close()
+                    self._open_active()
+                    return
+            self._segments[-1].refresh_offsets()
+
+    def _open_active(self):
+        active = self._segments[-1]
+        self._data_file = open(active.data_path, "ab")
+        self._index_file = open(active.index_path, "ab")
+        self._active_size = self._data_file.tell()
+        active.load_offsets()
+        self._active_created = active.created
+
+    def _roll(self):
+        self._data_file.close()
+        self._index_file.close()
+        segment = _Segment(self.directory, self.next_seq)
+        segment.create()
+        self._segments.append(segment)
+        self._open_active()
+
+    def close(self):
+        with self._lock:
+            self._data_file.close()
+            self._index_file.close()
+            self._lock_file.close()
+
+    @property
+    def next_seq(self) -> int:
+        """The sequence number the next appended event will get."""
+        active = self._segments[-1]
+        return active.first_seq + len(active)
+
+    def __len__(self) -> int:
+        return self.next_seq
+
+    def append(self, event: dict) -> int:
+        """Appends an event and returns its sequence number."""
+        return self.append_many([event])[0]
+
+    def append_many(self, events: list[dict]) -> range:
+        """Appends events in order and returns their sequence numbers.
+
+        Events going to the same segment are written with one ``write`` per
+        file, under a single hold of the directory lock.
+        """
+        lines = [
+            (json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n")
+            .encode("utf-8")
+            for event in events
+        ]
+        with self._lock, self._file_lock():
+            self.refresh()
+            self._active_size = os.fstat(self._data_file.fileno()).st_size
+            first = self.next_seq
+            pending: list[bytes] = []
+            offsets = array("Q")
+            for line in lines:
+                if (len(self._segments[-1]) or offsets) and (
+                    self._active_size + len(line) > self.max_segment_bytes
+                    or time.time() - self._active_created > self.max_segment_age
+                ):
+                    self._write_active(pending, offsets)
+                    pending, offsets = [], array("Q")
+                    self._roll()
+                offsets.append(self._active_size)
+                pending.append(line)
+                self._active_size += len(line)
+            self._write_active(pending, offsets)
+            return range(first, self.next_seq)
+
+    def _write_active(self, lines: list[bytes], offsets: array):
+        if not lines:
+            return
+        self._data_file.write(b"".join(lines))
+        self._data_file.flush()
+        self._index_file.write(offsets.tobytes())
+        self._index_file.flush()
+        self._segments[-1].load_offsets().extend(offsets)
+
+    def _segment_position(self, seq: int) -> int:
+        low, high = 0, len(self._segments) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._segments[middle].first_seq <= seq:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def read_range(self, start: int, stop: int) -> list[dict]:
+        """Reads events with sequence numbers in ``[start, stop)``, oldest first."""
+        with self._lock:
+            start, stop = max(start, 0), min(stop, self.next_seq)
+            events: list[dict] = []
+            position = self._segment_position(start) if start < stop else 0
+            while start < stop:
+                segment = self._segments[position]
+                segment_stop = min(stop, segment.first_seq + len(segment))
+                events.extend(
+                    segment.read(
+                        start - segment.first_seq, segment_stop - segment.first_seq
+                    )
+                )
+                start = segment_stop
+                position += 1
+            return events
+
+    def read_many(self, seqs: list[int]) -> list[dict]:
+        """Reads the events with the given sequence numbers, in the given order."""
+        with self._lock:
+            by_segment: dict[int, list[int]] = {}
+            for seq in seqs:
+                if 0 <= seq < self.next_seq:
+                    by_segment.setdefault(self._segment_position(seq), []).append(seq)
+            found: dict[int, dict] = {}
+            for position, segment_seqs in by_segment.items():
+                segment = self._segments[position]
+                events = segment.read_positions(
+                    [seq - segment.first_seq for seq in segment_seqs]
+                )
+                found.update(zip(segment_seqs, events))
+        return [found[seq] for seq in seqs if seq in found]
+
+    def read(self, seq: int) -> Optional[dict]:
+        events = self.read_range(seq, seq + 1)
+        return events[0] if events else None
+
+    def tail(self, count: int) -> list[dict]:
+        """Returns the newest ``count`` events, newest first."""
+        stop = self.next_seq
+        return self.read_range(stop - count, stop)[::-1]
+
+    def iter_newest_first(
+        self, before: Optional[int] = None, batch_size: int = 1024
+    ) -> Iterator[tuple[int, dict]]:
+        """Yields ``(seq, event)`` from newest to oldest, optionally before a seq."""
+        stop = self.next_seq if before is None else min(before, self.next_seq)
+        while stop > 0:
+            start = max(0, stop - batch_size)
+            events = self.read_range(start, stop)
+            for offset in range(len(events) - 1, -1, -1):
+                yield start + offset, events[offset]
+            stop = start
+
+    def iter_events(
+        self, batch_size: int = 4096, start: int = 0
+    ) -> Iterator[tuple[int, dict]]:
+        """Yields ``(seq, event)`` from oldest to newest, optionally from a seq."""
+        stop = self.next_seq
+        while start < stop:
+            events = self.read_range(start, min(stop, start + batch_size))
+            for offset, event in enumerate(events):
+                yield start + offset, event
+            start += len(events)
+
+
+_audit_log: Optional[AuditLog] = None
+_audit_log_lock = threading.Lock()
+
+
+def get_audit_log() -> AuditLog:
+    """Returns the process-wide audit log, opening it on first use."""
+    global _audit_log
+    if _audit_log is None:
+        with _audit_log_lock:
+            if _audit_log is None:
+                _audit_log = AuditLog(AUDIT_LOG_DIR)
+    return _audit_log
@@ -0,0 +1,20 @@
+import datetime
+import os
+from zoneinfo import ZoneInfo
+
+BUSINESS_TIMEZONE = ZoneInfo(os.environ.get("CADASTRO_TIMEZONE", "America/Sao_Paulo"))
+"""Timezone whose calendar days renewal dates are counted in."""
+
+
+def business_today() -> datetime.date:
+    """Returns the current date in the business timezone."""
+    return datetime.datetime.now(BUSINESS_TIMEZONE).date()
+
+
+def seconds_until_next_day() -> float:
+    """Returns the seconds left until the next midnight in the business timezone."""
+    now = datetime.datetime.now(BUSINESS_TIMEZONE)
+    midnight = datetime.datetime.combine(
+        now.date() + datetime.timedelta(days=1), datetime.time(), BUSINESS_TIMEZONE
+    )
+    return (midnight - now).total_seconds()
@@ -0,0 +1,308 @@
+import bisect
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.repository import get_repository
+from app.text import fold_text, tokenize
+
+SEARCH_FIELDS = ("company_name", "contact_person", "contact_email")
+SORT_FIELDS = ("company_name", "contact_person", "contact_email", "bw_account_manager")
+RESULT_CACHE_SIZE = 32
+"""Ranked results kept for recent queries, so paging through them is cheap."""
+
+
+def _trigrams(word: str) -> set[str]:
+    """Returns the trigrams of a word padded like ``"  word "``."""
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _query_trigrams(token: str) -> set[str]:
+    """Returns the trigrams a query token needs.
+
+    Tokens of three or more characters match anywhere inside a word, so only
+    their inner trigrams are required; shorter tokens can only be matched as
+    word prefixes, through the front-padded trigrams.
+    """
+    if len(token) >= 3:
+        return {token[i : i + 3] for i in range(len(token) - 2)}
+    padded = f"  {token}"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _word_prefix(text: str, token: str) -> bool:
+    return text.startswith(token) or f" {token}" in text
+
+
+class ClientIndex:
+    """Trigram index over the searchable client fields.
+
+    Each client gets a small integer slot; every accent-folded word of its
+    searchable fields contributes its padded trigrams to a posting set of
+    slots. A query is tokenized the same way, candidate slots are the
+    intersection of the postings of its trigrams, and candidates are then
+    verified against the folded text and ranked, so only clients sharing
+    every query trigram are ever looked at.
+
+    For every sortable field it also keeps the folded sort key of each client
+    and a sorted list of ``(key, id)``, updated by bisection on every write,
+    so any page in any column order is a slice.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._postings: dict[str, set[int]] = {}
+        self._slots: dict[str, int] = {}
+        self._ids: list[Optional[str]] = []
+        self._names: list[str] = []
+        self._texts: list[str] = []
+        self._free: list[int] = []
+        self._results: OrderedDict[tuple, list[str]] = OrderedDict()
+        self._sort_keys: dict[str, dict[str, str]] = {f: {} for f in SORT_FIELDS}
+        self._orderings: dict[str, list[tuple[str, str]]] = {
+            f: [] for f in SORT_FIELDS
+        }
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def replace_all(self, clients: list[dict]):
+        """Drops every client and indexes ``clients`` instead."""
+        with self._lock:
+            self._reset()
+            self.add_many(clients)
+
+    def _document_trigrams(self, text: str) -> set[str]:
+        trigrams: set[str] = set()
+        for word in text.split():
+            trigrams |= _trigrams(word)
+        return trigrams
+
+    def add(self, client: dict):
+        """Indexes a client, replacing its previous entry if it has one."""
+        with self._lock:
+            self._unorder([client["id"]])
+            self._add(client)
+            for field in SORT_FIELDS:
+                entry = (self._sort_keys[field][client["id"]], client["id"])
+                bisect.insort(self._orderings[field], entry)
+
+    def add_many(self, clients: list[dict]):
+        """Indexes many clients, merging them into each column ordering at once.
+
+        The new entries are appended and the ordering re-sorted; since the
+        existing entries form one sorted run, this costs about
+        O(n + k log k) for k new clients rather than k insertions.
+        """
+        with self._lock:
+            client_ids = dict.fromkeys(client["id"] for client in clients)
+            self._unorder(client_ids)
+            for client in clients:
+                self._add(client)
+            for field in SORT_FIELDS:
+                keys = self._sort_keys[field]
+                ordering = self._orderings[field]
+                ordering.extend(
+                    (keys[client_id], client_id) for client_id in client_ids
+                )
+                ordering.sort()
+
+    def _add(self, client: dict):
+        """Indexes a client everywhere except in the column orderings."""
+        with self._lock:
+            self._remove(client["id"])
+            self._results.clear()
+            name = " ".join(tokenize(client.get("company_name") or ""))
+            text = " ".join(
+                token
+                for field in SEARCH_FIELDS
+                for token in tokenize(client.get(field) or "")
+            )
+            if self._free:
+                slot = self._free.pop()
+                self._ids[slot], self._names[slot], self._texts[slot] = (
+                    client["id"],
+                    name,
+                    text,
+                )
+            else:
+                slot = len(self._ids)
+                self._ids.append(client["id"])
+                self._names.append(name)
+                self._texts.append(text)
+            self._slots[client["id"]] = slot
+            for trigram in self._document_trigrams(text):
+                self._postings.setdefault(trigram, set()).add(slot)
+            for field in SORT_FIELDS:
+                self._sort_keys[field][client["id"]] = fold_text(
+                    client.get(field) or ""
+                )
+
+    def remove(self, client_id: str):
+        self.remove_many([client_id])
+
+    def remove_many(self, client_ids: list[str]):
+        """Removes many clients, filtering each column ordering only once."""
+        with self._lock:
+            self._unorder(client_ids)
+            for client_id in client_ids:
+                self._remove(client_id)
+
+    def _unorder(self, client_ids):
+        """Drops indexed clients from the column orderings.
+
+        A single client is found by bisection; several are dropped in one
+        pass over each ordering instead of one O(n) deletion apiece.
+        """
+        present = [client_id for client_id in client_ids if client_id in self._slots]
+        if len(present) == 1:
+            for field in SORT_FIELDS:
+                entry = (self._sort_keys[field][present[0]], present[0])
+                ordering = self._orderings[field]
+                position = bisect.bisect_left(ordering, entry)
+                if position < len(ordering) and ordering[position] == entry:
+                    del ordering[position]
+        elif present:
+            dropped = set(present)
+            for field in SORT_FIELDS:
+                self._orderings[field] = [
+                    entry
+                    for entry in self._orderings[field]
+                    if entry[1] not in dropped
+                ]
+
+    def _remove(self, client_id: str):
+        """Removes a client everywhere except from the column orderings."""
+        slot = self._slots.pop(client_id, None)
+        if slot is None:
+            return
+        self._results.clear()
+        for trigram in self._document_trigrams(self._texts[slot]):
+            postings = self._postings[trigram]
+            postings.discard(slot)
+            if not postings:
+                del self._postings[trigram]
+        self._ids[slot] = None
+        self._names[slot] = self._texts[slot] = ""
+        self._free.append(slot)
+        for field in SORT_FIELDS:
+            del self._sort_keys[field][client_id]
+
+    def ordered_page(
+        self, field: str, offset: int, limit: int, descending: bool = False
+    ) -> list[str]:
+        """Returns ``limit`` client ids from ``offset`` in ``field`` order."""
+        with self._lock:
+            ordering = self._orderings[field]
+            if descending:
+                stop = max(0, len(ordering) - offset)
+                window = ordering[max(0, stop - limit) : stop][::-1]
+            else:
+                window = ordering[offset : offset + limit]
+            return [client_id for _, client_id in window]
+
+    def search(
+        self,
+        query: str,
+        sort_field: Optional[str] = None,
+        descending: bool = False,
+    ) -> Optional[list[str]]:
+        """Returns the ids of matching clients, best match first.
+
+        Every query token must occur in one of the searchable fields. Matches
+        on the company name rank first: whole-name prefix, then word
+        prefixes, then substrings; ties are broken alphabetically. With a
+        ``sort_field`` the matches are ordered by that field instead. Returns
+        None when the query has no searchable tokens.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        folded = " ".join(tokens)
+        cache_key = (folded, sort_field, descending)
+        with self._lock:
+            cached = self._results.get(cache_key)
+            if cached is not None:
+                self._results.move_to_end(cache_key)
+                return cached
+            results = self._search(folded, tokens)
+            if sort_field:
+                keys = self._sort_keys[sort_field]
+                results.sort(
+                    key=lambda client_id: (keys[client_id], client_id),
+                    reverse=descending,
+                )
+            self._results[cache_key] = results
+            if len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+            return results
+
+    def _search(self, folded: str, tokens: list[str]) -> list[str]:
+        """Ranks matches for a query; callers hold the lock."""
+        postings = []
+        for trigram in set().union(*(_query_trigrams(t) for t in tokens)):
+            posting = self._postings.get(trigram)
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        texts = self._texts
+        if len(tokens) == 1 and len(tokens[0]) == 3:
+            matches = list(candidates)
+        else:
+            matches = [
+                slot
+                for slot in candidates
+                if all(
+                    token in texts[slot]
+                    if len(token) >= 3
+                    else _word_prefix(texts[slot], token)
+                    for token in tokens
+                )
+            ]
+        names = self._names
+        needles = [(token, f" {token}") for token in tokens]
+
+        def tier(slot: int) -> int:
+            name = names[slot]
+            if not all(token in name for token in tokens):
+                return 3
+            if name.startswith(folded):
+                return 0
+            if all(
+                name.startswith(token) or needle in name
+                for token, needle in needles
+            ):
+                return 1
+            return 2
+
+        # Two stable sorts instead of one on (tier, name) tuples, which
+        # would allocate a key tuple per match.
+        matches.sort(key=names.__getitem__)
+        matches.sort(key=tier)
+        return [self._ids[slot] for slot in matches]
+
+
+def build_client_index(clients: list[dict]) -> ClientIndex:
+    index = ClientIndex()
+    index.add_many(clients)
+    return index
+
+
+_client_index: Optional[ClientIndex] = None
+_client_index_lock = threading.Lock()
+
+
+def get_client_index() -> ClientIndex:
+    """Returns the process-wide client index, building it on first use."""
+    global _client_index
+    if _client_index is None:
+        with _client_index_lock:
+            if _client_index is None:
+                _client_index = build_client_index(get_repository().list_clients())
+    return _client_index
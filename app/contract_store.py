@@ -0,0 +1,397 @@
+import asyncio
+import datetime
+import logging
+import threading
+from typing import Iterable, Optional, Sequence
+
+from app.business_date import business_today, seconds_until_next_day
+from app.renewal_engine import RenewalEngine
+from app.renewal_index import RenewalIndex
+from app.repository import Repository, get_repository
+from app.service_aggregates import RENEWAL_WINDOW_DAYS, ServiceAggregates
+
+
+class ContractStore:
+    """Write-through, indexed in-memory view of contracts and services.
+
+    Contracts and services are kept in primary maps keyed by id, plus the
+    secondary indexes ``client_id -> contract ids`` and
+    ``contract_id -> service ids``. Every read and mutation touches only the
+    rows involved; each mutation is persisted to the repository first.
+    Rows are plain dicts with the ``Contract``/``Service`` shapes.
+
+    Active services are also kept in a ``RenewalIndex`` ordered by end date,
+    and every service's end date in a ``RenewalEngine`` for vectorized
+    days-remaining computations. Service counts by type and status are
+    kept in ``ServiceAggregates``, so the dashboard never scans the services.
+
+    Everything depending on the date is computed against ``today``, the
+    business date, which ``roll_over`` advances once per day. ``version`` is
+    bumped by every mutation, sync reload and rollover, whichever session or
+    worker caused it, so readers can compare it to drop what they derived
+    from older data.
+    """
+
+    def __init__(self, repository: Repository):
+        self.repository = repository
+        self._lock = threading.RLock()
+        self.today = business_today()
+        self.version = 0
+        self._load()
+
+    def _load(self):
+        self._contracts: dict[str, dict] = {}
+        self._services: dict[str, dict] = {}
+        self._contract_ids_by_client: dict[str, dict[str, None]] = {}
+        self._service_ids_by_contract: dict[str, dict[str, None]] = {}
+        self.aggregates = ServiceAggregates(self.today.toordinal())
+        self.renewals = RenewalIndex()
+        self.engine = RenewalEngine()
+        for contract in self.repository.list_contracts():
+            self._index_contract(contract)
+        services = self.repository.list_services()
+        for service in services:
+            self._index_service(service, renewals=False)
+        self.renewals.add_many(services)
+        self.engine.load(
+            [service["id"] for service in services],
+            (service["end_date"] for service in services),
+        )
+
+    def _index_contract(self, contract: dict):
+        self._contracts[contract["id"]] = contract
+        self._contract_ids_by_client.setdefault(contract["client_id"], {})[
+            contract["id"]
+        ] = None
+
+    def _unindex_contract(self, contract_id: str) -> Optional[dict]:
+        contract = self._contracts.pop(contract_id, None)
+        if contract:
+            siblings = self._contract_ids_by_client.get(contract["client_id"], {})
+            siblings.pop(contract_id, None)
+            if not siblings:
+                self._contract_ids_by_client.pop(contract["client_id"], None)
+        return contract
+
+    def _index_service(self, service: dict, renewals: bool = True):
+        self._services[service["id"]] = service
+        self._service_ids_by_contract.setdefault(service["contract_id"], {})[
+            service["id"]
+        ] = None
+        self.aggregates.add(service)
+        if renewals:
+            self.renewals.add(service)
+
+    def _unindex_service(self, service_id: str) -> Optional[dict]:
+        service = self._services.pop(service_id, None)
+        if service:
+            siblings = self._service_ids_by_contract.get(service["contract_id"], {})
+            siblings.pop(service_id, None)
+            if not siblings:
+                self._service_ids_by_contract.pop(service["contract_id"], None)
+            self.aggregates.remove(service)
+            self.renewals.remove(service_id)
+            self.engine.remove(service_id)
+        return service
+
+    def _unindex_contract_cascade(self, contract_id: str) -> Optional[dict]:
+        for service_id in list(self._service_ids_by_contract.get(contract_id, ())):
+            self._unindex_service(service_id)
+        return self._unindex_contract(contract_id)
+
+    def get_contract(self, contract_id: str) -> Optional[dict]:
+        with self._lock:
+            contract = self._contracts.get(contract_id)
+            return dict(contract) if contract else None
+
+    def get_service(self, service_id: str) -> Optional[dict]:
+        with self._lock:
+            service = self._services.get(service_id)
+            return dict(service) if service else None
+
+    def contracts_for_client(self, client_id: str) -> list[dict]:
+        """Returns the client's contracts ordered by contract number."""
+        with self._lock:
+            contracts = [
+                dict(self._contracts[contract_id])
+                for contract_id in self._contract_ids_by_client.get(client_id, ())
+            ]
+        return sorted(contracts, key=lambda c: c["contract_number"])
+
+    def services_for_contract(self, contract_id: str) -> list[dict]:
+        with self._lock:
+            return [
+                dict(self._services[service_id])
+                for service_id in self._service_ids_by_contract.get(contract_id, ())
+            ]
+
+    def services_for_client(self, client_id: str) -> list[dict]:
+        with self._lock:
+            return [
+                dict(self._services[service_id])
+                for contract_id in self._contract_ids_by_client.get(client_id, ())
+                for service_id in self._service_ids_by_contract.get(contract_id, ())
+            ]
+
+    def days_remaining(
+        self, service_ids: Iterable[str], today: Optional[datetime.date] = None
+    ) -> dict[str, int]:
+        """Maps the given service ids to their days remaining until the end date."""
+        with self._lock:
+            today = today or self.today
+            return self.engine.days_remaining(today.toordinal(), service_ids)
+
+    def count_active_services(self) -> int:
+        with self._lock:
+            return self.aggregates.count(status="ativo")
+
+    def count_services_by_type(self, status: Optional[str] = None) -> dict[str, int]:
+        """Maps each service type to its number of services with ``status``."""
+        with self._lock:
+            return self.aggregates.by_service_type(status)
+
+    def count_services_by_status(self) -> dict[str, int]:
+        with self._lock:
+            return self.aggregates.by_status()
+
+    def renewal_counts(self) -> dict[str, int]:
+        """Counts active services per renewal bucket as of ``today``."""
+        with self._lock:
+            return self.aggregates.renewal_counts()
+
+    def roll_over(self, today: datetime.date) -> bool:
+        """Moves the store to a new business date.
+
+        Recounts the renewal buckets for the new date in one batch of range
+        counts over the renewal index and bumps ``version``. Returns
+        whether the date changed.
+        """
+        with self._lock:
+            if today == self.today:
+                return False
+            first = today.toordinal()
+            last = first + RENEWAL_WINDOW_DAYS
+            self.today = today
+            self.aggregates.roll_over(
+                first,
+                {
+                    "expired": self.renewals.count_between(None, first - 1),
+                    "due": self.renewals.count_between(first, last),
+                    "later": self.renewals.count_between(last + 1, None),
+                    "no_end_date": self.aggregates.count(status="ativo")
+                    - len(self.renewals),
+                },
+            )
+            self.version += 1
+            return True
+
+    def check_aggregates(self) -> list[str]:
+        """Rebuilds the aggregates from the repository and lists any differences.
+
+        Compares the service counts and the renewal index maintained in memory
+        with ones built from scratch; an empty list means they agree.
+        """
+        with self._lock:
+            services = self.repository.list_services()
+            rebuilt = ServiceAggregates.from_services(services, self.today.toordinal())
+            expected = rebuilt.snapshot()
+            actual = self.aggregates.snapshot()
+            mismatches = []
+            for key in sorted(expected.keys() | actual.keys()):
+                if actual.get(key, 0) != expected.get(key, 0):
+                    mismatches.append(
+                        f"{key[0]}/{key[1]}: {actual.get(key, 0)} in memory, "
+                        f"{expected.get(key, 0)} in the repository"
+                    )
+            expected_renewals = rebuilt.renewal_counts()
+            for bucket, count in self.aggregates.renewal_counts().items():
+                if count != expected_renewals[bucket]:
+                    mismatches.append(
+                        f"renewal bucket {bucket}: {count} in memory, "
+                        f"{expected_renewals[bucket]} in the repository"
+                    )
+            renewals = RenewalIndex()
+            renewals.add_many(services)
+            if self.renewals.between(None, None) != renewals.between(None, None):
+                mismatches.append(
+                    f"renewal index: {self.renewals.count_between(None, None)} "
+                    f"entries in memory, {renewals.count_between(None, None)} "
+                    "expected from the repository"
+                )
+        return mismatches
+
+    def renewals_between(
+        self, first: Optional[int], last: Optional[int], limit: Optional[int] = None
+    ) -> list[tuple[int, dict, dict]]:
+        """Lists ``(end ordinal, service, contract)`` ending between two ordinals."""
+        with self._lock:
+            return [
+                (
+                    ordinal,
+                    dict(self._services[service_id]),
+                    dict(
+                        self._contracts.get(
+                            self._services[service_id]["contract_id"], {}
+                        )
+                    ),
+                )
+                for ordinal, service_id in self.renewals.between(first, last, limit)
+            ]
+
+    def has_contract_number(self, client_id: str, contract_number: str) -> bool:
+        with self._lock:
+            return any(
+                self._contracts[contract_id]["contract_number"] == contract_number
+                for contract_id in self._contract_ids_by_client.get(client_id, ())
+            )
+
+    def reload_all(self):
+        """Re-reads every contract and service from the repository."""
+        with self._lock:
+            self._load()
+            self.version += 1
+
+    def reload_client(self, client_id: str):
+        """Re-reads a client's contracts and services after another process wrote."""
+        with self._lock:
+            for contract_id in list(self._contract_ids_by_client.get(client_id, ())):
+                self._unindex_contract_cascade(contract_id)
+            for contract in self.repository.list_contracts_for_client(client_id):
+                self._index_contract(contract)
+            self._index_services(self.repository.list_services_for_client(client_id))
+            self.version += 1
+
+    def reload_contract(self, contract_id: str):
+        """Re-reads a contract and its services after another process wrote."""
+        with self._lock:
+            self._unindex_contract_cascade(contract_id)
+            contract = self.repository.get_contract(contract_id)
+            if contract:
+                self._index_contract(contract)
+                self._index_services(
+                    self.repository.list_services_for_contract(contract_id)
+                )
+            self.version += 1
+
+    def reload_service(self, service_id: str):
+        """Re-reads a service after another process wrote."""
+        with self._lock:
+            self._unindex_service(service_id)
+            service = self.repository.get_service(service_id)
+            if service:
+                self._index_services([service])
+            self.version += 1
+
+    def _index_services(self, services: list[dict]):
+        for service in services:
+            self._index_service(service, renewals=False)
+            self.engine.set(service["id"], service.get("end_date"))
+        self.renewals.add_many(services)
+
+    def add_contract(self, contract: dict):
+        with self._lock:
+            self.repository.insert_contract(contract)
+            self._index_contract(dict(contract))
+            self.version += 1
+
+    def update_contract(self, contract: dict):
+        with self._lock:
+            self.repository.update_contract(contract)
+            self._unindex_contract(contract["id"])
+            self._index_contract(dict(contract))
+            self.version += 1
+
+    def delete_contract(self, contract_id: str):
+        """Deletes a contract and its services."""
+        with self._lock:
+            self.repository.delete_contract(contract_id)
+            self._unindex_contract_cascade(contract_id)
+            self.version += 1
+
+    def delete_contracts_for_client(self, client_id: str):
+        """Deletes every contract of a client and their services."""
+        with self._lock:
+            self.repository.delete_contracts_for_client(client_id)
+            for contract_id in list(self._contract_ids_by_client.get(client_id, ())):
+                self._unindex_contract_cascade(contract_id)
+            self.version += 1
+
+    def delete_clients(self, client_ids: list[str]):
+        """Deletes many clients with their contracts and services atomically."""
+        with self._lock:
+            self.repository.delete_clients(client_ids)
+            for client_id in client_ids:
+                contract_ids = list(self._contract_ids_by_client.get(client_id, ()))
+                for contract_id in contract_ids:
+                    self._unindex_contract_cascade(contract_id)
+            self.version += 1
+
+    def add_service(self, service: dict):
+        with self._lock:
+            self.repository.insert_service(service)
+            self._index_service(dict(service))
+            self.engine.set(service["id"], service.get("end_date"))
+            self.version += 1
+
+    def add_many(
+        self,
+        contracts: list[dict],
+        services: list[dict],
+        clients: Sequence[dict] = (),
+    ):
+        """Adds a batch of contracts and services in one repository transaction.
+
+        The clients they belong to can be passed along so the whole batch is
+        written atomically.
+        """
+        with self._lock:
+            self.repository.insert_many(clients, contracts, services)
+            for contract in contracts:
+                self._index_contract(dict(contract))
+            self._index_services([dict(service) for service in services])
+            self.version += 1
+
+    def update_service(self, service: dict):
+        with self._lock:
+            self.repository.update_service(service)
+            self._unindex_service(service["id"])
+            self._index_service(dict(service))
+            self.engine.set(service["id"], service.get("end_date"))
+            self.version += 1
+
+    def delete_service(self, service_id: str):
+        with self._lock:
+            self.repository.delete_service(service_id)
+            self._unindex_service(service_id)
+            self.version += 1
+
+
+_store: Optional[ContractStore] = None
+_store_lock = threading.Lock()
+
+
+def get_contract_store() -> ContractStore:
+    """Returns the process-wide contract store, loading it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ContractStore(get_repository())
+    return _store
+
+
+def roll_over_contract_store() -> bool:
+    """Rolls the contract store over to the current business date."""
+    today = business_today()
+    rolled_over = get_contract_store().roll_over(today)
+    if rolled_over:
+        logging.info(f"Contract store rolled over to {today.isoformat()}.")
+    return rolled_over
+
+
+async def run_daily_rollover_task():
+    """Lifespan task rolling the contract store over at every business midnight."""
+    while True:
+        # At least a second, so waking just before midnight does not spin.
+        await asyncio.sleep(max(1.0, seconds_until_next_day()))
+        await asyncio.to_thread(roll_over_contract_store)
@@ -0,0 +1,144 @@
+import csv
+import datetime
+import io
+import json
+from typing import Iterator, Optional
+
+from app.client_index import ClientIndex
+from app.contract_store import ContractStore
+from app.importer import (
+    CLIENT_COLUMNS,
+    CONTRACT_COLUMNS,
+    IMPORT_COLUMNS,
+    SERVICE_COLUMNS,
+)
+from app.repository import Repository
+
+EXPORT_COLUMNS = ("client_id", *IMPORT_COLUMNS, "days_remaining")
+"""The import columns plus the client id and days remaining; exports re-import."""
+EXPORT_FORMATS = ("csv", "jsonl")
+EXPORT_BATCH_SIZE = 500
+"""Clients fetched per query while exporting."""
+
+
+def _client_batches(
+    repository: Repository,
+    client_index: ClientIndex,
+    search: str,
+    sort_field: Optional[str],
+    descending: bool,
+) -> Iterator[list[dict]]:
+    """Yields the clients the clients page would list, in its order, in batches."""
+    matches = client_index.search(search, sort_field, descending)
+    if matches is not None:
+        for start in range(0, len(matches), EXPORT_BATCH_SIZE):
+            yield repository.get_clients(matches[start : start + EXPORT_BATCH_SIZE])
+    elif sort_field:
+        offset = 0
+        while True:
+            ids = client_index.ordered_page(
+                sort_field, offset, EXPORT_BATCH_SIZE, descending
+            )
+            if not ids:
+                return
+            yield repository.get_clients(ids)
+            offset += len(ids)
+    else:
+        yield from repository.iter_client_batches(EXPORT_BATCH_SIZE)
+
+
+def iter_export_rows(
+    repository: Repository,
+    store: ContractStore,
+    client_index: ClientIndex,
+    search: str = "",
+    sort_field: Optional[str] = None,
+    descending: bool = False,
+    today: Optional[datetime.date] = None,
+) -> Iterator[dict]:
+    """Yields one flat row per service, joined with its contract and client.
+
+    Contracts without services and clients without contracts still get a
+    row, with the missing columns left empty. Clients are read in batches
+    and each batch's days remaining are computed in one engine call, so only
+    one batch is held in memory at a time.
+    """
+    for clients in _client_batches(
+        repository, client_index, search, sort_field, descending
+    ):
+        services_by_client = {
+            client["id"]: store.services_for_client(client["id"]) for client in clients
+        }
+        days = store.days_remaining(
+            (
+                service["id"]
+                for services in services_by_client.values()
+                for service in services
+            ),
+            today,
+        )
+        for client in clients:
+            client_columns = {column: client[column] for column in CLIENT_COLUMNS}
+            client_columns["client_id"] = client["id"]
+            contracts = store.contracts_for_client(client["id"])
+            if not contracts:
+                yield client_columns
+                continue
+            services_by_contract: dict[str, list[dict]] = {}
+            for service in services_by_client[client["id"]]:
+                services_by_contract.setdefault(service["contract_id"], []).append(
+                    service
+                )
+            for contract in contracts:
+                contract_columns = {
+                    column: contract[field]
+                    for column, field in CONTRACT_COLUMNS.items()
+                }
+                services = services_by_contract.get(contract["id"])
+                if not services:
+                    yield {**client_columns, **contract_columns}
+                    continue
+                for service in services:
+                    yield {
+                        **client_columns,
+                        **contract_columns,
+                        **{
+                            column: service[field]
+                            for column, field in SERVICE_COLUMNS.items()
+                        },
+                        "days_remaining": days[service["id"]]
+                        if service["end_date"]
+                        else None,
+                    }
+
+
+def stream_csv(rows: Iterator[dict], chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Encodes rows as CSV, yielding chunks of roughly ``chunk_size`` bytes."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def stream_jsonl(rows: Iterator[dict], chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Encodes rows as JSON lines, yielding chunks of roughly ``chunk_size`` bytes."""
+    lines: list[str] = []
+    size = 0
+    for row in rows:
+        line = json.dumps(
+            {column: row.get(column) for column in EXPORT_COLUMNS},
+            ensure_ascii=False,
+        )
+        lines.append(line)
+        size += len(line) + 1
+        if size >= chunk_size:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines, size = [], 0
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
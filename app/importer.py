@@ -0,0 +1,182 @@
+import csv
+import os
+import uuid
+from typing import Iterator, Optional
+
+from app.client_index import ClientIndex
+from app.contract_store import ContractStore
+from app.text import fold_text
+from app.validation import client_error, contract_error, service_error
+
+IMPORT_BATCH_SIZE = int(os.environ.get("CADASTRO_IMPORT_BATCH_SIZE", 500))
+MAX_REPORTED_ERRORS = 50
+"""Row errors kept for display; later ones are only counted."""
+
+CLIENT_COLUMNS = (
+    "company_name",
+    "contact_person",
+    "contact_email",
+    "datadog_channel",
+    "bw_account_manager",
+    "notes",
+)
+CONTRACT_COLUMNS = {
+    "contract_number": "contract_number",
+    "contract_status": "status",
+    "contract_notes": "notes",
+}
+SERVICE_COLUMNS = {
+    "service_type": "service_type",
+    "start_date": "start_date",
+    "end_date": "end_date",
+    "service_status": "status",
+    "tam_hours": "tam_hours",
+    "support_type": "support_type",
+    "licensing_provider": "licensing_provider",
+}
+IMPORT_COLUMNS = (*CLIENT_COLUMNS, *CONTRACT_COLUMNS, *SERVICE_COLUMNS)
+"""The CSV header: one row per service, repeating its contract and client."""
+REQUIRED_COLUMNS = ("company_name", "contact_person", "contact_email")
+
+
+class ImportBatch:
+    """Counts for one committed batch of imported rows."""
+
+    def __init__(self, number: int):
+        self.number = number
+        self.rows = 0
+        self.clients: list[dict] = []
+        self.contracts: list[dict] = []
+        self.services: list[dict] = []
+        self.errors: list[str] = []
+        self.error_count = 0
+
+    def summary(self, filename: str) -> str:
+        return (
+            f"Importação '{filename}', lote {self.number}: {self.rows} linhas, "
+            f"{len(self.clients)} clientes, {len(self.contracts)} contratos, "
+            f"{len(self.services)} serviços, {self.error_count} erros."
+        )
+
+
+class CsvImporter:
+    """Streams a CSV of clients, contracts and services into the stores.
+
+    Rows are read one at a time and validated with the same rules as the
+    client, contract and service forms. Rows of the same client (same company
+    name and e-mail) and of the same contract number within it are grouped,
+    so a client with several services spans several rows. Valid rows are
+    written in batches of ``batch_size``, each in one transaction; an invalid
+    row is skipped and reported without affecting the rest of its batch.
+
+    Between batches only the ids of the clients and contracts seen so far are
+    kept, so memory grows with the number of distinct clients, not with the
+    number of rows or the size of the file.
+    """
+
+    def __init__(
+        self,
+        store: ContractStore,
+        client_index: ClientIndex,
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ):
+        self.store = store
+        self.client_index = client_index
+        self.batch_size = batch_size
+        self._client_ids: dict[tuple[str, str], str] = {}
+        self._contract_ids: dict[tuple[str, str], str] = {}
+
+    def import_file(self, path: str) -> Iterator[ImportBatch]:
+        """Imports a CSV file, yielding each batch once it is committed.
+
+        Raises ValueError if the header lacks a required column.
+        """
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            header = reader.fieldnames or ()
+            missing = [column for column in REQUIRED_COLUMNS if column not in header]
+            if missing:
+                raise ValueError(
+                    f"Colunas obrigatórias ausentes: {', '.join(missing)}."
+                )
+            batch = ImportBatch(1)
+            for line_number, row in enumerate(reader, start=2):
+                batch.rows += 1
+                error = self._import_row(batch, row)
+                if error:
+                    batch.error_count += 1
+                    if len(batch.errors) < MAX_REPORTED_ERRORS:
+                        batch.errors.append(f"Linha {line_number}: {error}")
+                if batch.rows >= self.batch_size:
+                    self._commit(batch)
+                    yield batch
+                    batch = ImportBatch(batch.number + 1)
+            if batch.rows:
+                self._commit(batch)
+                yield batch
+
+    def _commit(self, batch: ImportBatch):
+        self.store.add_many(batch.contracts, batch.services, batch.clients)
+        self.client_index.add_many(batch.clients)
+
+    def _import_row(self, batch: ImportBatch, row: dict) -> Optional[str]:
+        """Validates a row and adds what it introduces to the batch.
+
+        Returns the validation error instead if the row is invalid, in which
+        case nothing from it is added.
+        """
+        row = {column: (value or "").strip() for column, value in row.items() if column}
+        client = {column: row.get(column, "") for column in CLIENT_COLUMNS}
+        contract = {
+            field: row.get(column, "") for column, field in CONTRACT_COLUMNS.items()
+        }
+        service = {
+            field: row.get(column, "") for column, field in SERVICE_COLUMNS.items()
+        }
+        has_contract = any(contract.values())
+        has_service = any(service.values())
+        error = client_error(client)
+        if not error and (has_contract or has_service):
+            error = contract_error(contract)
+        if not error and has_service:
+            error = service_error(service)
+        if error:
+            return error
+
+        client_key = (
+            fold_text(client["company_name"]),
+            fold_text(client["contact_email"]),
+        )
+        client_id = self._client_ids.get(client_key)
+        if client_id is None:
+            client_id = client["id"] = str(uuid.uuid4())
+            self._client_ids[client_key] = client_id
+            batch.clients.append(client)
+        if not has_contract and not has_service:
+            return None
+
+        contract_key = (client_id, contract["contract_number"])
+        contract_id = self._contract_ids.get(contract_key)
+        if contract_id is None:
+            contract_id = contract["id"] = str(uuid.uuid4())
+            contract["client_id"] = client_id
+            contract["status"] = contract["status"] or "ativo"
+            self._contract_ids[contract_key] = contract_id
+            batch.contracts.append(contract)
+        if has_service:
+            batch.services.append(
+                {
+                    **service,
+                    "id": str(uuid.uuid4()),
+                    "contract_id": contract_id,
+                    "start_date": service["start_date"] or None,
+                    "end_date": service["end_date"] or None,
+                    "status": service["status"] or "ativo",
+                    "tam_hours": int(service["tam_hours"])
+                    if service["tam_hours"]
+                    else None,
+                    "support_type": service["support_type"] or None,
+                    "licensing_provider": service["licensing_provider"] or None,
+                }
+            )
+        return None
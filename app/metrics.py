@@ -0,0 +1,248 @@
+"""Per-event-handler metrics in the Prometheus text format.
+
+Every ``@rx.event`` handler in ``app/states`` is wrapped by ``instrumented``,
+which records its latency in a histogram along with its error count and how
+many times it called ``get_state``. ``render_metrics`` serializes them, with
+the login throttle counters, for the ``/metrics`` route in ``app.api``.
+
+Overhead per event, measured with ``python -m benchmarks.bench_metrics``:
+about 1.3 µs for plain handlers, 2.2 µs for async ones, 2.8 µs for
+generators and 5 µs for async generators, against ~0.4-0.5 ms for a whole
+Reflex event; counting a ``get_state`` call is lost in the noise of the
+~40 µs call itself. Generator handlers are timed per step, excluding the
+time spent sending the updates they yield. Each worker process keeps its
+own registry, so scrape every worker rather than the load balancer.
+"""
+
+import bisect
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from typing import Callable, Optional
+
+from reflex.state import BaseState
+
+from app.rate_limit import get_login_throttle
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+"""Histogram bucket upper bounds in seconds, Prometheus' defaults plus 1 ms."""
+_BUCKET_BOUNDS_NS = tuple(round(bound * 1e9) for bound in LATENCY_BUCKETS)
+METRIC_PREFIX = "cadastro"
+
+
+class HandlerMetrics:
+    """Latency histogram and counters of one event handler."""
+
+    __slots__ = ("buckets", "sum_ns", "count", "errors", "get_state_calls")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum_ns = 0
+        self.count = 0
+        self.errors = 0
+        self.get_state_calls = 0
+
+    def observe(self, elapsed_ns: int, failed: bool):
+        self.buckets[bisect.bisect_left(_BUCKET_BOUNDS_NS, elapsed_ns)] += 1
+        self.sum_ns += elapsed_ns
+        self.count += 1
+        if failed:
+            self.errors += 1
+
+
+_registry: dict[str, HandlerMetrics] = {}
+_registry_lock = threading.Lock()
+_current: contextvars.ContextVar[Optional[HandlerMetrics]] = contextvars.ContextVar(
+    "current_handler_metrics", default=None
+)
+
+
+def handler_metrics(name: str) -> HandlerMetrics:
+    """Returns the metrics of a handler, registering them on first use."""
+    metrics = _registry.get(name)
+    if metrics is None:
+        with _registry_lock:
+            metrics = _registry.setdefault(name, HandlerMetrics())
+    return metrics
+
+
+def instrumented(fn: Callable) -> Callable:
+    """Records the latency, errors and ``get_state`` calls of an event handler.
+
+    Goes directly under ``@rx.event``. The wrapper keeps the handler's kind
+    (plain, async, generator or async generator) and signature, which Reflex
+    relies on to call it and to convert its arguments.
+    """
+    metrics = handler_metrics(fn.__qualname__)
+
+    if inspect.isasyncgenfunction(fn):
+
+        @functools.wraps(fn)
+        async def async_gen_wrapper(*args, **kwargs):
+            # Only the steps are timed, not the consumer sending each update.
+            events = fn(*args, **kwargs)
+            elapsed = 0
+            while True:
+                token = _current.set(metrics)
+                start = time.perf_counter_ns()
+                try:
+                    event = await events.__anext__()
+                except StopAsyncIteration:
+                    metrics.observe(elapsed + time.perf_counter_ns() - start, False)
+                    return
+                except BaseException:
+                    metrics.observe(elapsed + time.perf_counter_ns() - start, True)
+                    raise
+                finally:
+                    _current.reset(token)
+                elapsed += time.perf_counter_ns() - start
+                yield event
+
+        return async_gen_wrapper
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            token = _current.set(metrics)
+            start = time.perf_counter_ns()
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException:
+                metrics.observe(time.perf_counter_ns() - start, True)
+                raise
+            finally:
+                _current.reset(token)
+            metrics.observe(time.perf_counter_ns() - start, False)
+            return result
+
+        return async_wrapper
+
+    if inspect.isgeneratorfunction(fn):
+
+        @functools.wraps(fn)
+        def gen_wrapper(*args, **kwargs):
+            events = fn(*args, **kwargs)
+            elapsed = 0
+            while True:
+                start = time.perf_counter_ns()
+                try:
+                    event = next(events)
+                except StopIteration:
+                    metrics.observe(elapsed + time.perf_counter_ns() - start, False)
+                    return
+                except BaseException:
+                    metrics.observe(elapsed + time.perf_counter_ns() - start, True)
+                    raise
+                elapsed += time.perf_counter_ns() - start
+                yield event
+
+        return gen_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            metrics.observe(time.perf_counter_ns() - start, True)
+            raise
+        metrics.observe(time.perf_counter_ns() - start, False)
+        return result
+
+    return wrapper
+
+
+_get_state = BaseState.get_state
+
+
+async def _counted_get_state(self, state_cls):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.get_state_calls += 1
+    return await _get_state(self, state_cls)
+
+
+# Only async handlers can await ``get_state``, so only their wrappers set
+# ``_current``; this counts the calls made while one of them runs.
+BaseState.get_state = _counted_get_state
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_seconds(value: float) -> str:
+    return repr(float(value))
+
+
+def render_metrics() -> str:
+    """Returns every metric in the Prometheus text exposition format."""
+    name = f"{METRIC_PREFIX}_event_handler"
+    lines = [
+        f"# HELP {name}_duration_seconds Event handler latency.",
+        f"# TYPE {name}_duration_seconds histogram",
+    ]
+    errors = [
+        f"# HELP {name}_errors_total Event handler calls that raised.",
+        f"# TYPE {name}_errors_total counter",
+    ]
+    get_state_calls = [
+        f"# HELP {name}_get_state_calls_total get_state calls made by handlers.",
+        f"# TYPE {name}_get_state_calls_total counter",
+    ]
+    with _registry_lock:
+        registry = sorted(_registry.items())
+    for handler, metrics in registry:
+        label = f'handler="{_label(handler)}"'
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), metrics.buckets):
+            cumulative += count
+            le = bound if bound == "+Inf" else _format_seconds(bound)
+            lines.append(
+                f'{name}_duration_seconds_bucket{{{label},le="{le}"}} {cumulative}'
+            )
+        lines.append(
+            f"{name}_duration_seconds_sum{{{label}}} "
+            f"{_format_seconds(metrics.sum_ns / 1e9)}"
+        )
+        lines.append(f"{name}_duration_seconds_count{{{label}}} {metrics.count}")
+        errors.append(f"{name}_errors_total{{{label}}} {metrics.errors}")
+        get_state_calls.append(
+            f"{name}_get_state_calls_total{{{label}}} {metrics.get_state_calls}"
+        )
+    lines += errors + get_state_calls
+
+    throttle = get_login_throttle().stats()
+    prefix = f"{METRIC_PREFIX}_login_throttle"
+    lines += [
+        f"# HELP {prefix}_allowed_total Login attempts let through.",
+        f"# TYPE {prefix}_allowed_total counter",
+        f"{prefix}_allowed_total {throttle['allowed_total']}",
+        f"# HELP {prefix}_rejected_total Login attempts rejected, by limit.",
+        f"# TYPE {prefix}_rejected_total counter",
+        f'{prefix}_rejected_total{{limit="username"}} '
+        f"{throttle['rejected_username_total']}",
+        f'{prefix}_rejected_total{{limit="ip"}} {throttle["rejected_ip_total"]}',
+        f"# HELP {prefix}_buckets Token buckets currently tracked.",
+        f"# TYPE {prefix}_buckets gauge",
+        f'{prefix}_buckets{{key="username"}} {throttle["username_buckets"]}',
+        f'{prefix}_buckets{{key="ip"}} {throttle["ip_buckets"]}',
+    ]
+    return "\n".join(lines) + "\n"
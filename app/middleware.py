@@ -0,0 +1,43 @@
+import logging
+import os
+
+from reflex.event import Event
+from reflex.middleware import Middleware
+from reflex.state import BaseState, StateUpdate
+from reflex.utils.format import json_dumps
+
+LOG_DELTA_SIZES = os.environ.get("CADASTRO_LOG_DELTA_SIZES", "") == "1"
+"""Whether to log the size of every state delta sent to the browser."""
+LARGEST_VARS_LOGGED = 3
+
+
+class DeltaSizeMiddleware(Middleware):
+    """Logs the serialized size of each state update and its largest vars.
+
+    Every update is serialized a second time to be measured, so this is meant
+    for diagnosing oversized deltas, not for running permanently.
+    """
+
+    async def preprocess(self, app, state: BaseState, event: Event) -> None:
+        return None
+
+    async def postprocess(
+        self, app, state: BaseState, event: Event, update: StateUpdate
+    ) -> StateUpdate:
+        if update.delta:
+            var_sizes = sorted(
+                (
+                    (len(json_dumps(value).encode()), f"{substate}.{name}")
+                    for substate, values in update.delta.items()
+                    for name, value in values.items()
+                ),
+                reverse=True,
+            )
+            largest = ", ".join(
+                f"{name}={size}" for size, name in var_sizes[:LARGEST_VARS_LOGGED]
+            )
+            logging.info(
+                f"Delta for {event.name}: {len(update.json().encode())} bytes "
+                f"in {len(var_sizes)} vars (largest: {largest})"
+            )
+        return update
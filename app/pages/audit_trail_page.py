@@ -1,9 +1,9 @@
 import reflex as rx
 from app.components.layout import page_layout
-from app.states.audit_state import AuditState, AuditEvent
+from app.states.audit_state import AuditState, AuditLogEntry
 
 
-def audit_row(event: AuditEvent) -> rx.Component:
+def audit_row(event: AuditLogEntry) -> rx.Component:
     """A single row in the audit trail table."""
     return rx.el.tr(
         rx.el.td(event["timestamp"], class_name="p-4 text-sm text-gray-600"),
@@ -25,6 +25,10 @@ def audit_row(event: AuditEvent) -> rx.Component:
                         "delete",
                         "px-2 py-1 text-xs font-semibold rounded-full bg-red-100 text-red-800",
                     ),
+                    (
+                        "import",
+                        "px-2 py-1 text-xs font-semibold rounded-full bg-violet-100 text-violet-800",
+                    ),
                     "px-2 py-1 text-xs font-semibold rounded-full bg-gray-100 text-gray-800",
                 ),
             ),
@@ -102,5 +106,22 @@ def audit_trail_page() -> rx.Component:
                 ),
                 class_name="bg-white rounded-lg shadow-sm border overflow-x-auto",
             ),
+            rx.el.div(
+                rx.el.button(
+                    rx.icon("chevron-left", class_name="mr-1 h-4 w-4"),
+                    "Mais recentes",
+                    on_click=AuditState.newer_audit_events,
+                    disabled=~AuditState.has_newer_audit_events,
+                    class_name="flex items-center px-3 py-1.5 text-sm font-medium text-gray-700 bg-white border rounded-lg hover:bg-gray-100 disabled:opacity-50 disabled:cursor-not-allowed",
+                ),
+                rx.el.button(
+                    "Mais antigos",
+                    rx.icon("chevron-right", class_name="ml-1 h-4 w-4"),
+                    on_click=AuditState.older_audit_events,
+                    disabled=~AuditState.has_older_audit_events,
+                    class_name="flex items-center px-3 py-1.5 text-sm font-medium text-gray-700 bg-white border rounded-lg hover:bg-gray-100 disabled:opacity-50 disabled:cursor-not-allowed",
+                ),
+                class_name="flex justify-end gap-2 mt-4",
+            ),
         )
     )
\ No newline at end of file
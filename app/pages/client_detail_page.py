@@ -3,7 +3,7 @@ from app.components.layout import page_layout
 from app.states.client_detail_state import (
     ClientDetailState,
     Contract,
-    Service,
+    ServiceRow,
     SERVICE_OPTIONS,
     SUPPORT_TYPE_OPTIONS,
     LICENSING_PROVIDER_OPTIONS,
@@ -19,8 +19,13 @@ def detail_item(label: str, value: rx.Var) -> rx.Component:
     )
 
 
-def service_row(service: Service) -> rx.Component:
-    days_remaining = ClientDetailState.services_days_remaining[service["id"]]
+def service_row(service: ServiceRow) -> rx.Component:
+    service = rx.cond(
+        ClientDetailState.service_updates.contains(service["id"]),
+        ClientDetailState.service_updates[service["id"]],
+        service,
+    )
+    days_remaining = service["days_remaining"]
     return rx.el.tr(
         rx.el.td(service["service_type"], class_name="p-3"),
         rx.el.td(
@@ -1,6 +1,7 @@
 import reflex as rx
 from app.components.layout import page_layout
 from app.states.client_state import ClientState, Client
+from app.states.import_state import IMPORT_UPLOAD_ID, ImportState
 
 
 def delete_confirmation_dialog() -> rx.Component:
@@ -32,6 +33,37 @@ def delete_confirmation_dialog() -> rx.Component:
     )
 
 
+def bulk_delete_confirmation_dialog() -> rx.Component:
+    """A dialog to confirm deleting every selected client."""
+    return rx.radix.primitives.dialog.root(
+        rx.radix.primitives.dialog.content(
+            rx.radix.primitives.dialog.title("Confirmar Exclusão em Massa"),
+            rx.radix.primitives.dialog.description(
+                "Você tem certeza que deseja excluir os ",
+                ClientState.selected_count.to_string(),
+                " clientes selecionados e todos os seus contratos? Esta ação não pode ser desfeita.",
+            ),
+            rx.el.div(
+                rx.radix.primitives.dialog.close(
+                    rx.el.button(
+                        "Cancelar",
+                        on_click=ClientState.cancel_bulk_delete,
+                        class_name="mt-4 px-4 py-2 bg-gray-200 text-gray-800 rounded-lg hover:bg-gray-300 transition-colors",
+                    )
+                ),
+                rx.el.button(
+                    "Excluir",
+                    on_click=ClientState.bulk_delete_clients,
+                    class_name="mt-4 ml-4 px-4 py-2 bg-red-600 text-white rounded-lg hover:bg-red-700 transition-colors",
+                ),
+                class_name="flex justify-end pt-4",
+            ),
+            class_name="max-w-md p-6 bg-white rounded-lg shadow-xl",
+        ),
+        open=ClientState.show_bulk_delete_alert,
+    )
+
+
 def client_form_modal() -> rx.Component:
     """A simplified modal form for adding and editing basic client information."""
     return rx.radix.primitives.dialog.root(
@@ -153,12 +185,189 @@ def client_form_modal() -> rx.Component:
     )
 
 
+def import_modal() -> rx.Component:
+    """A modal to upload a CSV of clients, contracts and services."""
+    return rx.radix.primitives.dialog.root(
+        rx.radix.primitives.dialog.content(
+            rx.radix.primitives.dialog.title(
+                "Importar Clientes", class_name="text-2xl font-bold text-gray-800"
+            ),
+            rx.radix.primitives.dialog.description(
+                "Envie um arquivo CSV com uma linha por serviço e as colunas "
+                "company_name, contact_person, contact_email, datadog_channel, "
+                "bw_account_manager, notes, contract_number, contract_status, "
+                "contract_notes, service_type, start_date, end_date, "
+                "service_status, tam_hours, support_type e licensing_provider.",
+                class_name="mt-2 text-sm text-gray-600",
+            ),
+            rx.upload.root(
+                rx.el.div(
+                    rx.icon("upload", class_name="h-8 w-8 text-gray-400"),
+                    rx.el.p(
+                        rx.cond(
+                            rx.selected_files(IMPORT_UPLOAD_ID).length() > 0,
+                            rx.selected_files(IMPORT_UPLOAD_ID)[0],
+                            "Arraste o arquivo aqui ou clique para selecionar.",
+                        ),
+                        class_name="mt-2 text-sm text-gray-500",
+                    ),
+                    class_name="flex flex-col items-center justify-center p-8",
+                ),
+                id=IMPORT_UPLOAD_ID,
+                accept={"text/csv": [".csv"]},
+                max_files=1,
+                disabled=ImportState.is_importing,
+                class_name="mt-4 border-2 border-dashed rounded-lg cursor-pointer hover:bg-gray-50",
+            ),
+            rx.cond(
+                ImportState.is_importing | (ImportState.import_message != ""),
+                rx.el.div(
+                    rx.el.p(
+                        rx.cond(
+                            ImportState.is_importing,
+                            "Importando...",
+                            ImportState.import_message,
+                        ),
+                        class_name="font-medium text-gray-800",
+                    ),
+                    rx.el.p(
+                        ImportState.imported_rows.to_string(),
+                        " linhas: ",
+                        ImportState.imported_clients.to_string(),
+                        " clientes, ",
+                        ImportState.imported_contracts.to_string(),
+                        " contratos, ",
+                        ImportState.imported_services.to_string(),
+                        " serviços, ",
+                        ImportState.import_error_count.to_string(),
+                        " erros.",
+                        class_name="text-sm text-gray-600",
+                    ),
+                    rx.el.ul(
+                        rx.foreach(
+                            ImportState.import_errors,
+                            lambda error: rx.el.li(error),
+                        ),
+                        class_name="mt-2 max-h-40 overflow-y-auto text-xs text-red-700 list-disc pl-4",
+                    ),
+                    class_name="mt-4 p-3 bg-gray-50 rounded-lg",
+                ),
+            ),
+            rx.el.div(
+                rx.el.button(
+                    "Fechar",
+                    type="button",
+                    on_click=ImportState.close_import_modal,
+                    class_name="px-4 py-2 bg-gray-200 text-gray-800 rounded-lg hover:bg-gray-300 transition-colors",
+                ),
+                rx.el.button(
+                    "Importar",
+                    on_click=ImportState.handle_import_upload(
+                        rx.upload_files(upload_id=IMPORT_UPLOAD_ID)
+                    ),
+                    disabled=ImportState.is_importing,
+                    class_name="ml-4 px-4 py-2 bg-violet-600 text-white rounded-lg hover:bg-violet-700 transition-colors disabled:opacity-50",
+                ),
+                class_name="flex justify-end pt-6 border-t mt-6",
+            ),
+            class_name="bg-white rounded-xl shadow-lg p-6 max-w-2xl w-full",
+        ),
+        open=ImportState.show_import_modal,
+    )
+
+
+def sortable_header(label: str, column: str) -> rx.Component:
+    """A table header that sorts the clients by its column when clicked."""
+    return rx.el.th(
+        rx.el.button(
+            label,
+            rx.cond(
+                ClientState.sort_column == column,
+                rx.cond(
+                    ClientState.sort_descending,
+                    rx.icon("arrow-down", class_name="ml-1 h-4 w-4"),
+                    rx.icon("arrow-up", class_name="ml-1 h-4 w-4"),
+                ),
+                rx.icon("arrow-up-down", class_name="ml-1 h-4 w-4 text-gray-300"),
+            ),
+            on_click=ClientState.sort_clients(column),
+            class_name="flex items-center font-semibold text-gray-600 hover:text-gray-900",
+        ),
+        class_name="p-4 text-left",
+    )
+
+
+def bulk_actions_bar() -> rx.Component:
+    """Actions on the selected clients, shown while any are selected."""
+    return rx.cond(
+        ClientState.selected_count > 0,
+        rx.el.div(
+            rx.el.span(
+                ClientState.selected_count.to_string(),
+                " selecionados",
+                class_name="text-sm font-medium text-gray-700",
+            ),
+            rx.cond(
+                ClientState.page_fully_selected
+                & (ClientState.selected_count < ClientState.matching_clients),
+                rx.el.button(
+                    "Selecionar todos os ",
+                    ClientState.matching_clients.to_string(),
+                    on_click=ClientState.select_all_matching,
+                    class_name="text-sm text-violet-600 hover:underline",
+                ),
+            ),
+            rx.el.button(
+                "Limpar seleção",
+                on_click=ClientState.clear_selection,
+                class_name="text-sm text-gray-500 hover:underline",
+            ),
+            rx.el.select(
+                rx.el.option("Novo AM...", value="", disabled=True),
+                rx.foreach(
+                    ClientState.AM_OPTIONS,
+                    lambda opt: rx.el.option(opt, value=opt),
+                ),
+                value=ClientState.bulk_account_manager,
+                on_change=ClientState.set_bulk_account_manager,
+                class_name="ml-auto p-2 text-sm border rounded-md bg-white",
+            ),
+            rx.el.button(
+                rx.icon("user-round-pen", class_name="mr-2 h-4 w-4"),
+                "Reatribuir AM",
+                on_click=ClientState.bulk_update_clients(
+                    "bw_account_manager", ClientState.bulk_account_manager
+                ),
+                disabled=ClientState.bulk_account_manager == "",
+                class_name="flex items-center px-3 py-1.5 text-sm font-medium text-white bg-violet-600 rounded-lg hover:bg-violet-700 disabled:opacity-50 disabled:cursor-not-allowed",
+            ),
+            rx.el.button(
+                rx.icon("trash-2", class_name="mr-2 h-4 w-4"),
+                "Excluir selecionados",
+                on_click=ClientState.confirm_bulk_delete,
+                class_name="flex items-center px-3 py-1.5 text-sm font-medium text-white bg-red-600 rounded-lg hover:bg-red-700",
+            ),
+            class_name="flex items-center gap-4 p-3 mb-4 bg-violet-50 border border-violet-200 rounded-lg",
+        ),
+    )
+
+
 def client_row(client: Client) -> rx.Component:
     """A single row in the client table."""
     return rx.el.tr(
+        rx.el.td(
+            rx.el.input(
+                type="checkbox",
+                checked=ClientState.selected_on_page.contains(client["id"]),
+                on_change=lambda _: ClientState.toggle_client_selection(client["id"]),
+                class_name="h-4 w-4 accent-violet-600",
+            ),
+            class_name="p-4 w-10",
+        ),
         rx.el.td(client["company_name"], class_name="p-4 font-medium text-gray-800"),
         rx.el.td(client["contact_person"], class_name="p-4 text-gray-600"),
         rx.el.td(client["contact_email"], class_name="p-4 text-gray-600"),
+        rx.el.td(client["bw_account_manager"], class_name="p-4 text-gray-600"),
         rx.el.td(
             rx.el.a(
                 rx.icon("eye", class_name="h-4 w-4"),
@@ -187,16 +396,50 @@ def clients_page() -> rx.Component:
         rx.el.div(
             client_form_modal(),
             delete_confirmation_dialog(),
+            bulk_delete_confirmation_dialog(),
+            import_modal(),
             rx.el.div(
                 rx.el.h1("Clientes", class_name="text-4xl font-bold text-gray-800"),
-                rx.el.button(
-                    rx.icon("circle-plus", class_name="mr-2 h-5 w-5"),
-                    "Adicionar Cliente",
-                    on_click=ClientState.open_add_modal,
-                    class_name="flex items-center px-4 py-2 bg-violet-600 text-white rounded-lg shadow-sm hover:bg-violet-700 transition-colors font-medium",
+                rx.el.div(
+                    rx.el.button(
+                        rx.icon("download", class_name="mr-2 h-5 w-5"),
+                        "CSV",
+                        on_click=ClientState.export_clients("csv"),
+                        class_name="flex items-center px-4 py-2 bg-white text-gray-700 border rounded-lg shadow-sm hover:bg-gray-100 transition-colors font-medium",
+                    ),
+                    rx.el.button(
+                        rx.icon("download", class_name="mr-2 h-5 w-5"),
+                        "JSONL",
+                        on_click=ClientState.export_clients("jsonl"),
+                        class_name="flex items-center px-4 py-2 bg-white text-gray-700 border rounded-lg shadow-sm hover:bg-gray-100 transition-colors font-medium",
+                    ),
+                    rx.el.button(
+                        rx.icon("upload", class_name="mr-2 h-5 w-5"),
+                        "Importar CSV",
+                        on_click=ImportState.open_import_modal,
+                        class_name="flex items-center px-4 py-2 bg-white text-gray-700 border rounded-lg shadow-sm hover:bg-gray-100 transition-colors font-medium",
+                    ),
+                    rx.el.button(
+                        rx.icon("circle-plus", class_name="mr-2 h-5 w-5"),
+                        "Adicionar Cliente",
+                        on_click=ClientState.open_add_modal,
+                        class_name="flex items-center px-4 py-2 bg-violet-600 text-white rounded-lg shadow-sm hover:bg-violet-700 transition-colors font-medium",
+                    ),
+                    class_name="flex gap-2",
                 ),
                 class_name="flex justify-between items-center mb-8",
             ),
+            rx.el.div(
+                rx.icon("search", class_name="h-5 w-5 text-gray-400 ml-3"),
+                rx.el.input(
+                    placeholder="Buscar por empresa, contratante ou e-mail...",
+                    on_change=ClientState.set_client_search.debounce(300),
+                    class_name="w-full pl-3 pr-4 py-2 bg-transparent focus:outline-none",
+                    default_value=ClientState.client_search,
+                ),
+                class_name="relative flex items-center w-full max-w-md bg-white border rounded-lg shadow-sm mb-4",
+            ),
+            bulk_actions_bar(),
             rx.el.div(
                 rx.cond(
                     ClientState.clients.length() > 0,
@@ -204,17 +447,18 @@ def clients_page() -> rx.Component:
                         rx.el.thead(
                             rx.el.tr(
                                 rx.el.th(
-                                    "Empresa",
-                                    class_name="p-4 text-left font-semibold text-gray-600",
-                                ),
-                                rx.el.th(
-                                    "Contratante",
-                                    class_name="p-4 text-left font-semibold text-gray-600",
-                                ),
-                                rx.el.th(
-                                    "E-mail",
-                                    class_name="p-4 text-left font-semibold text-gray-600",
+                                    rx.el.input(
+                                        type="checkbox",
+                                        checked=ClientState.page_fully_selected,
+                                        on_change=lambda _: ClientState.toggle_page_selection(),
+                                        class_name="h-4 w-4 accent-violet-600",
+                                    ),
+                                    class_name="p-4 w-10",
                                 ),
+                                sortable_header("Empresa", "company_name"),
+                                sortable_header("Contratante", "contact_person"),
+                                sortable_header("E-mail", "contact_email"),
+                                sortable_header("AM", "bw_account_manager"),
                                 rx.el.th("", class_name="w-32"),
                             )
                         ),
@@ -223,18 +467,55 @@ def clients_page() -> rx.Component:
                     ),
                     rx.el.div(
                         rx.icon("folder-search", class_name="h-16 w-16 text-gray-400"),
-                        rx.el.p(
-                            "Nenhum cliente cadastrado.",
-                            class_name="mt-4 text-lg text-gray-500",
-                        ),
-                        rx.el.p(
-                            "Clique em 'Adicionar Cliente' para começar.",
-                            class_name="text-sm text-gray-400",
+                        rx.cond(
+                            ClientState.total_clients > 0,
+                            rx.el.p(
+                                "Nenhum cliente encontrado.",
+                                class_name="mt-4 text-lg text-gray-500",
+                            ),
+                            rx.fragment(
+                                rx.el.p(
+                                    "Nenhum cliente cadastrado.",
+                                    class_name="mt-4 text-lg text-gray-500",
+                                ),
+                                rx.el.p(
+                                    "Clique em 'Adicionar Cliente' para começar.",
+                                    class_name="text-sm text-gray-400",
+                                ),
+                            ),
                         ),
                         class_name="flex flex-col items-center justify-center p-12 bg-white rounded-lg border-2 border-dashed",
                     ),
                 ),
                 class_name="bg-white rounded-lg shadow-sm border overflow-hidden",
             ),
+            rx.cond(
+                ClientState.matching_clients > 0,
+                rx.el.div(
+                    rx.el.span(
+                        ClientState.client_page_start.to_string(),
+                        "–",
+                        ClientState.client_page_end.to_string(),
+                        " de ",
+                        ClientState.matching_clients.to_string(),
+                        class_name="text-sm text-gray-600 mr-auto",
+                    ),
+                    rx.el.button(
+                        rx.icon("chevron-left", class_name="mr-1 h-4 w-4"),
+                        "Anterior",
+                        on_click=ClientState.previous_clients_page,
+                        disabled=~ClientState.has_previous_clients,
+                        class_name="flex items-center px-3 py-1.5 text-sm font-medium text-gray-700 bg-white border rounded-lg hover:bg-gray-100 disabled:opacity-50 disabled:cursor-not-allowed",
+                    ),
+                    rx.el.button(
+                        "Próxima",
+                        rx.icon("chevron-right", class_name="ml-1 h-4 w-4"),
+                        on_click=ClientState.next_clients_page,
+                        disabled=~ClientState.has_next_clients,
+                        class_name="flex items-center px-3 py-1.5 text-sm font-medium text-gray-700 bg-white border rounded-lg hover:bg-gray-100 disabled:opacity-50 disabled:cursor-not-allowed",
+                    ),
+                    class_name="flex items-center justify-end gap-2 mt-4",
+                ),
+            ),
         )
     )
\ No newline at end of file
@@ -1,6 +1,6 @@
 import reflex as rx
 from app.components.layout import page_layout
-from app.states.client_state import ClientState, ClientWithRenewal
+from app.states.client_state import ClientState, ServiceCount, ServiceRenewal
 
 
 def metric_card(title: str, value: rx.Var, icon: str, color: str) -> rx.Component:
@@ -19,6 +19,60 @@ def metric_card(title: str, value: rx.Var, icon: str, color: str) -> rx.Componen
     )
 
 
+def breakdown_row(service_count: ServiceCount) -> rx.Component:
+    """A label and its count in a breakdown card."""
+    return rx.el.div(
+        rx.el.span(service_count["label"], class_name="text-gray-600"),
+        rx.el.span(
+            service_count["count"].to_string(),
+            class_name="font-semibold text-gray-800",
+        ),
+        class_name="flex items-center justify-between py-2 border-b last:border-b-0",
+    )
+
+
+def breakdown_card(title: str, counts: rx.Var) -> rx.Component:
+    """A card listing service counts by some attribute."""
+    return rx.el.div(
+        rx.el.h2(title, class_name="text-xl font-semibold text-gray-700 mb-4"),
+        rx.foreach(counts, breakdown_row),
+        class_name="p-5 bg-white rounded-xl shadow-sm border",
+    )
+
+
+def renewal_row(renewal: ServiceRenewal) -> rx.Component:
+    """A single row in the service renewals table."""
+    return rx.el.tr(
+        rx.el.td(
+            rx.el.a(
+                renewal["company_name"],
+                href=f"/clientes/{renewal['client_id']}",
+                class_name="hover:text-violet-700",
+            ),
+            class_name="p-4 font-medium text-gray-800",
+        ),
+        rx.el.td(renewal["contract_number"], class_name="p-4 text-gray-600"),
+        rx.el.td(renewal["service_type"], class_name="p-4 text-gray-600"),
+        rx.el.td(renewal["end_date"], class_name="p-4 text-gray-600"),
+        rx.el.td(
+            rx.el.span(
+                f"{renewal['days_remaining']} dias",
+                class_name=rx.cond(
+                    renewal["days_remaining"] < 7,
+                    "px-2 py-1 text-xs font-semibold rounded-full bg-red-100 text-red-800",
+                    rx.cond(
+                        renewal["days_remaining"] < 30,
+                        "px-2 py-1 text-xs font-semibold rounded-full bg-yellow-100 text-yellow-800",
+                        "px-2 py-1 text-xs font-semibold rounded-full bg-green-100 text-green-800",
+                    ),
+                ),
+            ),
+            class_name="p-4",
+        ),
+        class_name="border-b hover:bg-gray-50",
+    )
+
+
 def dashboard_page() -> rx.Component:
     """The dashboard page, which is a protected route."""
     return page_layout(
@@ -36,32 +90,78 @@ def dashboard_page() -> rx.Component:
                     "text-blue-500",
                 ),
                 metric_card(
-                    "Serviços Ativos (em breve)", "-", "briefcase", "text-green-500"
+                    "Serviços Ativos",
+                    ClientState.total_services.to_string(),
+                    "briefcase",
+                    "text-green-500",
                 ),
                 metric_card(
-                    "Renovações Próximas (em breve)",
-                    "-",
+                    "Renovações Próximas",
+                    ClientState.renewals_in_30_days.to_string(),
                     "alarm-clock",
                     "text-yellow-500",
                 ),
                 metric_card(
-                    "Contratos Vencidos (em breve)", "-", "calendar-x", "text-red-500"
+                    "Serviços Vencidos",
+                    ClientState.expired_contracts.to_string(),
+                    "calendar-x",
+                    "text-red-500",
                 ),
                 class_name="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6",
             ),
+            rx.el.div(
+                breakdown_card(
+                    "Serviços Ativos por Tipo", ClientState.active_services_by_type
+                ),
+                breakdown_card("Serviços por Status", ClientState.services_by_status),
+                class_name="grid grid-cols-1 lg:grid-cols-2 gap-6 mt-10",
+            ),
             rx.el.div(
                 rx.el.h2(
-                    "Renovações de Serviços (em breve)",
+                    "Renovações de Serviços",
                     class_name="text-xl font-semibold text-gray-700 mb-4",
                 ),
                 rx.el.div(
-                    rx.el.div(
-                        rx.icon("wrench", class_name="h-12 w-12 text-gray-400"),
-                        rx.el.p(
-                            "A visualização de renovações por serviço está em desenvolvimento.",
-                            class_name="mt-4 text-gray-600",
+                    rx.cond(
+                        ClientState.upcoming_renewals.length() > 0,
+                        rx.el.table(
+                            rx.el.thead(
+                                rx.el.tr(
+                                    rx.el.th(
+                                        "Cliente",
+                                        class_name="p-4 text-left font-semibold text-gray-600",
+                                    ),
+                                    rx.el.th(
+                                        "Contrato",
+                                        class_name="p-4 text-left font-semibold text-gray-600",
+                                    ),
+                                    rx.el.th(
+                                        "Serviço",
+                                        class_name="p-4 text-left font-semibold text-gray-600",
+                                    ),
+                                    rx.el.th(
+                                        "Fim",
+                                        class_name="p-4 text-left font-semibold text-gray-600",
+                                    ),
+                                    rx.el.th(
+                                        "Dias Restantes",
+                                        class_name="p-4 text-left font-semibold text-gray-600",
+                                    ),
+                                )
+                            ),
+                            rx.el.tbody(
+                                rx.foreach(ClientState.upcoming_renewals, renewal_row)
+                            ),
+                            class_name="w-full table-auto",
+                        ),
+                        rx.el.div(
+                            rx.icon("calendar-check", class_name="h-12 w-12 text-gray-400"),
+                            rx.el.p(
+                                "Nenhuma renovação nos próximos 60 dias.",
+                                class_name="mt-4 text-gray-600",
+                            ),
+                            class_name="flex flex-col items-center justify-center p-10 text-center bg-gray-50 rounded-lg",
                         ),
-                        class_name="flex flex-col items-center justify-center p-10 text-center bg-gray-50 rounded-lg",
                     ),
                     class_name="bg-white rounded-xl shadow-sm border overflow-hidden",
                 ),
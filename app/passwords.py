@@ -0,0 +1,56 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import bcrypt
+
+HASH_WORKERS = int(os.environ.get("CADASTRO_HASH_WORKERS", os.cpu_count() or 2))
+MAX_PENDING_HASHES = int(
+    os.environ.get("CADASTRO_MAX_PENDING_HASHES", 4 * HASH_WORKERS)
+)
+"""Hashes and checks running or queued at once; further ones are refused."""
+
+_executor = ThreadPoolExecutor(
+    max_workers=HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_pending = threading.BoundedSemaphore(MAX_PENDING_HASHES)
+
+
+class HashingBusy(Exception):
+    """Raised when ``MAX_PENDING_HASHES`` hashes are already running or queued."""
+
+
+def _hash(password: str) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+
+def _check(password: str, password_hash: str) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+async def _run(fn: Callable, *args):
+    # The slot is freed when the job finishes, not when its caller stops
+    # waiting, so cancelled requests cannot pile up work behind the cap.
+    if not _pending.acquire(blocking=False):
+        raise HashingBusy()
+    future = _executor.submit(fn, *args)
+    future.add_done_callback(lambda _: _pending.release())
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password(password: str) -> str:
+    """Hashes a password with bcrypt on the bounded hashing pool.
+
+    Raises ``HashingBusy`` instead of queuing when the pool is saturated.
+    """
+    return await _run(_hash, password)
+
+
+async def check_password(password: str, password_hash: str) -> bool:
+    """Verifies a password against a bcrypt hash on the bounded hashing pool.
+
+    Raises ``HashingBusy`` instead of queuing when the pool is saturated.
+    """
+    return await _run(_check, password, password_hash)
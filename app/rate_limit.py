@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Mapping, Optional
+
+USERNAME_BURST = int(os.environ.get("CADASTRO_LOGIN_USERNAME_BURST", 5))
+USERNAME_REFILL_SECONDS = float(
+    os.environ.get("CADASTRO_LOGIN_USERNAME_REFILL_SECONDS", 12)
+)
+IP_BURST = int(os.environ.get("CADASTRO_LOGIN_IP_BURST", 20))
+IP_REFILL_SECONDS = float(os.environ.get("CADASTRO_LOGIN_IP_REFILL_SECONDS", 3))
+TRUSTED_PROXIES = int(os.environ.get("CADASTRO_TRUSTED_PROXIES", 0))
+"""Reverse proxies in front of the app, each appending to ``X-Forwarded-For``."""
+
+
+def client_ip(
+    headers: Mapping[str, str], trusted_proxies: int = TRUSTED_PROXIES
+) -> str:
+    """Returns the client address as seen by the outermost trusted proxy.
+
+    Reflex's ``router.session.client_ip`` is the first ``X-Forwarded-For``
+    entry, which the client sets to anything it likes. Each trusted proxy
+    appends the address it got the request from, so the one the outermost
+    proxy saw is ``trusted_proxies`` entries left of the socket peer; with
+    no proxy it is the peer itself.
+    """
+    chain = [
+        address.strip()
+        for address in headers.get("x-forwarded-for", "").split(",")
+        if address.strip()
+    ]
+    chain.append(headers.get("asgi-scope-client", ""))
+    return chain[max(0, len(chain) - 1 - trusted_proxies)]
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets held in memory.
+
+    Each key starts with ``capacity`` tokens and regains one every
+    ``refill_seconds``. A bucket that has been idle long enough to refill
+    completely is indistinguishable from a new one, so it is dropped; buckets
+    are kept in least-recently-used order, which makes the sweep stop at the
+    first bucket that is still refilling.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        refill_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self.idle_seconds = capacity * refill_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _sweep(self, now: float):
+        while self._buckets:
+            key, (_, updated) = next(iter(self._buckets.items()))
+            if now - updated < self.idle_seconds:
+                break
+            del self._buckets[key]
+
+    def _tokens(self, key: str, now: float) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return self.capacity
+        tokens, updated = bucket
+        return min(self.capacity, tokens + (now - updated) / self.refill_seconds)
+
+    def available(self, key: str) -> bool:
+        """Returns whether ``key`` has a token, without taking it."""
+        with self._lock:
+            return self._tokens(key, self._clock()) >= 1
+
+    def acquire(self, key: str) -> bool:
+        """Takes a token for ``key``; returns False if its bucket is empty."""
+        with self._lock:
+            now = self._clock()
+            self._sweep(now)
+            tokens = self._tokens(key, now)
+            if tokens < 1:
+                return False
+            self._buckets[key] = [tokens - 1, now]
+            self._buckets.move_to_end(key)
+            return True
+
+
+class LoginThrottle:
+    """Rate limits authentication attempts per username and per client IP.
+
+    An attempt must find a token in both buckets; a rejected attempt consumes
+    none, so one flooded username cannot drain the IP bucket of the client and
+    vice versa.
+    """
+
+    def __init__(
+        self,
+        usernames: Optional[TokenBucketLimiter] = None,
+        ips: Optional[TokenBucketLimiter] = None,
+    ):
+        self.usernames = usernames or TokenBucketLimiter(
+            USERNAME_BURST, USERNAME_REFILL_SECONDS
+        )
+        self.ips = ips or TokenBucketLimiter(IP_BURST, IP_REFILL_SECONDS)
+        self._lock = threading.Lock()
+        self.allowed_total = 0
+        self.rejected_total = {"username": 0, "ip": 0}
+
+    def allow(self, username: str, client_ip: str) -> bool:
+        """Returns whether an attempt may proceed, consuming its tokens if so."""
+        username = username.strip().lower()
+        with self._lock:
+            if client_ip and not self.ips.available(client_ip):
+                self.rejected_total["ip"] += 1
+                return False
+            if not self.usernames.acquire(username):
+                self.rejected_total["username"] += 1
+                return False
+            if client_ip:
+                self.ips.acquire(client_ip)
+            self.allowed_total += 1
+            return True
+
+    def stats(self) -> dict[str, int]:
+        """Returns counters for allowed and rejected attempts and tracked buckets."""
+        with self._lock:
+            return {
+                "allowed_total": self.allowed_total,
+                "rejected_username_total": self.rejected_total["username"],
+                "rejected_ip_total": self.rejected_total["ip"],
+                "username_buckets": len(self.usernames),
+                "ip_buckets": len(self.ips),
+            }
+
+
+_login_throttle: Optional[LoginThrottle] = None
+_login_throttle_lock = threading.Lock()
+
+
+def get_login_throttle() -> LoginThrottle:
+    """Returns the process-wide login throttle."""
+    global _login_throttle
+    if _login_throttle is None:
+        with _login_throttle_lock:
+            if _login_throttle is None:
+                _login_throttle = LoginThrottle()
+    return _login_throttle
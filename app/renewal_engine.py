@@ -0,0 +1,108 @@
+import datetime
+from typing import Iterable, Optional
+
+import numpy as np
+
+from app.renewal_index import end_date_ordinal
+
+NO_END_DATE = 9999
+"""Days-remaining sentinel for services without a (valid) end date."""
+
+_MISSING = 0
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def parse_end_dates(end_dates: Iterable[Optional[str]]) -> np.ndarray:
+    """Parses ``YYYY-MM-DD`` strings into an int32 ordinal array in one pass."""
+    values = list(end_dates)
+    try:
+        parsed = np.array(
+            [value or "NaT" for value in values], dtype="datetime64[D]"
+        ).astype(np.int64)
+        missing = parsed == np.iinfo(np.int64).min
+        ordinals = np.where(missing, _MISSING, parsed + _EPOCH_ORDINAL)
+        return ordinals.astype(np.int32)
+    except ValueError:
+        return np.array(
+            [end_date_ordinal(value) or _MISSING for value in values], dtype=np.int32
+        )
+
+
+class RenewalEngine:
+    """Service end dates packed as an int32 ordinal array for vectorized analytics.
+
+    Service ids are kept in a parallel list with an id -> position map, so
+    upserts are O(1) and removals swap the last row into the freed slot.
+    Days remaining for any set of services, or for the whole portfolio, are
+    then computed in a single NumPy pass.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._ordinals = np.zeros(capacity, dtype=np.int32)
+        self._ids: list[str] = []
+        self._positions: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _reserve(self, size: int):
+        if size > len(self._ordinals):
+            grown = np.zeros(max(size, 2 * len(self._ordinals)), dtype=np.int32)
+            grown[: len(self._ids)] = self._ordinals[: len(self._ids)]
+            self._ordinals = grown
+
+    def load(self, service_ids: list[str], end_dates: Iterable[Optional[str]]):
+        """Replaces the engine contents with the given services."""
+        ordinals = parse_end_dates(end_dates)
+        self._ids = list(service_ids)
+        self._positions = {service_id: i for i, service_id in enumerate(self._ids)}
+        self._ordinals = np.zeros(max(len(self._ids), 1024), dtype=np.int32)
+        self._ordinals[: len(self._ids)] = ordinals
+
+    def set(self, service_id: str, end_date_str: Optional[str]):
+        """Adds or updates the end date of a service."""
+        ordinal = end_date_ordinal(end_date_str) or _MISSING
+        position = self._positions.get(service_id)
+        if position is None:
+            position = len(self._ids)
+            self._reserve(position + 1)
+            self._ids.append(service_id)
+            self._positions[service_id] = position
+        self._ordinals[position] = ordinal
+
+    def remove(self, service_id: str):
+        position = self._positions.pop(service_id, None)
+        if position is None:
+            return
+        last = len(self._ids) - 1
+        if position != last:
+            moved_id = self._ids[last]
+            self._ids[position] = moved_id
+            self._ordinals[position] = self._ordinals[last]
+            self._positions[moved_id] = position
+        self._ids.pop()
+
+    def _select(self, service_ids: Optional[Iterable[str]]) -> tuple[list[str], np.ndarray]:
+        if service_ids is None:
+            return self._ids, self._ordinals[: len(self._ids)]
+        ids = [service_id for service_id in service_ids if service_id in self._positions]
+        positions = np.fromiter(
+            (self._positions[service_id] for service_id in ids),
+            dtype=np.int64,
+            count=len(ids),
+        )
+        return ids, self._ordinals[positions]
+
+    @staticmethod
+    def _days_remaining(ordinals: np.ndarray, today_ordinal: int) -> np.ndarray:
+        return np.where(
+            ordinals == _MISSING, NO_END_DATE, ordinals.astype(np.int64) - today_ordinal
+        )
+
+    def days_remaining(
+        self, today_ordinal: int, service_ids: Optional[Iterable[str]] = None
+    ) -> dict[str, int]:
+        """Maps service ids (all of them by default) to days remaining."""
+        ids, ordinals = self._select(service_ids)
+        days = self._days_remaining(ordinals, today_ordinal)
+        return dict(zip(ids, days.tolist()))
@@ -0,0 +1,87 @@
+import bisect
+import datetime
+from typing import Optional
+
+
+def end_date_ordinal(end_date_str: Optional[str]) -> Optional[int]:
+    """Parses a ``YYYY-MM-DD`` end date into a proleptic ordinal, or None."""
+    if not end_date_str:
+        return None
+    try:
+        return datetime.date.fromisoformat(end_date_str).toordinal()
+    except (ValueError, TypeError):
+        return None
+
+
+class RenewalIndex:
+    """Active services ordered by end date, answering date range queries.
+
+    Entries are ``(end date ordinal, service id)`` tuples kept sorted with
+    ``bisect``, so counting a range is O(log n) and listing it O(log n + k).
+    """
+
+    def __init__(self):
+        self._entries: list[tuple[int, str]] = []
+        self._ordinals: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, service: dict):
+        """Indexes an active service that has a valid end date."""
+        if service["status"] != "ativo":
+            return
+        ordinal = end_date_ordinal(service.get("end_date"))
+        if ordinal is None:
+            return
+        self._ordinals[service["id"]] = ordinal
+        bisect.insort(self._entries, (ordinal, service["id"]))
+
+    def add_many(self, services: list[dict]):
+        """Indexes many services, merging them into the ordering with one sort.
+
+        Inserting each one with ``insort`` would shift the list once per
+        service, which is quadratic when loading a whole portfolio.
+        """
+        entries = []
+        for service in services:
+            if service["status"] != "ativo":
+                continue
+            ordinal = end_date_ordinal(service.get("end_date"))
+            if ordinal is None:
+                continue
+            self.remove(service["id"])
+            self._ordinals[service["id"]] = ordinal
+            entries.append((ordinal, service["id"]))
+        self._entries.extend(entries)
+        self._entries.sort()
+
+    def remove(self, service_id: str):
+        ordinal = self._ordinals.pop(service_id, None)
+        if ordinal is None:
+            return
+        position = bisect.bisect_left(self._entries, (ordinal, service_id))
+        del self._entries[position]
+
+    def _bounds(self, first: Optional[int], last: Optional[int]) -> tuple[int, int]:
+        low = 0 if first is None else bisect.bisect_left(self._entries, (first, ""))
+        high = (
+            len(self._entries)
+            if last is None
+            else bisect.bisect_left(self._entries, (last + 1, ""))
+        )
+        return low, max(low, high)
+
+    def count_between(self, first: Optional[int], last: Optional[int]) -> int:
+        """Counts services ending between two ordinals, both inclusive."""
+        low, high = self._bounds(first, last)
+        return high - low
+
+    def between(
+        self, first: Optional[int], last: Optional[int], limit: Optional[int] = None
+    ) -> list[tuple[int, str]]:
+        """Lists ``(ordinal, service id)`` ending between two ordinals, soonest first."""
+        low, high = self._bounds(first, last)
+        if limit is not None:
+            high = min(high, low + limit)
+        return self._entries[low:high]
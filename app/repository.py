@@ -0,0 +1,469 @@
+import os
+import sqlite3
+import threading
+import uuid
+from typing import Any, Iterable, Iterator, Optional
+
+DB_PATH = os.environ.get("CADASTRO_DB_PATH", "cadastro.db")
+BUSY_TIMEOUT_SECONDS = 30
+"""How long a write waits for another process's transaction to finish."""
+MAX_QUERY_PARAMS = 900
+"""Ids bound per ``IN (...)`` query, below SQLite's host parameter limit."""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clients (
+    id TEXT PRIMARY KEY,
+    company_name TEXT NOT NULL,
+    contact_person TEXT NOT NULL,
+    contact_email TEXT NOT NULL,
+    datadog_channel TEXT NOT NULL DEFAULT '',
+    bw_account_manager TEXT NOT NULL DEFAULT '',
+    notes TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS contracts (
+    id TEXT PRIMARY KEY,
+    client_id TEXT NOT NULL,
+    contract_number TEXT NOT NULL,
+    status TEXT NOT NULL,
+    notes TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_contracts_client_id ON contracts (client_id);
+CREATE TABLE IF NOT EXISTS services (
+    id TEXT PRIMARY KEY,
+    contract_id TEXT NOT NULL,
+    service_type TEXT NOT NULL,
+    start_date TEXT,
+    end_date TEXT,
+    status TEXT NOT NULL,
+    tam_hours INTEGER,
+    support_type TEXT,
+    licensing_provider TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_services_contract_id ON services (contract_id);
+CREATE INDEX IF NOT EXISTS idx_services_end_date ON services (end_date);
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    entity_id TEXT NOT NULL
+);
+"""
+
+CLIENT_COLUMNS = (
+    "id",
+    "company_name",
+    "contact_person",
+    "contact_email",
+    "datadog_channel",
+    "bw_account_manager",
+    "notes",
+)
+CONTRACT_COLUMNS = ("id", "client_id", "contract_number", "status", "notes")
+SERVICE_COLUMNS = (
+    "id",
+    "contract_id",
+    "service_type",
+    "start_date",
+    "end_date",
+    "status",
+    "tam_hours",
+    "support_type",
+    "licensing_provider",
+)
+
+
+def _insert_sql(table: str, columns: tuple[str, ...]) -> str:
+    placeholders = ", ".join(f":{c}" for c in columns)
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+def _update_sql(table: str, columns: tuple[str, ...]) -> str:
+    assignments = ", ".join(f"{c} = :{c}" for c in columns if c != "id")
+    return f"UPDATE {table} SET {assignments} WHERE id = :id"
+
+
+class Repository:
+    """SQLite-backed persistence for clients, contracts, services and users.
+
+    The database runs in WAL mode so several worker processes can share it:
+    readers never block the single writer. Every client, contract and
+    service write also appends ``(origin, entity, id)`` rows to the
+    ``changes`` table in the same transaction, where ``origin`` identifies
+    this repository instance; other processes replay those rows to keep
+    their in-memory caches current (see ``app.sync``).
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self.origin = uuid.uuid4().hex
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+        self.opened_change_seq = self.last_change_seq()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _fetch_one(self, sql: str, params: Iterable[Any] = ()) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(sql, tuple(params)).fetchone()
+        return dict(row) if row else None
+
+    def _fetch_all(self, sql: str, params: Iterable[Any] = ()) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(sql, tuple(params)).fetchall()
+        return [dict(row) for row in rows]
+
+    def _write(
+        self, sql: str, params: Any = (), changes: Iterable[tuple[str, str]] = ()
+    ) -> int:
+        with self._lock, self._conn:
+            rowcount = self._conn.execute(sql, params).rowcount
+            self._record(changes)
+            return rowcount
+
+    def _write_many(self, sql: str, rows: Iterable[dict], entity: str = ""):
+        rows = list(rows)
+        with self._lock, self._conn:
+            self._conn.executemany(sql, rows)
+            if entity:
+                self._record((entity, row["id"]) for row in rows)
+
+    def _record(self, changes: Iterable[tuple[str, str]]):
+        """Appends changed entities to the change log; callers hold a transaction."""
+        self._conn.executemany(
+            "INSERT INTO changes (origin, entity, entity_id) VALUES (?, ?, ?)",
+            ((self.origin, entity, entity_id) for entity, entity_id in changes),
+        )
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits to the database."""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def last_change_seq(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM changes"
+            ).fetchone()[0]
+
+    def changes_since(self, seq: int) -> list[dict]:
+        """Returns the change log entries after ``seq``, oldest first."""
+        return self._fetch_all(
+            "SELECT * FROM changes WHERE seq > ? ORDER BY seq", (seq,)
+        )
+
+    def first_change_seq(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(MIN(seq), 0) FROM changes"
+            ).fetchone()[0]
+
+    def prune_changes(self, keep: int):
+        """Drops all but the newest ``keep`` change log entries."""
+        self._write(
+            "DELETE FROM changes WHERE seq <= (SELECT MAX(seq) FROM changes) - ?",
+            (keep,),
+        )
+
+    def list_clients(self) -> list[dict]:
+        return self._fetch_all("SELECT * FROM clients ORDER BY rowid")
+
+    def list_clients_page(self, offset: int, limit: int) -> list[dict]:
+        """Returns ``limit`` clients starting at ``offset``, in insertion order."""
+        return self._fetch_all(
+            "SELECT * FROM clients ORDER BY rowid LIMIT ? OFFSET ?", (limit, offset)
+        )
+
+    def iter_client_batches(self, batch_size: int = 500) -> Iterator[list[dict]]:
+        """Yields every client in insertion order, ``batch_size`` at a time.
+
+        Each batch is a separate keyset query on rowid, so the lock is not
+        held between batches and no more than one batch is in memory.
+        """
+        last_rowid = 0
+        while True:
+            rows = self.list_clients_after(last_rowid, batch_size)
+            if not rows:
+                return
+            last_rowid = rows[-1][0]
+            yield [client for _, client in rows]
+
+    def list_clients_after(self, rowid: int, limit: int) -> list[tuple[int, dict]]:
+        """Returns up to ``limit`` ``(rowid, client)`` pairs after ``rowid``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rowid AS _rowid, * FROM clients WHERE rowid > ? "
+                "ORDER BY rowid LIMIT ?",
+                (rowid, limit),
+            ).fetchall()
+        result = []
+        for row in rows:
+            client = dict(row)
+            result.append((client.pop("_rowid"), client))
+        return result
+
+    def count_clients(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM clients").fetchone()[0]
+
+    def get_client(self, client_id: str) -> Optional[dict]:
+        return self._fetch_one("SELECT * FROM clients WHERE id = ?", (client_id,))
+
+    def get_clients(self, client_ids: list[str]) -> list[dict]:
+        """Returns the clients with the given ids, in the given order."""
+        by_id = {}
+        for start in range(0, len(client_ids), MAX_QUERY_PARAMS):
+            chunk = client_ids[start : start + MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._fetch_all(
+                f"SELECT * FROM clients WHERE id IN ({placeholders})", chunk
+            )
+            by_id.update((row["id"], row) for row in rows)
+        return [by_id[client_id] for client_id in client_ids if client_id in by_id]
+
+    def list_client_ids(self) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id FROM clients ORDER BY rowid")
+            return [row[0] for row in rows]
+
+    def get_client_names(self, client_ids: Iterable[str]) -> dict[str, str]:
+        """Maps each of the given client ids to its company name."""
+        client_ids = list(dict.fromkeys(client_ids))
+        names = {}
+        for start in range(0, len(client_ids), MAX_QUERY_PARAMS):
+            chunk = client_ids[start : start + MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._fetch_all(
+                f"SELECT id, company_name FROM clients WHERE id IN ({placeholders})",
+                chunk,
+            )
+            names.update((row["id"], row["company_name"]) for row in rows)
+        return names
+
+    def insert_client(self, client: dict):
+        self._write(
+            _insert_sql("clients", CLIENT_COLUMNS), client, [("client", client["id"])]
+        )
+
+    def insert_clients(self, clients: Iterable[dict]):
+        self._write_many(_insert_sql("clients", CLIENT_COLUMNS), clients, "client")
+
+    def update_client(self, client: dict):
+        self._write(
+            _update_sql("clients", CLIENT_COLUMNS), client, [("client", client["id"])]
+        )
+
+    def delete_client(self, client_id: str):
+        self._write(
+            "DELETE FROM clients WHERE id = ?", (client_id,), [("client", client_id)]
+        )
+
+    def update_clients(self, client_ids: Iterable[str], changes: dict):
+        """Sets the same field values on many clients in a single transaction."""
+        columns = [column for column in CLIENT_COLUMNS if column in changes]
+        if not columns or len(columns) != len(changes):
+            raise ValueError(f"Unknown client fields: {sorted(changes)}")
+        assignments = ", ".join(f"{column} = :{column}" for column in columns)
+        self._write_many(
+            f"UPDATE clients SET {assignments} WHERE id = :id",
+            ({**changes, "id": client_id} for client_id in client_ids),
+            "client",
+        )
+
+    def delete_clients(self, client_ids: Iterable[str]):
+        """Deletes many clients and all their contracts and services at once."""
+        client_ids = [(client_id,) for client_id in client_ids]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM services WHERE contract_id IN "
+                "(SELECT id FROM contracts WHERE client_id = ?)",
+                client_ids,
+            )
+            self._conn.executemany(
+                "DELETE FROM contracts WHERE client_id = ?", client_ids
+            )
+            self._conn.executemany("DELETE FROM clients WHERE id = ?", client_ids)
+            self._record(("client", client_id) for client_id, in client_ids)
+
+    def list_contracts(self) -> list[dict]:
+        return self._fetch_all("SELECT * FROM contracts ORDER BY rowid")
+
+    def get_contract(self, contract_id: str) -> Optional[dict]:
+        return self._fetch_one("SELECT * FROM contracts WHERE id = ?", (contract_id,))
+
+    def list_contracts_for_client(self, client_id: str) -> list[dict]:
+        return self._fetch_all(
+            "SELECT * FROM contracts WHERE client_id = ? ORDER BY contract_number",
+            (client_id,),
+        )
+
+    def has_contract_number(self, client_id: str, contract_number: str) -> bool:
+        return (
+            self._fetch_one(
+                "SELECT 1 FROM contracts WHERE client_id = ? AND contract_number = ?",
+                (client_id, contract_number),
+            )
+            is not None
+        )
+
+    def insert_contract(self, contract: dict):
+        self._write(
+            _insert_sql("contracts", CONTRACT_COLUMNS),
+            contract,
+            [("contract", contract["id"])],
+        )
+
+    def insert_contracts(self, contracts: Iterable[dict]):
+        self._write_many(
+            _insert_sql("contracts", CONTRACT_COLUMNS), contracts, "contract"
+        )
+
+    def update_contract(self, contract: dict):
+        self._write(
+            _update_sql("contracts", CONTRACT_COLUMNS),
+            contract,
+            [("contract", contract["id"])],
+        )
+
+    def delete_contract(self, contract_id: str):
+        """Deletes a contract together with its services."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM services WHERE contract_id = ?", (contract_id,)
+            )
+            self._conn.execute("DELETE FROM contracts WHERE id = ?", (contract_id,))
+            self._record([("contract", contract_id)])
+
+    def delete_contracts_for_client(self, client_id: str):
+        """Deletes every contract of a client together with their services."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM services WHERE contract_id IN "
+                "(SELECT id FROM contracts WHERE client_id = ?)",
+                (client_id,),
+            )
+            self._conn.execute("DELETE FROM contracts WHERE client_id = ?", (client_id,))
+            self._record([("client", client_id)])
+
+    def list_services(self) -> list[dict]:
+        return self._fetch_all("SELECT * FROM services ORDER BY rowid")
+
+    def get_service(self, service_id: str) -> Optional[dict]:
+        return self._fetch_one("SELECT * FROM services WHERE id = ?", (service_id,))
+
+    def list_services_for_client(self, client_id: str) -> list[dict]:
+        return self._fetch_all(
+            "SELECT s.* FROM services s JOIN contracts c ON c.id = s.contract_id "
+            "WHERE c.client_id = ? ORDER BY s.rowid",
+            (client_id,),
+        )
+
+    def list_services_for_contract(self, contract_id: str) -> list[dict]:
+        return self._fetch_all(
+            "SELECT * FROM services WHERE contract_id = ? ORDER BY rowid",
+            (contract_id,),
+        )
+
+    def insert_service(self, service: dict):
+        self._write(
+            _insert_sql("services", SERVICE_COLUMNS),
+            service,
+            [("service", service["id"])],
+        )
+
+    def insert_services(self, services: Iterable[dict]):
+        self._write_many(_insert_sql("services", SERVICE_COLUMNS), services, "service")
+
+    def insert_many(
+        self,
+        clients: Iterable[dict] = (),
+        contracts: Iterable[dict] = (),
+        services: Iterable[dict] = (),
+    ):
+        """Inserts clients, contracts and services in a single transaction."""
+        clients, contracts, services = list(clients), list(contracts), list(services)
+        with self._lock, self._conn:
+            self._conn.executemany(_insert_sql("clients", CLIENT_COLUMNS), clients)
+            self._conn.executemany(
+                _insert_sql("contracts", CONTRACT_COLUMNS), contracts
+            )
+            self._conn.executemany(_insert_sql("services", SERVICE_COLUMNS), services)
+            self._record(
+                [
+                    *(("client", row["id"]) for row in clients),
+                    *(("contract", row["id"]) for row in contracts),
+                    *(("service", row["id"]) for row in services),
+                ]
+            )
+
+    def update_service(self, service: dict):
+        self._write(
+            _update_sql("services", SERVICE_COLUMNS),
+            service,
+            [("service", service["id"])],
+        )
+
+    def delete_service(self, service_id: str):
+        self._write(
+            "DELETE FROM services WHERE id = ?",
+            (service_id,),
+            [("service", service_id)],
+        )
+
+    def get_user(self, username: str) -> Optional[dict]:
+        return self._fetch_one("SELECT * FROM users WHERE username = ?", (username,))
+
+    def insert_user(self, user: dict) -> bool:
+        """Adds a user; returns False if the username is already taken."""
+        try:
+            self._write(
+                "INSERT INTO users (username, password_hash) "
+                "VALUES (:username, :password_hash)",
+                user,
+            )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def get_or_create_setting(self, key: str, default: str) -> str:
+        """Returns a setting, storing ``default`` first if it is not set yet.
+
+        Whichever process stores it first wins, so concurrent callers with
+        different defaults all get the same value.
+        """
+        self._write(
+            "INSERT OR IGNORE INTO settings (key, value) VALUES (?, ?)", (key, default)
+        )
+        row = self._fetch_one("SELECT value FROM settings WHERE key = ?", (key,))
+        return row["value"]
+
+
+_repository: Optional[Repository] = None
+_repository_lock = threading.Lock()
+
+
+def get_repository() -> Repository:
+    """Returns the process-wide repository, opening the database on first use."""
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                _repository = Repository(DB_PATH)
+    return _repository
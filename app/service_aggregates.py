@@ -0,0 +1,101 @@
+from collections import Counter
+from typing import Iterable, Optional
+
+from app.renewal_index import end_date_ordinal
+
+RENEWAL_WINDOW_DAYS = 30
+"""Active services ending within this many days are due for renewal."""
+RENEWAL_BUCKETS = ("expired", "due", "later", "no_end_date")
+"""Renewal buckets of active services: ended, ending within the window, ending
+after it, and without a (valid) end date."""
+
+
+def renewal_bucket(end_ordinal: Optional[int], today_ordinal: int) -> str:
+    if end_ordinal is None:
+        return "no_end_date"
+    if end_ordinal < today_ordinal:
+        return "expired"
+    if end_ordinal <= today_ordinal + RENEWAL_WINDOW_DAYS:
+        return "due"
+    return "later"
+
+
+class ServiceAggregates:
+    """Service counts by type and status, updated with every indexed change.
+
+    Counters are keyed by ``(service_type, status)``, so there are at most as
+    many as the product of the form options and every read is constant time
+    whatever the portfolio size.
+
+    Active services are also counted per renewal bucket relative to
+    ``today_ordinal``. Those counts only move with the date on ``roll_over``,
+    which the contract store does once per business day.
+    """
+
+    def __init__(self, today_ordinal: int):
+        self.today_ordinal = today_ordinal
+        self._counts: Counter[tuple[str, str]] = Counter()
+        self._renewals: Counter[str] = Counter()
+
+    @classmethod
+    def from_services(
+        cls, services: Iterable[dict], today_ordinal: int
+    ) -> "ServiceAggregates":
+        aggregates = cls(today_ordinal)
+        for service in services:
+            aggregates.add(service)
+        return aggregates
+
+    def _renewal_bucket(self, service: dict) -> str:
+        return renewal_bucket(
+            end_date_ordinal(service.get("end_date")), self.today_ordinal
+        )
+
+    def add(self, service: dict):
+        self._counts[(service["service_type"], service["status"])] += 1
+        if service["status"] == "ativo":
+            self._renewals[self._renewal_bucket(service)] += 1
+
+    def remove(self, service: dict):
+        key = (service["service_type"], service["status"])
+        self._counts[key] -= 1
+        if not self._counts[key]:
+            del self._counts[key]
+        if service["status"] == "ativo":
+            self._renewals[self._renewal_bucket(service)] -= 1
+
+    def roll_over(self, today_ordinal: int, renewal_counts: dict[str, int]):
+        """Moves to a new date with the renewal bucket counts computed for it."""
+        self.today_ordinal = today_ordinal
+        self._renewals = Counter(renewal_counts)
+
+    def count(
+        self, service_type: Optional[str] = None, status: Optional[str] = None
+    ) -> int:
+        """Counts the services of a type and/or status; None matches any."""
+        return sum(
+            count
+            for (counted_type, counted_status), count in self._counts.items()
+            if service_type in (None, counted_type) and status in (None, counted_status)
+        )
+
+    def by_service_type(self, status: Optional[str] = None) -> dict[str, int]:
+        """Maps each service type to its number of services with ``status``."""
+        counts: Counter[str] = Counter()
+        for (service_type, counted_status), count in self._counts.items():
+            if status in (None, counted_status):
+                counts[service_type] += count
+        return dict(counts)
+
+    def by_status(self) -> dict[str, int]:
+        counts: Counter[str] = Counter()
+        for (_, status), count in self._counts.items():
+            counts[status] += count
+        return dict(counts)
+
+    def renewal_counts(self) -> dict[str, int]:
+        """Counts active services per renewal bucket."""
+        return {bucket: self._renewals[bucket] for bucket in RENEWAL_BUCKETS}
+
+    def snapshot(self) -> dict[tuple[str, str], int]:
+        return dict(self._counts)
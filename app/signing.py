@@ -0,0 +1,53 @@
+import base64
+import functools
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from typing import Optional
+
+from app.repository import get_repository
+
+SECRET_KEY = os.environ.get("CADASTRO_SECRET_KEY", "")
+"""Signs short-lived links. Without it, a key generated once is kept in the
+database, so every worker sharing the database signs with the same key."""
+
+
+@functools.cache
+def _secret_key() -> bytes:
+    key = SECRET_KEY or get_repository().get_or_create_setting(
+        "signing_key", secrets.token_hex(32)
+    )
+    return key.encode("utf-8")
+
+
+def _signature(body: bytes) -> str:
+    digest = hmac.new(_secret_key(), body, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+
+
+def sign(payload: dict, ttl_seconds: int) -> str:
+    """Returns a URL-safe token carrying ``payload`` until it expires."""
+    body = base64.urlsafe_b64encode(
+        json.dumps({**payload, "exp": int(time.time()) + ttl_seconds}).encode("utf-8")
+    )
+    return f"{body.decode('ascii')}.{_signature(body)}"
+
+
+def verify(token: str) -> Optional[dict]:
+    """Returns the payload of a valid, unexpired token, or None."""
+    body, _, signature = token.partition(".")
+    # Tokens are ASCII; anything else is malformed and cannot be compared.
+    if not (body.isascii() and signature.isascii()):
+        return None
+    if not hmac.compare_digest(_signature(body.encode("ascii")), signature):
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(body))
+    except ValueError:
+        return None
+    if payload.get("exp", 0) < time.time():
+        return None
+    return payload
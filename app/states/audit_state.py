@@ -2,6 +2,9 @@ import reflex as rx
 import datetime
 import uuid
 from typing import TypedDict
+from app.audit_index import get_audit_index
+from app.audit_log import get_audit_log
+from app.metrics import instrumented
 
 
 class AuditEvent(TypedDict):
@@ -14,36 +17,93 @@ class AuditEvent(TypedDict):
     details: str
 
 
+class AuditLogEntry(AuditEvent):
+    seq: int
+
+
+AUDIT_TRAIL_PAGE_SIZE = 50
+
+
 class AuditState(rx.State):
-    """Manages the audit trail for client data changes."""
+    """Manages the audit trail for client data changes, stored in the audit log.
+
+    The trail is paginated by keyset: ``cursor`` is the (exclusive) sequence
+    number the current page starts below, or -1 for the newest page.
+    """
 
-    audit_events: list[AuditEvent] = []
     search_query: str = ""
+    log_version: int = 0
+    cursor: int = -1
+    _cursor_history: list[int] = []
+
+    def _page_seqs(self, limit: int) -> list[int]:
+        """Returns up to ``limit`` matching sequence numbers below the cursor."""
+        before = None if self.cursor < 0 else self.cursor
+        seqs = get_audit_index().search(self.search_query, limit, before=before)
+        if seqs is None:
+            stop = len(get_audit_log()) if before is None else before
+            seqs = list(range(stop - 1, max(stop - limit, 0) - 1, -1))
+        return seqs
+
+    @rx.var(deps=["search_query", "log_version", "cursor"], auto_deps=False)
+    def filtered_audit_events(self) -> list[AuditLogEntry]:
+        """Returns the current page of audit events matching the search query."""
+        seqs = self._page_seqs(AUDIT_TRAIL_PAGE_SIZE)
+        events = get_audit_log().read_many(seqs)
+        return [
+            AuditLogEntry(**event, seq=seq) for seq, event in zip(seqs, events)
+        ]
+
+    @rx.var(deps=["search_query", "log_version", "cursor"], auto_deps=False)
+    def has_older_audit_events(self) -> bool:
+        return len(self._page_seqs(AUDIT_TRAIL_PAGE_SIZE + 1)) > AUDIT_TRAIL_PAGE_SIZE
 
     @rx.var
-    def filtered_audit_events(self) -> list[AuditEvent]:
-        """Filters audit events based on the search query."""
-        if not self.search_query:
-            return sorted(self.audit_events, key=lambda e: e["timestamp"], reverse=True)
-        query = self.search_query.lower()
-        return sorted(
-            [
-                event
-                for event in self.audit_events
-                if query in event["user"].lower()
-                or query in event["action"].lower()
-                or query in event["client_name"].lower()
-                or (query in event["details"].lower())
-            ],
-            key=lambda e: e["timestamp"],
-            reverse=True,
-        )
+    def has_newer_audit_events(self) -> bool:
+        return self.cursor >= 0
+
+    def _reset_cursor(self):
+        self.cursor = -1
+        self._cursor_history = []
 
     @rx.event
+    @instrumented
+    def set_search_query(self, value: str):
+        self.search_query = value
+        self._reset_cursor()
+
+    @rx.event
+    @instrumented
+    def older_audit_events(self):
+        """Moves to the next page of older events."""
+        seqs = self._page_seqs(AUDIT_TRAIL_PAGE_SIZE + 1)
+        if len(seqs) > AUDIT_TRAIL_PAGE_SIZE:
+            self._cursor_history.append(self.cursor)
+            self.cursor = seqs[AUDIT_TRAIL_PAGE_SIZE - 1]
+
+    @rx.event
+    @instrumented
+    def newer_audit_events(self):
+        """Moves back to the previous, newer page."""
+        self.cursor = self._cursor_history.pop() if self._cursor_history else -1
+
+    @rx.event
+    @instrumented
+    def load_audit_events(self):
+        """Shows the newest page, including events appended since the last load."""
+        self._reset_cursor()
+        self.log_version = len(get_audit_log())
+
+    @rx.event
+    @instrumented
     async def add_event(
         self, user: str, action: str, client_id: str, client_name: str, details: str
     ):
-        """Adds a new event to the audit trail."""
+        """Adds a new event to the audit trail.
+
+        The trail page picks it up on its next load; bumping ``log_version``
+        here would recompute and resend the trail after every change.
+        """
         event = AuditEvent(
             id=str(uuid.uuid4()),
             timestamp=datetime.datetime.now(datetime.timezone.utc).isoformat(),
@@ -53,4 +113,7 @@ class AuditState(rx.State):
             client_name=client_name,
             details=details,
         )
-        self.audit_events.append(event)
\ No newline at end of file
+        audit_log = get_audit_log()
+        audit_log.append(event)
+        # Also indexes any events other workers appended before this one.
+        get_audit_index().catch_up(audit_log)
\ No newline at end of file
@@ -1,7 +1,10 @@
 import reflex as rx
-import bcrypt
-import time
+import asyncio
 from typing import TypedDict, Optional
+from app.metrics import instrumented
+from app.passwords import HashingBusy, check_password, hash_password
+from app.rate_limit import client_ip, get_login_throttle
+from app.repository import get_repository
 
 
 class User(TypedDict):
@@ -9,9 +12,6 @@ class User(TypedDict):
     password_hash: str
 
 
-USERS_DB: dict[str, User] = {}
-
-
 class AuthState(rx.State):
     """Handles user authentication, registration, and session management."""
 
@@ -35,6 +35,12 @@ class AuthState(rx.State):
         """Clears all form-related error messages."""
         self.error_message = ""
 
+    def _throttled(self) -> bool:
+        """Checks the login throttle for the current username and client IP."""
+        return not get_login_throttle().allow(
+            self.username, client_ip(self.router.headers.raw_headers)
+        )
+
     def _clear_fields(self):
         """Clears all form fields."""
         self.username = ""
@@ -42,56 +48,77 @@ class AuthState(rx.State):
         self.confirm_password = ""
 
     @rx.event
-    def register(self, form_data: dict):
+    @instrumented
+    async def register(self, form_data: dict):
         """Registers a new user."""
         self.username = form_data["username"]
         self.password = form_data["password"]
         self.confirm_password = form_data["confirm_password"]
         self._clear_errors()
+        if self._throttled():
+            self._set_error("Too many attempts. Please try again later.")
+            return
         if not self.username or not self.password:
             self._set_error("Username and password are required.")
             return
         if self.password != self.confirm_password:
             self._set_error("Passwords do not match.")
             return
-        if self.username in USERS_DB:
+        repository = get_repository()
+        if repository.get_user(self.username):
             self._set_error("Username already exists.")
             return
-        hashed_password = bcrypt.hashpw(self.password.encode("utf-8"), bcrypt.gensalt())
+        try:
+            hashed_password = await hash_password(self.password)
+        except HashingBusy:
+            self._set_error("Server busy. Please try again later.")
+            return
         user_data: User = {
             "username": self.username,
-            "password_hash": hashed_password.decode("utf-8"),
+            "password_hash": hashed_password,
         }
-        USERS_DB[self.username] = user_data
+        if not repository.insert_user(user_data):
+            self._set_error("Username already exists.")
+            return
         self.authenticated_user = self.username
         self._clear_fields()
         return rx.redirect("/")
 
     @rx.event
-    def login(self, form_data: dict):
+    @instrumented
+    async def login(self, form_data: dict):
         """Logs in an existing user."""
         self.username = form_data["username"]
         self.password = form_data["password"]
+        if self._throttled():
+            self.error_message = "Too many attempts. Please try again later."
+            return
         self.is_loading = True
         yield
-        time.sleep(0.5)
+        await asyncio.sleep(0.5)
         self._clear_errors()
-        user_data = USERS_DB.get(self.username)
+        user_data = get_repository().get_user(self.username)
         if not user_data:
             self.error_message = "Invalid username or password."
             self.is_loading = False
             return
-        stored_hash = user_data["password_hash"].encode("utf-8")
-        if bcrypt.checkpw(self.password.encode("utf-8"), stored_hash):
+        try:
+            valid = await check_password(self.password, user_data["password_hash"])
+        except HashingBusy:
+            self.error_message = "Server busy. Please try again later."
+            self.is_loading = False
+            return
+        if valid:
             self.authenticated_user = self.username
             self._clear_fields()
             self.is_loading = False
-            return rx.redirect("/")
+            yield rx.redirect("/")
         else:
             self.error_message = "Invalid username or password."
             self.is_loading = False
 
     @rx.event
+    @instrumented
     def logout(self):
         """Logs out the current user."""
         self.reset()
@@ -100,6 +127,7 @@ class AuthState(rx.State):
         return rx.redirect("/login")
 
     @rx.event
+    @instrumented
     def on_load(self):
         """Event to run on page load to check authentication."""
         if not self.is_authenticated:
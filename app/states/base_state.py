@@ -1,4 +1,5 @@
 import reflex as rx
+from app.metrics import instrumented
 from app.states.auth_state import AuthState
 
 
@@ -6,6 +7,7 @@ class BaseState(rx.State):
     """A base state that provides authentication checks for page loads."""
 
     @rx.event
+    @instrumented
     async def require_login(self):
         """
         An event handler that checks if a user is authenticated.
@@ -1,8 +1,11 @@
 import reflex as rx
 from typing import Optional
 import logging
-import datetime
 import uuid
+from app.contract_store import ContractStore, get_contract_store
+from app.metrics import instrumented
+from app.repository import get_repository
+from app.validation import contract_error, service_error
 from .client_state import ClientState, Client
 from .auth_state import AuthState
 from .audit_state import AuditState
@@ -16,12 +19,23 @@ from .contract_state import (
     STATUS_OPTIONS,
 )
 
+SERVICE_UPDATES_LIMIT = 20
+"""Edited rows sent through ``service_updates`` before the services of the
+client are resent whole, so the dict sent with every edit stays small."""
+
+
+class ServiceRow(Service):
+    days_remaining: int
+
 
 class ClientDetailState(rx.State):
     """Manages the state for viewing a single client's details and its contracts/services."""
 
     client: Optional[Client] = None
     client_contracts: list[Contract] = []
+    services_version: int = 0
+    service_updates: dict[str, ServiceRow] = {}
+    _loaded_data_version: int = -1
     show_contract_modal: bool = False
     show_service_modal: bool = False
     show_delete_contract_alert: bool = False
@@ -48,41 +62,38 @@ class ClientDetailState(rx.State):
     LICENSING_PROVIDER_OPTIONS = LICENSING_PROVIDER_OPTIONS
     STATUS_OPTIONS = STATUS_OPTIONS
 
-    @rx.var
-    async def services_by_contract(self) -> dict[str, list[Service]]:
-        """Groups services by their contract ID for easy rendering."""
-        contract_state = await self.get_state(ContractState)
-        grouped: dict[str, list[Service]] = {}
-        if not self.client or not contract_state:
-            return grouped
-        client_contract_ids = {c["id"] for c in self.client_contracts}
-        for service in contract_state.services:
-            if service["contract_id"] in client_contract_ids:
-                if service["contract_id"] not in grouped:
-                    grouped[service["contract_id"]] = []
-                grouped[service["contract_id"]].append(service)
+    @rx.var(deps=["client_contracts", "services_version"], auto_deps=False)
+    def services_by_contract(self) -> dict[str, list[ServiceRow]]:
+        """Groups the loaded client's services by contract ID for easy rendering.
+
+        Only recomputed when the client's contracts change or services are
+        added or removed. An edited service is sent alone through
+        ``service_updates`` instead, so the browser receives one row rather
+        than every service of the client again.
+        """
+        store = get_contract_store()
+        grouped: dict[str, list[ServiceRow]] = {}
+        for contract in self.client_contracts:
+            services = store.services_for_contract(contract["id"])
+            if services:
+                grouped[contract["id"]] = self._service_rows(store, services)
         return grouped
 
-    @rx.var
-    async def services_days_remaining(self) -> dict[str, int]:
-        """Calculates days remaining for each service, accessible by service ID."""
-        contract_state = await self.get_state(ContractState)
-        days_map: dict[str, int] = {}
-        for service in contract_state.services:
-            days_map[service["id"]] = self.get_days_remaining(service.get("end_date"))
-        return days_map
+    def _service_rows(
+        self, store: ContractStore, services: list[Service]
+    ) -> list[ServiceRow]:
+        days = store.days_remaining(service["id"] for service in services)
+        return [
+            ServiceRow(**service, days_remaining=days[service["id"]])
+            for service in services
+        ]
 
-    @rx.event
-    def get_days_remaining(self, end_date_str: str | None) -> int:
-        """Helper to calculate days remaining until an end date."""
-        if not end_date_str:
-            return 9999
-        try:
-            end_date = datetime.datetime.strptime(end_date_str, "%Y-%m-%d").date()
-            return (end_date - datetime.date.today()).days
-        except (ValueError, TypeError) as e:
-            logging.exception(f"Error parsing date: {e}")
-            return 9999
+    def _refresh_services(self):
+        """Marks every service of the client for resending, dropping row updates."""
+        self.services_version += 1
+        if self.service_updates:
+            self.service_updates = {}
+        self._loaded_data_version = get_contract_store().version
 
     def _get_renewal_badge_color(self, days: int) -> str:
         """Helper to determine badge color based on days remaining."""
@@ -93,32 +104,35 @@ class ClientDetailState(rx.State):
         return "bg-green-100 text-green-800"
 
     @rx.event
+    @instrumented
     async def load_client_details(self):
         """Loads all client-related details, including contracts and services."""
         auth_state = await self.get_state(AuthState)
         if not auth_state.is_authenticated:
             return rx.redirect("/login")
-        self.client = None
-        self.client_contracts = []
         client_id = self.router.page.params.get("client_id")
+        if not self.client or self.client["id"] != client_id:
+            self.client = None
+            self.client_contracts = []
         if not client_id:
             logging.error("No client_id in URL, redirecting.")
             return rx.redirect("/clientes")
-        client_state = await self.get_state(ClientState)
-        contract_state = await self.get_state(ContractState)
-        found_client = next(
-            (c for c in client_state.clients if c["id"] == client_id), None
-        )
+        found_client = get_repository().get_client(client_id)
         if not found_client:
             logging.warning(f"Client with id {client_id} not found.")
             return rx.redirect("/clientes")
-        self.client = found_client
-        self.client_contracts = sorted(
-            [c for c in contract_state.contracts if c["client_id"] == client_id],
-            key=lambda c: c["contract_number"],
-        )
+        if found_client != self.client:
+            self.client = found_client
+        contracts = get_contract_store().contracts_for_client(client_id)
+        if contracts != self.client_contracts:
+            self.client_contracts = contracts
+        # The store's version also moves with edits from other sessions and
+        # workers, and when the date rolls over, staling days remaining.
+        if get_contract_store().version != self._loaded_data_version:
+            self._refresh_services()
 
     @rx.event
+    @instrumented
     async def trigger_edit_modal(self):
         """Triggers the edit modal in the ClientState."""
         if self.client:
@@ -135,11 +149,13 @@ class ClientDetailState(rx.State):
         self.error_message = ""
 
     @rx.event
+    @instrumented
     def open_add_contract_modal(self):
         self._clear_contract_form()
         self.show_contract_modal = True
 
     @rx.event
+    @instrumented
     def open_edit_contract_modal(self, contract: Contract):
         self._clear_contract_form()
         self.is_editing_contract = True
@@ -150,14 +166,17 @@ class ClientDetailState(rx.State):
         self.show_contract_modal = True
 
     @rx.event
+    @instrumented
     def close_contract_modal(self):
         self.show_contract_modal = False
         self._clear_contract_form()
 
     @rx.event
+    @instrumented
     async def save_contract(self, form_data: dict):
-        if not form_data.get("contract_number"):
-            self.error_message = "O número do contrato é obrigatório."
+        error = contract_error(form_data)
+        if error:
+            self.error_message = error
             return
         contract_state = await self.get_state(ContractState)
         audit_state = await self.get_state(AuditState)
@@ -201,20 +220,19 @@ class ClientDetailState(rx.State):
         return ClientDetailState.load_client_details
 
     @rx.event
+    @instrumented
     def confirm_delete_contract(self, contract_id: str):
         self.id_to_delete = contract_id
         self.show_delete_contract_alert = True
 
     @rx.event
+    @instrumented
     async def delete_contract(self):
         if self.id_to_delete:
             contract_state = await self.get_state(ContractState)
             audit_state = await self.get_state(AuditState)
             auth_state = await self.get_state(AuthState)
-            contract_to_delete = next(
-                (c for c in contract_state.contracts if c["id"] == self.id_to_delete),
-                None,
-            )
+            contract_to_delete = contract_state.get_contract(self.id_to_delete)
             if contract_to_delete:
                 contract_state.delete_contract(self.id_to_delete)
                 await audit_state.add_event(
@@ -242,6 +260,7 @@ class ClientDetailState(rx.State):
         self.error_message = ""
 
     @rx.event
+    @instrumented
     def open_add_service_modal(self, contract_id: str):
         self._clear_service_form()
         self.contract_id_for_new_service = contract_id
@@ -249,6 +268,7 @@ class ClientDetailState(rx.State):
         self.show_service_modal = True
 
     @rx.event
+    @instrumented
     def open_edit_service_modal(self, service: Service):
         self._clear_service_form()
         self.is_editing_service = True
@@ -264,14 +284,17 @@ class ClientDetailState(rx.State):
         self.show_service_modal = True
 
     @rx.event
+    @instrumented
     def close_service_modal(self):
         self.show_service_modal = False
         self._clear_service_form()
 
     @rx.event
+    @instrumented
     async def save_service(self, form_data: dict):
-        if not form_data.get("service_type"):
-            self.error_message = "O tipo de serviço é obrigatório."
+        error = service_error(form_data)
+        if error:
+            self.error_message = error
             return
         contract_state = await self.get_state(ContractState)
         audit_state = await self.get_state(AuditState)
@@ -293,11 +316,28 @@ class ClientDetailState(rx.State):
             licensing_provider=form_data.get("licensing_provider"),
         )
         if self.is_editing_service:
+            store = get_contract_store()
+            loaded_version = store.version
             contract_state.update_service(service_data)
+            if (
+                service_data["id"] not in self.service_updates
+                and len(self.service_updates) >= SERVICE_UPDATES_LIMIT
+            ):
+                self._refresh_services()
+            else:
+                self.service_updates[service_data["id"]] = self._service_rows(
+                    store, [service_data]
+                )[0]
+                # The cached rows stay current only if this edit is the sole
+                # change since they were built; otherwise the next load
+                # rebuilds them.
+                if self._loaded_data_version == loaded_version == store.version - 1:
+                    self._loaded_data_version = store.version
             action_details = f"Serviço '{service_data['service_type']}' atualizado."
             action_type = "update"
         else:
             contract_state.add_service_to_contract(service_data)
+            self._refresh_services()
             action_details = f"Serviço '{service_data['service_type']}' adicionado."
             action_type = "create"
         await audit_state.add_event(
@@ -308,25 +348,24 @@ class ClientDetailState(rx.State):
             details=action_details,
         )
         self.close_service_modal()
-        return ClientDetailState.load_client_details
 
     @rx.event
+    @instrumented
     def confirm_delete_service(self, service_id: str):
         self.id_to_delete = service_id
         self.show_delete_service_alert = True
 
     @rx.event
+    @instrumented
     async def delete_service(self):
         if self.id_to_delete:
             contract_state = await self.get_state(ContractState)
             audit_state = await self.get_state(AuditState)
             auth_state = await self.get_state(AuthState)
-            service_to_delete = next(
-                (s for s in contract_state.services if s["id"] == self.id_to_delete),
-                None,
-            )
+            service_to_delete = contract_state.get_service(self.id_to_delete)
             if service_to_delete:
                 contract_state.delete_service(self.id_to_delete)
+                self._refresh_services()
                 await audit_state.add_event(
                     user=auth_state.authenticated_user,
                     action="delete",
@@ -336,9 +375,9 @@ class ClientDetailState(rx.State):
                 )
         self.show_delete_service_alert = False
         self.id_to_delete = None
-        return ClientDetailState.load_client_details
 
     @rx.event
+    @instrumented
     def cancel_delete(self):
         self.show_delete_contract_alert = False
         self.show_delete_service_alert = False
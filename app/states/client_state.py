@@ -1,11 +1,17 @@
 import reflex as rx
 from typing import TypedDict, Optional, cast
-import datetime
 import uuid
 import logging
+from app.metrics import instrumented
 from app.states.audit_state import AuditState
 from app.states.auth_state import AuthState
-from app.states.contract_state import ContractState
+from app.states.contract_state import SERVICE_OPTIONS, STATUS_OPTIONS, ContractState
+from app.client_index import SORT_FIELDS, get_client_index
+from app.contract_store import get_contract_store
+from app.exporter import EXPORT_FORMATS
+from app.repository import get_repository
+from app.signing import sign
+from app.validation import client_error
 
 
 class Client(TypedDict):
@@ -22,10 +28,65 @@ class ClientWithRenewal(Client):
     days_remaining: int
 
 
+class ServiceRenewal(TypedDict):
+    service_id: str
+    client_id: str
+    company_name: str
+    contract_number: str
+    service_type: str
+    end_date: str
+    days_remaining: int
+
+
+class ServiceCount(TypedDict):
+    label: str
+    count: int
+
+
+AM_OPTIONS = [
+    "Camila Nogueira",
+    "Isabela Morassi",
+    "Carolina Cunha",
+    "Raphael Terra",
+]
+DATADOG_CHANNEL_OPTIONS = ["Enterprise", "Mid-Market", "Comercial", "Outro"]
+UPCOMING_RENEWALS_DAYS = 60
+UPCOMING_RENEWALS_LIMIT = 50
+CLIENTS_PAGE_SIZE = 25
+DASHBOARD_DEPS = ["_dashboard_version"]
+"""Dashboard metrics are only shown on the dashboard and refresh on its load.
+
+As uncached vars they were recomputed and resent with every event.
+"""
+EXPORT_LINK_TTL_SECONDS = 60
+BULK_AUDIT_NAMES_LIMIT = 50
+"""Client names spelled out in a bulk audit record; the rest are counted."""
+CLIENT_FIELD_LABELS = {
+    "company_name": "Nome da Empresa",
+    "contact_person": "Contratante",
+    "contact_email": "E-mail",
+    "datadog_channel": "Canal Datadog",
+    "bw_account_manager": "AM BW Soluções",
+    "notes": "Observações",
+}
+
+
+def _bulk_client_names(clients: list[dict]) -> str:
+    names = [client["company_name"] for client in clients[:BULK_AUDIT_NAMES_LIMIT]]
+    rest = len(clients) - len(names)
+    return ", ".join(names) + (f" e mais {rest}" if rest > 0 else "")
+
+
 class ClientState(rx.State):
     """Manages the state for the customer CRUD operations."""
 
     clients: list[Client] = []
+    client_offset: int = 0
+    total_clients: int = 0
+    client_search: str = ""
+    sort_column: str = ""
+    sort_descending: bool = False
+    matching_clients: int = 0
     show_form_modal: bool = False
     is_editing: bool = False
     current_client_id: Optional[str] = None
@@ -38,13 +99,14 @@ class ClientState(rx.State):
     show_delete_alert: bool = False
     client_to_delete_id: Optional[str] = None
     error_message: str = ""
-    AM_OPTIONS = [
-        "Camila Nogueira",
-        "Isabela Morassi",
-        "Carolina Cunha",
-        "Raphael Terra",
-    ]
-    DATADOG_CHANNEL_OPTIONS = ["Enterprise", "Mid-Market", "Comercial", "Outro"]
+    _selected_ids: dict[str, None] = {}
+    selected_count: int = 0
+    selected_on_page: list[str] = []
+    bulk_account_manager: str = ""
+    show_bulk_delete_alert: bool = False
+    _dashboard_version: int = 0
+    AM_OPTIONS = AM_OPTIONS
+    DATADOG_CHANNEL_OPTIONS = DATADOG_CHANNEL_OPTIONS
 
     @rx.var
     def clients_with_renewal(self) -> list[ClientWithRenewal]:
@@ -52,25 +114,138 @@ class ClientState(rx.State):
         return []
 
     @rx.var
-    def total_clients(self) -> int:
-        return len(self.clients)
+    def client_page_start(self) -> int:
+        """The 1-based position of the first client on the page, or 0 if empty."""
+        return self.client_offset + 1 if self.clients else 0
 
     @rx.var
-    def total_services(self) -> int:
-        return 0
+    def client_page_end(self) -> int:
+        return self.client_offset + len(self.clients)
 
     @rx.var
-    def renewals_in_30_days(self) -> int:
-        return 0
+    def page_fully_selected(self) -> bool:
+        return bool(self.clients) and len(self.selected_on_page) == len(self.clients)
 
     @rx.var
-    def expired_contracts(self) -> int:
-        return 0
+    def has_previous_clients(self) -> bool:
+        return self.client_offset > 0
 
     @rx.var
-    def upcoming_renewals(self) -> list[ClientWithRenewal]:
-        """Returns clients with contracts expiring in the next 60 days. (Temporary)"""
-        return []
+    def has_next_clients(self) -> bool:
+        return self.client_offset + len(self.clients) < self.matching_clients
+
+    @rx.var(deps=DASHBOARD_DEPS, auto_deps=False)
+    def total_services(self) -> int:
+        return get_contract_store().count_active_services()
+
+    @rx.var(deps=DASHBOARD_DEPS, auto_deps=False)
+    def renewals_in_30_days(self) -> int:
+        return get_contract_store().renewal_counts()["due"]
+
+    @rx.var(deps=DASHBOARD_DEPS, auto_deps=False)
+    def expired_contracts(self) -> int:
+        return get_contract_store().renewal_counts()["expired"]
+
+    @rx.var(deps=DASHBOARD_DEPS, auto_deps=False)
+    def active_services_by_type(self) -> list[ServiceCount]:
+        """Counts active services per service type, in the form's order."""
+        counts = get_contract_store().count_services_by_type("ativo")
+        return [
+            ServiceCount(label=service_type, count=counts.get(service_type, 0))
+            for service_type in SERVICE_OPTIONS
+        ]
+
+    @rx.var(deps=DASHBOARD_DEPS, auto_deps=False)
+    def services_by_status(self) -> list[ServiceCount]:
+        counts = get_contract_store().count_services_by_status()
+        return [
+            ServiceCount(label=status, count=counts.get(status, 0))
+            for status in STATUS_OPTIONS
+        ]
+
+    @rx.var(deps=DASHBOARD_DEPS, auto_deps=False)
+    def upcoming_renewals(self) -> list[ServiceRenewal]:
+        """Returns active services expiring in the next 60 days, most urgent first."""
+        store = get_contract_store()
+        today = store.today.toordinal()
+        renewals = store.renewals_between(
+            today, today + UPCOMING_RENEWALS_DAYS, UPCOMING_RENEWALS_LIMIT
+        )
+        company_names = get_repository().get_client_names(
+            contract.get("client_id", "") for _, _, contract in renewals
+        )
+        return [
+            ServiceRenewal(
+                service_id=service["id"],
+                client_id=contract.get("client_id", ""),
+                company_name=company_names.get(contract.get("client_id", ""), ""),
+                contract_number=contract.get("contract_number", ""),
+                service_type=service["service_type"],
+                end_date=service["end_date"] or "",
+                days_remaining=ordinal - today,
+            )
+            for ordinal, service, contract in renewals
+        ]
+
+    def _load_page(self):
+        """Loads the client page at ``client_offset``, clamped to the last page.
+
+        With a search query the page is a window over the ranked matches from
+        the client index, and with a sort column a window over that column's
+        ordering in the index; otherwise it is read straight from the
+        repository in insertion order.
+        """
+        repository = get_repository()
+        index = get_client_index()
+        self.total_clients = len(index)
+        matches = index.search(
+            self.client_search, self.sort_column or None, self.sort_descending
+        )
+        self.matching_clients = (
+            self.total_clients if matches is None else len(matches)
+        )
+        last_offset = (
+            max(0, self.matching_clients - 1) // CLIENTS_PAGE_SIZE * CLIENTS_PAGE_SIZE
+        )
+        self.client_offset = min(max(0, self.client_offset), last_offset)
+        if matches is None and self.sort_column:
+            self.clients = repository.get_clients(
+                index.ordered_page(
+                    self.sort_column,
+                    self.client_offset,
+                    CLIENTS_PAGE_SIZE,
+                    self.sort_descending,
+                )
+            )
+        elif matches is None:
+            self.clients = repository.list_clients_page(
+                self.client_offset, CLIENTS_PAGE_SIZE
+            )
+        else:
+            self.clients = repository.get_clients(
+                matches[self.client_offset : self.client_offset + CLIENTS_PAGE_SIZE]
+            )
+        self._refresh_selection()
+
+    def _refresh_selection(self):
+        """Updates the selection count and which clients on the page are selected.
+
+        The selected ids themselves stay on the backend, so selecting
+        thousands of clients only sends these two small values to the page.
+        """
+        self.selected_count = len(self._selected_ids)
+        self.selected_on_page = [
+            client["id"]
+            for client in self.clients
+            if client["id"] in self._selected_ids
+        ]
+
+    def _client_position(self, client_id: Optional[str]) -> int:
+        """Returns the position of a client on the loaded page, or -1."""
+        for index, client in enumerate(self.clients):
+            if client["id"] == client_id:
+                return index
+        return -1
 
     def _clear_form(self):
         """Resets all form fields to their default state."""
@@ -85,14 +260,214 @@ class ClientState(rx.State):
         self.error_message = ""
 
     @rx.event
+    @instrumented
+    def load_clients(self):
+        """Loads the current page of clients and the total count."""
+        self._load_page()
+
+    @rx.event
+    @instrumented
+    def load_dashboard(self):
+        """Refreshes the total count and the dashboard metrics."""
+        self.total_clients = len(get_client_index())
+        self._dashboard_version += 1
+
+    @rx.event
+    @instrumented
+    def set_client_search(self, value: str):
+        self.client_search = value
+        self.client_offset = 0
+        self._load_page()
+
+    @rx.event
+    @instrumented
+    def sort_clients(self, column: str):
+        """Sorts by a column, toggling the direction if it is already sorted."""
+        if column not in SORT_FIELDS:
+            return
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+        self.client_offset = 0
+        self._load_page()
+
+    @rx.event
+    @instrumented
+    async def export_clients(self, export_format: str):
+        """Downloads the clients matching the current search and sort.
+
+        Their contracts and services are included. The file is streamed by
+        the export endpoint through a short-lived signed link.
+        """
+        if export_format not in EXPORT_FORMATS:
+            return
+        auth = await self.get_state(AuthState)
+        if not auth.is_authenticated:
+            return rx.redirect("/login")
+        token = sign(
+            {
+                "user": auth.authenticated_user,
+                "format": export_format,
+                "search": self.client_search,
+                "sort": self.sort_column,
+                "descending": self.sort_descending,
+            },
+            EXPORT_LINK_TTL_SECONDS,
+        )
+        url = f"{rx.config.get_config().api_url}/api/export?token={token}"
+        # A Var, since rx.download only accepts plain strings for local paths.
+        return rx.download(url=rx.Var.create(url))
+
+    @rx.event
+    @instrumented
+    def next_clients_page(self):
+        self.client_offset += CLIENTS_PAGE_SIZE
+        self._load_page()
+
+    @rx.event
+    @instrumented
+    def previous_clients_page(self):
+        self.client_offset -= CLIENTS_PAGE_SIZE
+        self._load_page()
+
+    @rx.event
+    @instrumented
+    def toggle_client_selection(self, client_id: str):
+        if client_id in self._selected_ids:
+            del self._selected_ids[client_id]
+        else:
+            self._selected_ids[client_id] = None
+        self._refresh_selection()
+
+    @rx.event
+    @instrumented
+    def toggle_page_selection(self):
+        """Selects every client on the page, or deselects them if all are selected."""
+        if self.page_fully_selected:
+            for client in self.clients:
+                self._selected_ids.pop(client["id"], None)
+        else:
+            self._selected_ids.update(dict.fromkeys(c["id"] for c in self.clients))
+        self._refresh_selection()
+
+    @rx.event
+    @instrumented
+    def select_all_matching(self):
+        """Selects every client matching the current search, across all pages."""
+        matches = get_client_index().search(self.client_search)
+        if matches is None:
+            matches = get_repository().list_client_ids()
+        self._selected_ids.update(dict.fromkeys(matches))
+        self._refresh_selection()
+
+    @rx.event
+    @instrumented
+    def clear_selection(self):
+        self._selected_ids = {}
+        self._refresh_selection()
+
+    @rx.event
+    @instrumented
+    def set_bulk_account_manager(self, value: str):
+        self.bulk_account_manager = value
+
+    @rx.event
+    @instrumented
+    async def bulk_update_clients(self, field: str, value: str):
+        """Sets one field on every selected client and logs a single audit event.
+
+        Only clients whose value actually changes are written, in one
+        repository transaction and one index update.
+        """
+        options = {
+            "bw_account_manager": self.AM_OPTIONS,
+            "datadog_channel": self.DATADOG_CHANNEL_OPTIONS,
+        }
+        if value not in options.get(field, ()) or not self._selected_ids:
+            return
+        repository = get_repository()
+        clients = [
+            client
+            for client in repository.get_clients(list(self._selected_ids))
+            if client[field] != value
+        ]
+        if clients:
+            repository.update_clients(
+                [client["id"] for client in clients], {field: value}
+            )
+            get_client_index().add_many(
+                [{**client, field: value} for client in clients]
+            )
+            auth = await self.get_state(AuthState)
+            audit = await self.get_state(AuditState)
+            await audit.add_event(
+                user=auth.authenticated_user,
+                action="update",
+                client_id="",
+                client_name=f"{len(clients)} clientes",
+                details=(
+                    f"{CLIENT_FIELD_LABELS[field]} alterado para '{value}' em "
+                    f"{len(clients)} clientes: {_bulk_client_names(clients)}."
+                ),
+            )
+        self._selected_ids = {}
+        self.bulk_account_manager = ""
+        self._load_page()
+
+    @rx.event
+    @instrumented
+    def confirm_bulk_delete(self):
+        if self._selected_ids:
+            self.show_bulk_delete_alert = True
+
+    @rx.event
+    @instrumented
+    def cancel_bulk_delete(self):
+        self.show_bulk_delete_alert = False
+
+    @rx.event
+    @instrumented
+    async def bulk_delete_clients(self):
+        """Deletes every selected client with its contracts in one transaction.
+
+        A single audit event lists the deleted clients.
+        """
+        self.show_bulk_delete_alert = False
+        clients = get_repository().get_clients(list(self._selected_ids))
+        if clients:
+            client_ids = [client["id"] for client in clients]
+            contract_state = await self.get_state(ContractState)
+            contract_state.delete_clients(client_ids)
+            get_client_index().remove_many(client_ids)
+            auth = await self.get_state(AuthState)
+            audit = await self.get_state(AuditState)
+            await audit.add_event(
+                user=auth.authenticated_user,
+                action="delete",
+                client_id="",
+                client_name=f"{len(clients)} clientes",
+                details=(
+                    f"{len(clients)} clientes e todos os seus contratos foram "
+                    f"excluídos: {_bulk_client_names(clients)}."
+                ),
+            )
+        self._selected_ids = {}
+        self._load_page()
+
+    @rx.event
+    @instrumented
     def set_bw_account_manager(self, value: str):
         self.bw_account_manager = value
 
     @rx.event
+    @instrumented
     def set_datadog_channel(self, value: str):
         self.datadog_channel = value
 
     @rx.event
+    @instrumented
     def open_add_modal(self):
         """Opens the modal to add a new client."""
         self._clear_form()
@@ -100,9 +475,10 @@ class ClientState(rx.State):
         self.show_form_modal = True
 
     @rx.event
+    @instrumented
     def open_edit_modal(self, client_id: str):
         """Opens the modal to edit an existing client."""
-        client = next((c for c in self.clients if c["id"] == client_id), None)
+        client = get_repository().get_client(client_id)
         if client:
             self.current_client_id = client["id"]
             self.company_name = client["company_name"]
@@ -116,12 +492,14 @@ class ClientState(rx.State):
             self.error_message = ""
 
     @rx.event
+    @instrumented
     def close_modal(self):
         """Closes the client form modal."""
         self.show_form_modal = False
         self._clear_form()
 
     @rx.event
+    @instrumented
     async def save_client(self, form_data: dict):
         """Saves a new or existing client and logs the audit event."""
         self.company_name = form_data.get("company_name", "")
@@ -132,10 +510,9 @@ class ClientState(rx.State):
         )
         self.datadog_channel = form_data.get("datadog_channel", self.datadog_channel)
         self.notes = form_data.get("notes", "")
-        if not self.company_name or not self.contact_person or (not self.contact_email):
-            self.error_message = (
-                "Nome da Empresa, Contratante e E-mail são obrigatórios."
-            )
+        error = client_error(form_data)
+        if error:
+            self.error_message = error
             return
         auth = await self.get_state(AuthState)
         audit = await self.get_state(AuditState)
@@ -148,14 +525,14 @@ class ClientState(rx.State):
             "bw_account_manager": self.bw_account_manager,
             "notes": self.notes,
         }
+        repository = get_repository()
         if self.is_editing:
-            original_client = next(
-                (c for c in self.clients if c["id"] == self.current_client_id), None
-            )
-            self.clients = [
-                client_data if c["id"] == self.current_client_id else c
-                for c in self.clients
-            ]
+            original_client = repository.get_client(client_data["id"])
+            repository.update_client(client_data)
+            get_client_index().add(client_data)
+            position = self._client_position(client_data["id"])
+            if position >= 0:
+                self.clients[position] = client_data
             if original_client:
                 details = self._get_changed_fields(original_client, client_data)
                 if details:
@@ -167,7 +544,10 @@ class ClientState(rx.State):
                         details=details,
                     )
         else:
-            self.clients.append(client_data)
+            repository.insert_client(client_data)
+            get_client_index().add(client_data)
+            self.client_offset = self.total_clients
+            self._load_page()
             await audit.add_event(
                 user=auth.authenticated_user,
                 action="create",
@@ -178,24 +558,26 @@ class ClientState(rx.State):
         self.close_modal()
 
     @rx.event
+    @instrumented
     def confirm_delete_client(self, client_id: str):
         """Shows the delete confirmation alert."""
         self.show_delete_alert = True
         self.client_to_delete_id = client_id
 
     @rx.event
+    @instrumented
     def cancel_delete(self):
         """Cancels the deletion process."""
         self.show_delete_alert = False
         self.client_to_delete_id = None
 
     @rx.event
+    @instrumented
     async def delete_client(self):
         """Deletes the selected client and logs the audit event."""
         if self.client_to_delete_id:
-            client_to_delete = next(
-                (c for c in self.clients if c["id"] == self.client_to_delete_id), None
-            )
+            repository = get_repository()
+            client_to_delete = repository.get_client(self.client_to_delete_id)
             if client_to_delete:
                 auth = await self.get_state(AuthState)
                 audit = await self.get_state(AuditState)
@@ -208,36 +590,22 @@ class ClientState(rx.State):
                     client_name=client_to_delete["company_name"],
                     details=f"Cliente '{client_to_delete['company_name']}' e todos os seus contratos foram excluídos.",
                 )
-                self.clients = [
-                    c for c in self.clients if c["id"] != self.client_to_delete_id
-                ]
+                repository.delete_client(client_to_delete["id"])
+                get_client_index().remove(client_to_delete["id"])
+                self._selected_ids.pop(client_to_delete["id"], None)
+                self._load_page()
         self.cancel_delete()
 
     def _get_changed_fields(self, old_data: Client, new_data: Client) -> str:
         """Compares two client dicts and returns a string of changes."""
         changes = []
-        field_names = {
-            "company_name": "Nome da Empresa",
-            "contact_person": "Contratante",
-            "contact_email": "E-mail",
-            "datadog_channel": "Canal Datadog",
-            "bw_account_manager": "AM BW Soluções",
-            "notes": "Observações",
-        }
         for key, new_value in new_data.items():
             old_value = old_data.get(key)
             if old_value != new_value:
-                field_name = field_names.get(key, key)
+                field_name = CLIENT_FIELD_LABELS.get(key, key)
                 old_value_str = str(old_value or "N/A")
                 new_value_str = str(new_value or "N/A")
                 changes.append(
                     f"{field_name}: de '{old_value_str}' para '{new_value_str}'"
                 )
         return "; ".join(changes)
-
-    @rx.event
-    async def run_migration_if_needed(self):
-        """Triggers the data migration from old client structure to new contract structure."""
-        contract_state = await self.get_state(ContractState)
-        if not contract_state.migration_completed:
-            await contract_state.migrate_legacy_data(self.clients)
\ No newline at end of file
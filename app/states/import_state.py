@@ -0,0 +1,114 @@
+import reflex as rx
+import asyncio
+import csv
+import logging
+import os
+import shutil
+import tempfile
+from app.client_index import get_client_index
+from app.contract_store import get_contract_store
+from app.importer import CsvImporter, MAX_REPORTED_ERRORS
+from app.metrics import instrumented
+from .audit_state import AuditState
+from .auth_state import AuthState
+from .client_state import ClientState
+
+IMPORT_UPLOAD_ID = "client_import"
+
+
+class ImportState(rx.State):
+    """Runs bulk CSV imports of clients, contracts and services in the background."""
+
+    show_import_modal: bool = False
+    is_importing: bool = False
+    import_filename: str = ""
+    imported_rows: int = 0
+    imported_clients: int = 0
+    imported_contracts: int = 0
+    imported_services: int = 0
+    import_error_count: int = 0
+    import_errors: list[str] = []
+    import_message: str = ""
+
+    @rx.event
+    @instrumented
+    def open_import_modal(self):
+        self.show_import_modal = True
+
+    @rx.event
+    @instrumented
+    def close_import_modal(self):
+        self.show_import_modal = False
+
+    @rx.event
+    @instrumented
+    async def handle_import_upload(self, files: list[rx.UploadFile]):
+        """Spools the uploaded CSV to a temporary file and starts the import."""
+        if self.is_importing or not files:
+            return
+        upload = files[0]
+        with tempfile.NamedTemporaryFile("wb", suffix=".csv", delete=False) as f:
+            shutil.copyfileobj(upload.file, f)
+        self.is_importing = True
+        self.import_filename = upload.filename or "importacao.csv"
+        self.imported_rows = 0
+        self.imported_clients = 0
+        self.imported_contracts = 0
+        self.imported_services = 0
+        self.import_error_count = 0
+        self.import_errors = []
+        self.import_message = ""
+        return [
+            rx.clear_selected_files(IMPORT_UPLOAD_ID),
+            ImportState.run_import(f.name),
+        ]
+
+    @rx.event(background=True)
+    @instrumented
+    async def run_import(self, path: str):
+        """Imports the spooled file batch by batch, reporting progress after each.
+
+        Parsing and inserting run in a worker thread; each committed batch is
+        recorded as one audit event.
+        """
+        async with self:
+            auth = await self.get_state(AuthState)
+            user = auth.authenticated_user
+            filename = self.import_filename
+        importer = CsvImporter(get_contract_store(), get_client_index())
+        batches = importer.import_file(path)
+        message = "Falha na importação."
+        try:
+            while True:
+                batch = await asyncio.to_thread(next, batches, None)
+                if batch is None:
+                    break
+                async with self:
+                    audit = await self.get_state(AuditState)
+                    await audit.add_event(
+                        user=user,
+                        action="import",
+                        client_id="",
+                        client_name=filename,
+                        details=batch.summary(filename),
+                    )
+                    self.imported_rows += batch.rows
+                    self.imported_clients += len(batch.clients)
+                    self.imported_contracts += len(batch.contracts)
+                    self.imported_services += len(batch.services)
+                    self.import_error_count += batch.error_count
+                    room = MAX_REPORTED_ERRORS - len(self.import_errors)
+                    if room > 0 and batch.errors:
+                        self.import_errors.extend(batch.errors[:room])
+            message = "Importação concluída."
+        except (ValueError, UnicodeDecodeError, csv.Error) as e:
+            logging.warning(f"Import of {filename} failed: {e}")
+            message = f"Falha na importação: {e}"
+        finally:
+            batches.close()
+            os.remove(path)
+            async with self:
+                self.import_message = message
+                self.is_importing = False
+                client_state = await self.get_state(ClientState)
+                client_state.load_clients()
@@ -0,0 +1,136 @@
+import logging
+import threading
+from typing import Optional
+
+from reflex.event import Event
+from reflex.middleware import Middleware
+from reflex.state import BaseState
+
+from app.audit_index import AuditIndex, get_audit_index
+from app.audit_log import AuditLog, get_audit_log
+from app.client_index import ClientIndex, get_client_index
+from app.contract_store import ContractStore, get_contract_store
+from app.repository import Repository, get_repository
+
+FULL_RELOAD_THRESHOLD = 5000
+"""Above this many pending changes, reloading everything is cheaper."""
+CHANGE_LOG_RETENTION = 100_000
+"""Change log entries kept; a worker further behind reloads everything."""
+PRUNE_EVERY = 1000
+"""Syncs between two prunes of the change log."""
+
+
+class CacheSync:
+    """Keeps this process's caches in step with writes from other workers.
+
+    The client index, the contract store and the audit index are per-process
+    views over the shared database and audit log. ``sync`` catches the
+    audit index up with the shared log, then compares SQLite's
+    ``data_version``, which only moves when another connection commits, so
+    the common case costs a stat and one pragma. Otherwise it replays the
+    ``changes`` rows written since the last sync by other origins, reloading
+    just the rows they name, or everything if it fell behind the retained
+    change log.
+    """
+
+    def __init__(
+        self,
+        repository: Repository,
+        store: ContractStore,
+        client_index: ClientIndex,
+        audit_log: AuditLog,
+        audit_index: AuditIndex,
+    ):
+        self.repository = repository
+        self.store = store
+        self.client_index = client_index
+        self.audit_log = audit_log
+        self.audit_index = audit_index
+        self._lock = threading.Lock()
+        # Unknown until the first sync, which replays everything since the
+        # repository was opened in case the caches loaded after other writes.
+        self._data_version: Optional[int] = None
+        self._last_seq = repository.opened_change_seq
+        self._syncs = 0
+
+    def sync(self) -> int:
+        """Applies other workers' changes; returns how many entities changed."""
+        with self._lock:
+            self.audit_log.refresh()
+            self.audit_index.catch_up(self.audit_log)
+            data_version = self.repository.data_version()
+            if data_version == self._data_version:
+                return 0
+            self._data_version = data_version
+            changes = self.repository.changes_since(self._last_seq)
+            if not changes:
+                return 0
+            if (
+                changes[0]["seq"] > self._last_seq + 1
+                and self.repository.first_change_seq() > self._last_seq + 1
+            ) or len(changes) > FULL_RELOAD_THRESHOLD:
+                self._reload_all()
+            else:
+                self._apply(changes)
+            self._last_seq = changes[-1]["seq"]
+            self._syncs += 1
+            if self._syncs % PRUNE_EVERY == 0:
+                self.repository.prune_changes(CHANGE_LOG_RETENTION)
+            return len(changes)
+
+    def _apply(self, changes: list[dict]):
+        pending: dict[str, dict[str, None]] = {
+            "client": {},
+            "contract": {},
+            "service": {},
+        }
+        for change in changes:
+            if change["origin"] != self.repository.origin:
+                pending[change["entity"]][change["entity_id"]] = None
+        client_ids = list(pending["client"])
+        if client_ids:
+            clients = self.repository.get_clients(client_ids)
+            present = {client["id"] for client in clients}
+            self.client_index.add_many(clients)
+            self.client_index.remove_many(
+                [client_id for client_id in client_ids if client_id not in present]
+            )
+            for client_id in client_ids:
+                self.store.reload_client(client_id)
+        for contract_id in pending["contract"]:
+            self.store.reload_contract(contract_id)
+        for service_id in pending["service"]:
+            self.store.reload_service(service_id)
+
+    def _reload_all(self):
+        logging.info("Cache sync fell behind the change log; reloading everything.")
+        self.client_index.replace_all(self.repository.list_clients())
+        self.store.reload_all()
+
+
+class CacheSyncMiddleware(Middleware):
+    """Syncs the process caches before every event is processed."""
+
+    async def preprocess(self, app, state: BaseState, event: Event) -> None:
+        get_cache_sync().sync()
+        return None
+
+
+_cache_sync: Optional[CacheSync] = None
+_cache_sync_lock = threading.Lock()
+
+
+def get_cache_sync() -> CacheSync:
+    """Returns the process-wide cache sync, creating it on first use."""
+    global _cache_sync
+    if _cache_sync is None:
+        with _cache_sync_lock:
+            if _cache_sync is None:
+                _cache_sync = CacheSync(
+                    get_repository(),
+                    get_contract_store(),
+                    get_client_index(),
+                    get_audit_log(),
+                    get_audit_index(),
+                )
+    return _cache_sync
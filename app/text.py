@@ -0,0 +1,17 @@
+import re
+import unicodedata
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def fold_text(value: str) -> str:
+    """Casefolds a string and strips accents, so "Conceição" becomes "conceicao"."""
+    if value.isascii():
+        return value.lower()
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(value: str) -> list[str]:
+    """Splits folded text into word tokens."""
+    return _TOKEN_RE.findall(fold_text(value))
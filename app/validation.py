@@ -0,0 +1,36 @@
+import datetime
+from typing import Optional
+
+
+def client_error(data: dict) -> Optional[str]:
+    """Returns the validation error for client data, or None if it is valid."""
+    if (
+        not data.get("company_name")
+        or not data.get("contact_person")
+        or not data.get("contact_email")
+    ):
+        return "Nome da Empresa, Contratante e E-mail são obrigatórios."
+    return None
+
+
+def contract_error(data: dict) -> Optional[str]:
+    """Returns the validation error for contract data, or None if it is valid."""
+    if not data.get("contract_number"):
+        return "O número do contrato é obrigatório."
+    return None
+
+
+def service_error(data: dict) -> Optional[str]:
+    """Returns the validation error for service data, or None if it is valid."""
+    if not data.get("service_type"):
+        return "O tipo de serviço é obrigatório."
+    for field in ("start_date", "end_date"):
+        if data.get(field):
+            try:
+                datetime.date.fromisoformat(data[field])
+            except ValueError:
+                return "As datas devem estar no formato AAAA-MM-DD."
+    tam_hours = data.get("tam_hours")
+    if tam_hours and not str(tam_hours).isdigit():
+        return "As horas de TAM devem ser um número inteiro."
+    return None
@@ -0,0 +1,202 @@
+"""Computed-var recompute profiler, switched on with ``CADASTRO_PROFILE_VARS=1``.
+
+When enabled, every ``@rx.var`` recomputation is counted and timed per var,
+together with the event whose processing triggered it. Each new value is also
+compared with the one the var last had in the same session: a recompute that
+produced an equal value was needless, and the events causing those point at
+deps that are too broad. The ranked report is written to ``CADASTRO_VAR_PROFILE_REPORT``
+when the process exits and served at ``/admin/var-profile`` (see ``app.api``)
+to holders of a token from ``python -m app.var_profiler``.
+
+Profiling wraps Reflex's ``ComputedVar.fget`` rather than each getter, since
+Reflex derives automatic deps from the getter's own bytecode. Comparing values
+costs as much as the equality check of each var, so leave it off in
+production.
+"""
+
+import argparse
+import atexit
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import Counter
+from typing import Any
+
+from reflex.event import Event
+from reflex.middleware import Middleware
+from reflex.state import BaseState
+from reflex.vars.base import ComputedVar
+
+from app.signing import sign
+
+PROFILE_VARS = os.environ.get("CADASTRO_PROFILE_VARS", "") == "1"
+"""Whether computed-var recomputations are profiled."""
+VAR_PROFILE_REPORT_PATH = os.environ.get(
+    "CADASTRO_VAR_PROFILE_REPORT", "var_profile.txt"
+)
+REPORT_EVENTS_PER_VAR = 5
+VAR_PROFILE_SCOPE = "var-profile"
+"""Scope of the signed tokens accepted by the report route."""
+VAR_PROFILE_TOKEN_TTL_SECONDS = 60 * 60
+
+_MISSING = object()
+_current_event: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_event", default="(no event)"
+)
+
+
+class VarStats:
+    """Recomputations of one computed var."""
+
+    __slots__ = ("count", "total_ns", "unchanged", "events", "unchanged_events")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.unchanged = 0
+        self.events: Counter[str] = Counter()
+        self.unchanged_events: Counter[str] = Counter()
+
+
+class VarProfile:
+    """Recompute counts and times per computed var, by triggering event."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vars: dict[str, VarStats] = {}
+        # Reflex drops a dirty var's cached value before recomputing it, so
+        # the last value of every var is kept here, per state instance.
+        self._last_values: weakref.WeakKeyDictionary[BaseState, dict[str, Any]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def record(
+        self, instance: BaseState, var: str, event: str, elapsed_ns: int, value: Any
+    ):
+        with self._lock:
+            stats = self._vars.get(var)
+            if stats is None:
+                stats = self._vars[var] = VarStats()
+            last_values = self._last_values.setdefault(instance, {})
+            unchanged = last_values.get(var, _MISSING) == value
+            last_values[var] = value
+            stats.count += 1
+            stats.total_ns += elapsed_ns
+            stats.events[event] += 1
+            if unchanged:
+                stats.unchanged += 1
+                stats.unchanged_events[event] += 1
+
+    def reset(self):
+        with self._lock:
+            self._vars.clear()
+            self._last_values.clear()
+
+    def report(self) -> str:
+        """Returns the vars ranked by cumulative recompute time."""
+        with self._lock:
+            ranked = sorted(
+                self._vars.items(), key=lambda item: item[1].total_ns, reverse=True
+            )
+            lines = [
+                f"{'var':<48}{'recomputes':>11}{'unchanged':>10}"
+                f"{'total ms':>10}{'mean µs':>10}"
+            ]
+            for var, stats in ranked:
+                lines.append(
+                    f"{var:<48}{stats.count:>11}{stats.unchanged:>10}"
+                    f"{stats.total_ns / 1e6:>10.1f}"
+                    f"{stats.total_ns / stats.count / 1e3:>10.1f}"
+                )
+                for event, count in stats.events.most_common(REPORT_EVENTS_PER_VAR):
+                    unchanged = stats.unchanged_events[event]
+                    lines.append(f"    {count:>7} ({unchanged} unchanged)  {event}")
+        return "\n".join(lines) + "\n"
+
+
+var_profile = VarProfile()
+
+
+def _profiled(var: ComputedVar, fget):
+    name = var._name
+
+    def record(instance, start: int, value):
+        var_profile.record(
+            instance,
+            f"{type(instance).__name__}.{name}",
+            _current_event.get(),
+            time.perf_counter_ns() - start,
+            value,
+        )
+
+    if inspect.iscoroutinefunction(fget):
+
+        @functools.wraps(fget)
+        async def async_timed(instance):
+            start = time.perf_counter_ns()
+            value = await fget(instance)
+            record(instance, start, value)
+            return value
+
+        return async_timed
+
+    @functools.wraps(fget)
+    def timed(instance):
+        start = time.perf_counter_ns()
+        value = fget(instance)
+        record(instance, start, value)
+        return value
+
+    return timed
+
+
+def write_report(path: str = VAR_PROFILE_REPORT_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(var_profile.report())
+    logging.info(f"Computed-var profile written to {path}.")
+
+
+_enabled = False
+
+
+def enable_var_profiling():
+    """Starts profiling every computed var and writes the report at exit."""
+    global _enabled
+    if _enabled:
+        return
+    _enabled = True
+    # ComputedVar.__get__ calls ``self.fget(instance)`` exactly when it
+    # recomputes, so timing what that property returns times recomputes.
+    ComputedVar.fget = property(lambda var: _profiled(var, var._fget))
+    atexit.register(write_report)
+
+
+class VarProfileMiddleware(Middleware):
+    """Tags the recomputes made while processing an event with its name."""
+
+    async def preprocess(self, app, state: BaseState, event: Event) -> None:
+        substate, _, handler = event.name.rpartition(".")
+        try:
+            name = f"{type(state).get_class_substate(substate).__name__}.{handler}"
+        except ValueError:
+            name = event.name
+        _current_event.set(name)
+        return None
+
+
+def var_profile_token(ttl_seconds: int = VAR_PROFILE_TOKEN_TTL_SECONDS) -> str:
+    """Returns a signed token granting access to the profile report route."""
+    return sign({"scope": VAR_PROFILE_SCOPE}, ttl_seconds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Prints a token for the /admin/var-profile route."
+    )
+    parser.add_argument("--ttl", type=int, default=VAR_PROFILE_TOKEN_TTL_SECONDS)
+    print(var_profile_token(parser.parse_args().ttl))
@@ -0,0 +1,61 @@
+"""Audit log append throughput and tail-read latency.
+
+Run from the project root:
+
+    python -m benchmarks.bench_audit_log --events 10000000
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+
+from app.audit_log import AuditLog
+
+
+def make_event(i: int) -> dict:
+    return {
+        "id": f"evt-{i}",
+        "timestamp": f"2026-01-01T00:00:{i % 60:02d}.{i:06d}+00:00",
+        "user": f"user{i % 25}",
+        "action": ("create", "update", "delete")[i % 3],
+        "client_id": f"client-{i % 10_000}",
+        "client_name": f"Empresa {i % 10_000}",
+        "details": f"Serviço 'Suporte' atualizado ({i}).",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=10_000_000)
+    parser.add_argument("--segment-mb", type=int, default=64)
+    parser.add_argument("--tail", type=int, default=50)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="audit-bench-")
+    audit_log = AuditLog(directory, max_segment_bytes=args.segment_mb * 1024 * 1024)
+
+    start = time.perf_counter()
+    for i in range(args.events):
+        audit_log.append(make_event(i))
+    elapsed = time.perf_counter() - start
+    print(f"{args.events} events in {len(audit_log._segments)} segments")
+    print(f"append: {elapsed:.2f}s, {args.events / elapsed:,.0f} events/s")
+    audit_log.close()
+
+    reopened = AuditLog(directory, max_segment_bytes=args.segment_mb * 1024 * 1024)
+    samples = []
+    for _ in range(200):
+        start = time.perf_counter()
+        events = reopened.tail(args.tail)
+        samples.append((time.perf_counter() - start) * 1000)
+    assert events[0]["id"] == f"evt-{args.events - 1}"
+    samples.sort()
+    print(
+        f"tail({args.tail}) after reopen: p50 {statistics.median(samples):.3f} ms, "
+        f"p99 {samples[int(len(samples) * 0.99) - 1]:.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
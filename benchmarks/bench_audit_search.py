@@ -0,0 +1,59 @@
+"""Audit trail search latency: linear substring scan vs. the inverted index.
+
+Run from the project root:
+
+    python -m benchmarks.bench_audit_search --events 1000000
+"""
+
+import argparse
+import time
+
+from app.audit_index import AuditIndex
+from benchmarks.bench_audit_log import make_event
+
+QUERIES = ("user7", "delete", "empresa 4242", "serv atual", "suporte 999999", "xyz")
+LIMIT = 500
+
+
+def scan(events: list[dict], query: str) -> list[dict]:
+    """The previous filter: lowercase every field of every event, then sort."""
+    query = query.lower()
+    return sorted(
+        [
+            event
+            for event in events
+            if query in event["user"].lower()
+            or query in event["action"].lower()
+            or query in event["client_name"].lower()
+            or query in event["details"].lower()
+        ],
+        key=lambda e: e["timestamp"],
+        reverse=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    events = [make_event(i) for i in range(args.events)]
+    index = AuditIndex()
+    start = time.perf_counter()
+    for seq, event in enumerate(events):
+        index.add(seq, event)
+    print(f"indexed {args.events} events in {time.perf_counter() - start:.1f}s")
+
+    print(f"{'query':<18}{'scan ms':>10}{'index ms':>10}{'hits':>6}")
+    for query in QUERIES:
+        start = time.perf_counter()
+        scan(events, query)
+        scanned = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        hits = index.search(query, LIMIT)
+        indexed = (time.perf_counter() - start) * 1000
+        print(f"{query:<18}{scanned:>10.1f}{indexed:>10.3f}{len(hits):>6}")
+
+
+if __name__ == "__main__":
+    main()
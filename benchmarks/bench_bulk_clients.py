@@ -0,0 +1,110 @@
+"""Bulk client operations: one client at a time vs. one batched mutation.
+
+Reassigns the account manager of ``--selected`` clients out of ``--clients``
+and then deletes them, first the way per-client edits and deletes do it
+(one write, one index update and one audit event per client), then through
+the bulk paths (one transaction, one index pass, one audit event).
+
+Run from the project root:
+
+    python -m benchmarks.bench_bulk_clients --clients 100000 --selected 2000
+"""
+
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from app.audit_index import AuditIndex
+from app.audit_log import AuditLog
+from app.client_index import ClientIndex
+from app.contract_store import ContractStore
+from app.repository import Repository
+from benchmarks.bench_repository import build_portfolio
+
+NEW_MANAGER = "Raphael Terra"
+
+
+def audit(log: AuditLog, index: AuditIndex, action: str, details: str):
+    event = {
+        "id": str(uuid.uuid4()),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "user": "bench",
+        "action": action,
+        "client_id": "",
+        "client_name": "",
+        "details": details,
+    }
+    index.add(log.append(event), event)
+
+
+def setup(directory: str, args) -> tuple:
+    repository = Repository(os.path.join(directory, "bulk.db"))
+    clients, contracts, services = build_portfolio(args.clients, args.clients * 2)
+    repository.insert_many(clients, contracts, services)
+    client_index = ClientIndex()
+    client_index.add_many(clients)
+    log = AuditLog(os.path.join(directory, "audit"))
+    rng = random.Random(args.seed)
+    selected = [client["id"] for client in rng.sample(clients, args.selected)]
+    return repository, ContractStore(repository), client_index, log, selected
+
+
+def one_by_one(repository, store, client_index, log, selected) -> tuple:
+    audit_index = AuditIndex()
+    start = time.perf_counter()
+    for client in repository.get_clients(selected):
+        client = {**client, "bw_account_manager": NEW_MANAGER}
+        repository.update_client(client)
+        client_index.add(client)
+        audit(log, audit_index, "update", f"AM de {client['company_name']}")
+    reassign = time.perf_counter() - start
+    start = time.perf_counter()
+    for client_id in selected:
+        store.delete_contracts_for_client(client_id)
+        audit(log, audit_index, "delete", client_id)
+        repository.delete_client(client_id)
+        client_index.remove(client_id)
+    return reassign, time.perf_counter() - start
+
+
+def batched(repository, store, client_index, log, selected) -> tuple:
+    audit_index = AuditIndex()
+    start = time.perf_counter()
+    clients = repository.get_clients(selected)
+    repository.update_clients(selected, {"bw_account_manager": NEW_MANAGER})
+    client_index.add_many(
+        [{**client, "bw_account_manager": NEW_MANAGER} for client in clients]
+    )
+    audit(log, audit_index, "update", f"AM de {len(clients)} clientes")
+    reassign = time.perf_counter() - start
+    start = time.perf_counter()
+    store.delete_clients(selected)
+    client_index.remove_many(selected)
+    audit(log, audit_index, "delete", f"{len(selected)} clientes")
+    return reassign, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--selected", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{args.selected} of {args.clients} clients")
+    print(f"{'path':<14}{'reassign s':>12}{'delete s':>10}")
+    for name, run in (("one by one", one_by_one), ("batched", batched)):
+        with tempfile.TemporaryDirectory() as directory:
+            repository, store, client_index, log, selected = setup(directory, args)
+            reassign, delete = run(repository, store, client_index, log, selected)
+            log.close()
+            repository.close()
+        print(f"{name:<14}{reassign:>12.2f}{delete:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
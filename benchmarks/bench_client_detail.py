@@ -0,0 +1,99 @@
+"""Client detail page load time against total portfolio size.
+
+For each portfolio size, fills a scratch database with ``--services-per-client``
+services per client, then opens the detail page of random clients from
+fresh sessions: ``load_client_details`` plus resolving the delta sent to
+the browser. The page only reads the client's own rows from the contract
+store's per-client indexes, so load time and delta size should stay flat
+as the portfolio grows; only the one-off store load at process start
+scales with it.
+
+Run from the project root:
+
+    python -m benchmarks.bench_client_detail --clients 1000 10000 50000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+
+async def open_detail_page(client_id: str) -> int:
+    """Loads a client's detail page from a new session; returns the delta size."""
+    from reflex.istate.data import RouterData
+    from reflex.state import State
+
+    from app.states.auth_state import AuthState
+    from app.states.client_detail_state import ClientDetailState
+
+    root = State(_reflex_internal_init=True)
+    auth = root.get_substate(AuthState.get_full_name().split(".")[1:])
+    auth.authenticated_user = "bench"
+    detail = root.get_substate(ClientDetailState.get_full_name().split(".")[1:])
+    detail.router = RouterData.from_router_data({"query": {"client_id": client_id}})
+    await detail.load_client_details()
+    delta = await root._get_resolved_delta()
+    return len(json.dumps(delta, default=str).encode())
+
+
+async def run(args):
+    import app.contract_store
+    import app.repository
+    from app.contract_store import ContractStore
+    from app.repository import Repository
+    from benchmarks.bench_repository import build_portfolio
+
+    rng = random.Random(args.seed)
+    directory = tempfile.mkdtemp()
+    print(f"{'clients':>9}{'services':>10}{'store load s':>14}"
+          f"{'p50 ms':>9}{'p99 ms':>9}{'delta bytes':>13}")
+    for n_clients in args.clients:
+        n_services = n_clients * args.services_per_client
+        repository = Repository(os.path.join(directory, f"{n_clients}.db"))
+        clients, contracts, services = build_portfolio(n_clients, n_services)
+        repository.insert_many(clients, contracts, services)
+        client_ids = [client["id"] for client in clients]
+        del clients, contracts, services
+        start = time.perf_counter()
+        store = ContractStore(repository)
+        store_load = time.perf_counter() - start
+        # Swap the process-wide singletons for this portfolio.
+        app.repository._repository = repository
+        app.contract_store._store = store
+
+        timings = []
+        sizes = []
+        for _ in range(args.loads):
+            client_id = rng.choice(client_ids)
+            start = time.perf_counter()
+            sizes.append(await open_detail_page(client_id))
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        print(
+            f"{n_clients:>9}{n_services:>10}{store_load:>14.2f}"
+            f"{statistics.median(timings):>9.2f}{p99:>9.2f}"
+            f"{statistics.median(sizes):>13,.0f}"
+        )
+        repository.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--services-per-client", type=int, default=10)
+    parser.add_argument("--loads", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ["CADASTRO_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "unused.db")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
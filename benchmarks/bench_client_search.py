@@ -0,0 +1,95 @@
+"""Client search latency: linear substring scan vs. the trigram index.
+
+Run from the project root:
+
+    python -m benchmarks.bench_client_search --clients 100000
+"""
+
+import argparse
+import random
+import time
+
+from app.client_index import ClientIndex
+from app.text import fold_text
+
+WORDS = (
+    "São", "Paulo", "Conceição", "Tecnologia", "Serviços", "Soluções", "Comércio",
+    "Indústria", "Brasil", "Logística", "Engenharia", "Saúde", "Educação", "Grupo",
+    "Nordeste", "Atlântico", "Horizonte", "Paraná", "Distribuidora", "Financeira",
+)
+FIRST_NAMES = (
+    "Ana", "João", "Maria", "José", "Luíza", "Márcio", "Inês", "Otávio", "Cecília",
+    "André", "Sérgio", "Letícia", "Fábio", "Lúcia", "Rômulo",
+)
+LAST_NAMES = (
+    "Silva", "Conceição", "Araújo", "Gonçalves", "Magalhães", "Simões", "Brandão",
+    "Assunção", "Falcão", "Guimarães",
+)
+ACCOUNT_MANAGERS = (
+    "Camila Nogueira", "Isabela Morassi", "Carolina Cunha", "Raphael Terra",
+)
+QUERIES = (
+    "sao paulo", "conceicao", "Conceição 4242", "guimar", "logistica atlantico",
+    "ines falcao", "client7777", "x", "zzz",
+)
+
+
+def make_client(rng: random.Random, i: int) -> dict:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "id": f"client{i}",
+        "company_name": " ".join(rng.sample(WORDS, 3)) + f" {i}",
+        "contact_person": f"{first} {last}",
+        "contact_email": f"{fold_text(first)}.{fold_text(last)}@client{i}.com.br",
+        "bw_account_manager": rng.choice(ACCOUNT_MANAGERS),
+    }
+
+
+SCAN_FIELDS = ("company_name", "contact_person", "contact_email")
+
+
+def scan(clients: list[dict], query: str) -> list[str]:
+    """Folds every field of every client and checks each query token."""
+    tokens = fold_text(query).split()
+    return [
+        client["id"]
+        for client in clients
+        if all(
+            any(token in fold_text(client[field]) for field in SCAN_FIELDS)
+            for token in tokens
+        )
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    clients = [make_client(rng, i) for i in range(args.clients)]
+    index = ClientIndex()
+    start = time.perf_counter()
+    for client in clients:
+        index.add(client)
+    print(f"indexed {args.clients} clients in {time.perf_counter() - start:.1f}s")
+
+    print(f"{'query':<22}{'scan ms':>10}{'index ms':>10}{'cached ms':>11}{'hits':>8}")
+    for query in QUERIES:
+        start = time.perf_counter()
+        scan(clients, query)
+        scanned = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        hits = index.search(query)
+        indexed = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        index.search(query)
+        cached = (time.perf_counter() - start) * 1000
+        print(
+            f"{query:<22}{scanned:>10.1f}{indexed:>10.3f}{cached:>11.3f}{len(hits):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
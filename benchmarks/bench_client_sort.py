@@ -0,0 +1,57 @@
+"""Clients table sorting: sorting every client per page vs. maintained orderings.
+
+Run from the project root:
+
+    python -m benchmarks.bench_client_sort --clients 100000
+"""
+
+import argparse
+import random
+import time
+
+from app.client_index import SORT_FIELDS, ClientIndex
+from app.text import fold_text
+from benchmarks.bench_client_search import make_client
+
+PAGE_SIZE = 25
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--updates", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    clients = [make_client(rng, i) for i in range(args.clients)]
+    index = ClientIndex()
+    start = time.perf_counter()
+    index.add_many(clients)
+    print(f"indexed {args.clients} clients in {time.perf_counter() - start:.1f}s")
+
+    print(f"{'column':<20}{'sorted() ms':>12}{'page ms':>10}{'last page ms':>14}")
+    for field in SORT_FIELDS:
+        start = time.perf_counter()
+        ordered = sorted(clients, key=lambda client: fold_text(client[field]))
+        ordered[:PAGE_SIZE]
+        full = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        index.ordered_page(field, 0, PAGE_SIZE)
+        first = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        index.ordered_page(field, args.clients - PAGE_SIZE, PAGE_SIZE, True)
+        last = (time.perf_counter() - start) * 1000
+        print(f"{field:<20}{full:>12.1f}{first:>10.3f}{last:>14.3f}")
+
+    start = time.perf_counter()
+    for i in range(args.updates):
+        client = dict(clients[rng.randrange(args.clients)])
+        client["company_name"] = f"Renomeada {i}"
+        index.add(client)
+    elapsed = time.perf_counter() - start
+    print(f"incremental update  {elapsed / args.updates * 1e6:.0f} µs per client")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Portfolio export throughput and memory, through the real HTTP endpoint.
+
+Loads ``--services`` services into a temporary database, then calls the
+export route of the ASGI app directly with a signed link, counting the
+streamed body chunk by chunk as a server would send it. Reports bytes per
+second and how far the peak RSS rose above the RSS with the data loaded.
+
+Run from the project root:
+
+    python -m benchmarks.bench_export --clients 10000 --services 100000
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import tempfile
+import time
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def download(app, path: str, query: str) -> int:
+    """Runs one GET through the ASGI app and returns the body size."""
+    size = 0
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal size, status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": [],
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 0),
+    }
+    await app(scope, receive, send)
+    if status != 200:
+        raise RuntimeError(f"export returned {status}")
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--services", type=int, default=100_000)
+    args = parser.parse_args()
+
+    # The endpoint uses the process-wide repository, so point it at a scratch
+    # database before anything imports app.repository.
+    directory = tempfile.mkdtemp()
+    os.environ["CADASTRO_DB_PATH"] = os.path.join(directory, "export.db")
+    from app.api import api
+    from app.client_index import get_client_index
+    from app.contract_store import get_contract_store
+    from app.repository import get_repository
+    from app.signing import sign
+    from benchmarks.bench_repository import build_portfolio
+
+    clients, contracts, services = build_portfolio(args.clients, args.services)
+    get_repository().insert_many(clients, contracts, services)
+    del clients, contracts, services
+    get_contract_store()
+    get_client_index()
+
+    print(f"{args.clients} clients / {args.services} services")
+    print(f"{'format':<8}{'MB':>8}{'seconds':>10}{'MB/s':>8}{'RSS rise MB':>13}")
+    for export_format in ("csv", "jsonl"):
+        baseline = peak_rss_mb()
+        token = sign({"user": "bench", "format": export_format}, 600)
+        start = time.perf_counter()
+        size = asyncio.run(download(api, "/api/export", f"token={token}"))
+        elapsed = time.perf_counter() - start
+        print(
+            f"{export_format:<8}{size / 1e6:>8.1f}{elapsed:>10.2f}"
+            f"{size / 1e6 / elapsed:>8.1f}{peak_rss_mb() - baseline:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
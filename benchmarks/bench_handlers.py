@@ -0,0 +1,295 @@
+"""State handler benchmark suite on a synthetic portfolio.
+
+Generates a portfolio with ``benchmarks.synthetic`` into a scratch database
+and audit log, then drives the real event handlers outside the browser the
+way the backend processes an event: run the handler, then resolve the delta
+sent to the browser. Per-operation setup (opening a page or a modal) is not
+timed. Each benchmark reports ops/sec, p50/p99 latency, and the peak memory
+allocated by one operation, measured with ``tracemalloc`` in a separate,
+shorter pass so tracing does not skew the timings.
+
+Results are compared against the stored baseline when it was taken at the
+same scale; ``--save-baseline`` replaces it. Run from the project root:
+
+    python -m benchmarks.bench_handlers
+    python -m benchmarks.bench_handlers --clients 1000 --services 10000 \\
+        --audit-events 100000
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "handlers.json")
+SCALE_FIELDS = ("seed", "clients", "contracts_per_client", "services", "audit_events")
+WARMUP_OPS = 5
+AUDIT_QUERIES = ("", "delete", "suporte", "horizonte", "licenciamento atualizado")
+
+
+def _substate(root, state_class):
+    return root.get_substate(state_class.get_full_name().split(".")[1:])
+
+
+def new_session():
+    """Returns the root state of a fresh, logged-in session."""
+    from reflex.state import State
+
+    from app.states.auth_state import AuthState
+
+    root = State(_reflex_internal_init=True)
+    _substate(root, AuthState).authenticated_user = "bench"
+    return root
+
+
+async def open_detail_page(root, client_id: str):
+    from reflex.istate.data import RouterData
+
+    from app.states.client_detail_state import ClientDetailState
+
+    detail = _substate(root, ClientDetailState)
+    detail.router = RouterData.from_router_data({"query": {"client_id": client_id}})
+    await detail.load_client_details()
+    return detail
+
+
+def build_benchmarks(portfolio, rng: random.Random, ops: int) -> dict:
+    """Maps benchmark names to ``(prepare, run)`` pairs of async callables.
+
+    ``prepare(i)`` returns the session root for operation ``i`` and is not
+    timed; ``run(root, i)`` is the handler being measured.
+    """
+    from app.contract_store import get_contract_store
+    from app.states.audit_state import AuditState
+    from app.states.client_detail_state import ClientDetailState
+    from app.states.client_state import ClientState
+
+    clients, contracts, services = portfolio
+    store = get_contract_store()
+    client_of_contract = {c["id"]: c["client_id"] for c in contracts}
+    # Enough distinct rows for the warm-up, timing and memory passes.
+    needed = 2 * (ops + WARMUP_OPS)
+    doomed = rng.sample(contracts, needed)
+    doomed_ids = {contract["id"] for contract in doomed}
+    editable = rng.sample(
+        [s for s in services if s["contract_id"] not in doomed_ids], needed
+    )
+    session = new_session()
+    _substate(session, ClientState).load_clients()
+
+    async def shared_session(i):
+        return session
+
+    async def save_client_create(root, i):
+        client_state = _substate(root, ClientState)
+        client_state.open_add_modal()
+        await client_state.save_client(
+            {
+                "company_name": f"Nova Empresa {i}",
+                "contact_person": f"Contato {i}",
+                "contact_email": f"contato{i}@example.com.br",
+                "notes": "",
+            }
+        )
+
+    async def save_client_edit(root, i):
+        client_state = _substate(root, ClientState)
+        client = clients[rng.randrange(len(clients))]
+        client_state.open_edit_modal(client["id"])
+        await client_state.save_client({**client, "notes": f"Revisado {i}"})
+
+    async def prepare_service_edit(i):
+        root = new_session()
+        service = store.get_service(editable[i]["id"])
+        detail = await open_detail_page(
+            root, client_of_contract[service["contract_id"]]
+        )
+        detail.open_edit_service_modal(service)
+        root._clean()
+        return root
+
+    async def save_service(root, i):
+        detail = _substate(root, ClientDetailState)
+        service = store.get_service(editable[i]["id"])
+        await detail.save_service(
+            {
+                "service_type": service["service_type"],
+                "start_date": service["start_date"],
+                "end_date": datetime.date.fromordinal(
+                    datetime.date.today().toordinal() + i % 700
+                ).isoformat(),
+                "status": service["status"],
+                "tam_hours": service["tam_hours"],
+                "support_type": service["support_type"],
+                "licensing_provider": service["licensing_provider"],
+            }
+        )
+
+    async def prepare_contract_delete(i):
+        root = new_session()
+        contract = doomed[i]
+        detail = await open_detail_page(root, contract["client_id"])
+        detail.confirm_delete_contract(contract["id"])
+        root._clean()
+        return root
+
+    async def delete_contract(root, i):
+        await _substate(root, ClientDetailState).delete_contract()
+
+    async def prepare_detail(i):
+        return new_session()
+
+    async def load_client_details(root, i):
+        await open_detail_page(root, clients[rng.randrange(len(clients))]["id"])
+
+    async def prepare_audit_search(i):
+        _substate(session, AuditState).set_search_query(
+            AUDIT_QUERIES[i % len(AUDIT_QUERIES)]
+        )
+        return session
+
+    async def filtered_audit_events(root, i):
+        # The search handler only stores the query; the page is computed
+        # when the delta is resolved.
+        pass
+
+    return {
+        "save_client (create)": (shared_session, save_client_create),
+        "save_client (edit)": (shared_session, save_client_edit),
+        "save_service (edit)": (prepare_service_edit, save_service),
+        "delete_contract": (prepare_contract_delete, delete_contract),
+        "load_client_details": (prepare_detail, load_client_details),
+        "filtered_audit_events": (prepare_audit_search, filtered_audit_events),
+    }
+
+
+async def time_ops(prepare, run, first: int, count: int) -> list[float]:
+    """Returns the latency in milliseconds of ``count`` operations."""
+    timings = []
+    for i in range(first, first + count):
+        root = await prepare(i)
+        start = time.perf_counter()
+        await run(root, i)
+        await root._get_resolved_delta()
+        timings.append((time.perf_counter() - start) * 1000)
+        root._clean()
+    return timings
+
+
+async def peak_memory(prepare, run, first: int, count: int) -> int:
+    """Returns the largest number of bytes allocated during one operation."""
+    peak = 0
+    tracemalloc.start()
+    try:
+        for i in range(first, first + count):
+            root = await prepare(i)
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await run(root, i)
+            await root._get_resolved_delta()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+            root._clean()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def load_baseline(scale: dict) -> dict:
+    """Returns the baseline results, or {} if missing or taken at another scale."""
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH) as f:
+        baseline = json.load(f)
+    if baseline["scale"] != scale:
+        print(f"Baseline taken at another scale ({baseline['scale']}); not compared.")
+        return {}
+    return baseline["results"]
+
+
+async def run(args):
+    from app.audit_index import get_audit_index
+    from app.audit_log import get_audit_log
+    from app.client_index import get_client_index
+    from app.contract_store import get_contract_store
+    from app.repository import get_repository
+    from benchmarks.synthetic import populate
+
+    scale = {field: getattr(args, field) for field in SCALE_FIELDS}
+    start = time.perf_counter()
+    portfolio = populate(get_repository(), get_audit_log(), **scale)
+    print(f"generated {scale} in {time.perf_counter() - start:.1f}s")
+    start = time.perf_counter()
+    get_contract_store()
+    get_client_index()
+    get_audit_index()
+    print(f"caches loaded in {time.perf_counter() - start:.1f}s")
+
+    benchmarks = build_benchmarks(portfolio, random.Random(args.seed), args.ops)
+    results = {}
+    for name, (prepare, handler) in benchmarks.items():
+        await time_ops(prepare, handler, 0, WARMUP_OPS)
+        timings = await time_ops(prepare, handler, WARMUP_OPS, args.ops)
+        peak = await peak_memory(
+            prepare, handler, WARMUP_OPS + args.ops, min(args.memory_ops, args.ops)
+        )
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        results[name] = {
+            "ops_per_sec": round(1000 * len(timings) / sum(timings), 1),
+            "p50_ms": round(statistics.median(timings), 3),
+            "p99_ms": round(p99, 3),
+            "peak_kib": round(peak / 1024, 1),
+        }
+
+    baseline = load_baseline(scale)
+    print(
+        f"{'handler':<24}{'ops/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'peak KiB':>10}"
+        f"{'p50 vs base':>13}"
+    )
+    for name, result in results.items():
+        change = ""
+        if name in baseline:
+            ratio = result["p50_ms"] / baseline[name]["p50_ms"] - 1
+            change = f"{ratio:+.0%}"
+        print(
+            f"{name:<24}{result['ops_per_sec']:>9,.0f}{result['p50_ms']:>9.2f}"
+            f"{result['p99_ms']:>9.2f}{result['peak_kib']:>10,.0f}{change:>13}"
+        )
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({"scale": scale, "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline saved to {BASELINE_PATH}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--contracts-per-client", type=int, default=5)
+    parser.add_argument("--services", type=int, default=100_000)
+    parser.add_argument("--audit-events", type=int, default=1_000_000)
+    parser.add_argument("--ops", type=int, default=200)
+    parser.add_argument("--memory-ops", type=int, default=20)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    # The states use the process-wide repository and audit log, so point
+    # them at scratch locations before anything imports them.
+    directory = tempfile.mkdtemp()
+    os.environ["CADASTRO_DB_PATH"] = os.path.join(directory, "handlers.db")
+    os.environ["CADASTRO_AUDIT_LOG_DIR"] = os.path.join(directory, "audit")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
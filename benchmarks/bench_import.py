@@ -0,0 +1,104 @@
+"""Bulk CSV import throughput and memory.
+
+Writes a CSV with ``--rows`` services (three per contract, two contracts
+per client) to a temporary directory, imports it into a fresh database and
+reports rows per second and the peak traced allocation size.
+
+The stores keep every imported row in memory by design, so the peak grows
+with the data; ``--discard`` swaps them for sinks that drop each batch, to
+show that the importer's own working set (one batch plus the client and
+contract id maps) does not grow with the file.
+
+Run from the project root:
+
+    python -m benchmarks.bench_import --rows 200000
+"""
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from app.client_index import ClientIndex
+from app.contract_store import ContractStore
+from app.importer import IMPORT_COLUMNS, CsvImporter
+from app.repository import Repository
+
+SERVICE_TYPES = ("Licenciamento", "Suporte", "TAM", "Gestão Cloud")
+SERVICES_PER_CONTRACT = 3
+CONTRACTS_PER_CLIENT = 2
+
+
+class _Sink:
+    """Drops committed batches, standing in for both stores with --discard."""
+
+    def add_many(self, *batches):
+        pass
+
+
+def write_csv(path: str, rows: int, seed: int):
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=IMPORT_COLUMNS)
+        writer.writeheader()
+        for i in range(rows):
+            contract = i // SERVICES_PER_CONTRACT
+            client = contract // CONTRACTS_PER_CLIENT
+            writer.writerow(
+                {
+                    "company_name": f"Empresa {client}",
+                    "contact_person": f"Contato {client}",
+                    "contact_email": f"contato{client}@empresa.com.br",
+                    "bw_account_manager": "Camila Nogueira",
+                    "contract_number": f"CT-{contract}",
+                    "service_type": rng.choice(SERVICE_TYPES),
+                    "start_date": "2024-01-01",
+                    "end_date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                    "tam_hours": rng.choice(("", "10", "20")),
+                }
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--discard", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "import.csv")
+        write_csv(path, args.rows, args.seed)
+        size_mb = os.path.getsize(path) / 1e6
+        repository = Repository(os.path.join(directory, "import.db"))
+        if args.discard:
+            importer = CsvImporter(_Sink(), _Sink())
+        else:
+            importer = CsvImporter(ContractStore(repository), ClientIndex())
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        batches = 0
+        early_peak = None
+        for batch in importer.import_file(path):
+            batches += 1
+            del batch
+            if batches == 10:
+                early_peak = tracemalloc.get_traced_memory()[1]
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        repository.close()
+
+    print(f"file               {size_mb:.1f} MB, {args.rows} rows, {batches} batches")
+    print(f"throughput         {args.rows / elapsed:,.0f} rows/s")
+    if early_peak is not None:
+        print(f"peak after 10      {early_peak / 1e6:.1f} MB traced")
+    print(f"peak at the end    {peak / 1e6:.1f} MB traced")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Unrelated-event latency while logins are in flight.
+
+Reflex runs every event handler on the server's event loop, so a handler
+that sleeps or runs bcrypt inline stalls every other client's events until
+it returns. This drives the real handlers on session roots, the way
+``benchmarks.bench_handlers`` does: it starts ``--logins`` concurrent
+``AuthState.login`` calls, each for its own registered user, and meanwhile
+repeatedly dispatches ``AuditState.set_search_query`` (a search-box
+keystroke) on another session, resolving its delta, and measures how long
+each one takes. The same probe with no logins in flight is the baseline;
+if login blocked the loop, the p99 under load would jump to whole bcrypt
+verifications.
+
+Run from the project root:
+
+    python -m benchmarks.bench_login_concurrency --logins 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_handlers import _substate, new_session
+
+PROBE_INTERVAL = 0.01
+PASSWORD = "s3nha-forte"
+
+
+async def register_users(count: int) -> list[str]:
+    from app.passwords import hash_password
+    from app.repository import get_repository
+
+    password_hash = await hash_password(PASSWORD)
+    usernames = [f"usuario-{i}" for i in range(count)]
+    for username in usernames:
+        get_repository().insert_user(
+            {"username": username, "password_hash": password_hash}
+        )
+    return usernames
+
+
+async def login(username: str) -> bool:
+    from app.states.auth_state import AuthState
+
+    auth = _substate(new_session(), AuthState)
+    auth.authenticated_user = ""
+    async for _ in auth.login({"username": username, "password": PASSWORD}):
+        pass
+    return auth.authenticated_user == username
+
+
+async def run(usernames: list[str]) -> tuple[float, int, list[float]]:
+    from app.states.audit_state import AuditState
+
+    root = new_session()
+    audit = _substate(root, AuditState)
+    latencies: list[float] = []
+    done = asyncio.Event()
+
+    async def probe():
+        count = 0
+        while not done.is_set():
+            start = time.perf_counter()
+            audit.set_search_query(f"suporte {count}")
+            await root._get_resolved_delta()
+            root._clean()
+            latencies.append(time.perf_counter() - start)
+            count += 1
+            await asyncio.sleep(PROBE_INTERVAL)
+
+    probing = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    if usernames:
+        results = await asyncio.gather(*(login(username) for username in usernames))
+    else:
+        await asyncio.sleep(1)
+        results = []
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probing
+    return elapsed, sum(results), latencies
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def main_async(logins: int):
+    from app.states.audit_state import AuditState
+
+    _substate(new_session(), AuditState).load_audit_events()
+    usernames = await register_users(logins)
+    print(
+        f"{'logins':<12}{'succeeded':>10}{'total s':>9}{'probes':>8}"
+        f"{'p50 ms':>10}{'p99 ms':>10}"
+    )
+    for name, batch in (("none", []), (str(logins), usernames)):
+        elapsed, succeeded, latencies = await run(batch)
+        p50 = statistics.median(latencies) * 1000 if latencies else float("nan")
+        p99 = percentile(latencies, 0.99) * 1000 if latencies else float("nan")
+        print(
+            f"{name:<12}{succeeded:>10}{elapsed:>9.2f}{len(latencies):>8}"
+            f"{p50:>10.2f}{p99:>10.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=50)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ["CADASTRO_DB_PATH"] = os.path.join(directory, "logins.db")
+    os.environ["CADASTRO_AUDIT_LOG_DIR"] = os.path.join(directory, "audit")
+    # Every login is let through to bcrypt, so the pool is really loaded.
+    os.environ.setdefault("CADASTRO_MAX_PENDING_HASHES", str(args.logins))
+    asyncio.run(main_async(args.logins))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Per-event overhead of the handler instrumentation in ``app.metrics``.
+
+Times trivial handlers of each kind with and without ``instrumented``, so
+the difference is the wrapper's own cost, plus the cost it adds to a
+``get_state`` call. For scale, also times one whole event through Reflex's
+processing of a real, instrumented handler.
+
+Run from the project root:
+
+    python -m benchmarks.bench_metrics --calls 200000
+"""
+
+import argparse
+import asyncio
+import inspect
+import os
+import tempfile
+import time
+
+
+def handler(self, value):
+    return value
+
+
+async def async_handler(self, value):
+    return value
+
+
+async def async_gen_handler(self, value):
+    yield value
+
+
+def gen_handler(self, value):
+    yield value
+
+
+async def per_call_ns(fn, calls: int) -> float:
+    start = time.perf_counter_ns()
+    if inspect.iscoroutinefunction(fn):
+        for i in range(calls):
+            await fn(None, i)
+    elif inspect.isasyncgenfunction(fn):
+        for i in range(calls):
+            async for _ in fn(None, i):
+                pass
+    elif inspect.isgeneratorfunction(fn):
+        for i in range(calls):
+            for _ in fn(None, i):
+                pass
+    else:
+        for i in range(calls):
+            fn(None, i)
+    return (time.perf_counter_ns() - start) / calls
+
+
+async def run(args):
+    from reflex.event import Event
+    from reflex.state import State
+
+    from app.metrics import _get_state, instrumented
+    from app.states.auth_state import AuthState
+    from app.states.base_state import BaseState
+
+    print(
+        f"{'handler kind':<18}{'bare ns':>10}{'instrumented ns':>17}"
+        f"{'overhead ns':>13}"
+    )
+    for name, fn in (
+        ("plain", handler),
+        ("async", async_handler),
+        ("generator", gen_handler),
+        ("async generator", async_gen_handler),
+    ):
+        bare = await per_call_ns(fn, args.calls)
+        wrapped = await per_call_ns(instrumented(fn), args.calls)
+        print(f"{name:<18}{bare:>10.0f}{wrapped:>17.0f}{wrapped - bare:>13.0f}")
+
+    root = State(_reflex_internal_init=True)
+    base = root.get_substate(BaseState.get_full_name().split(".")[1:])
+    start = time.perf_counter_ns()
+    for _ in range(args.calls):
+        await _get_state(base, AuthState)
+    bare = (time.perf_counter_ns() - start) / args.calls
+    start = time.perf_counter_ns()
+    for _ in range(args.calls):
+        await base.get_state(AuthState)
+    counted = (time.perf_counter_ns() - start) / args.calls
+    print(f"{'get_state call':<18}{bare:>10.0f}{counted:>17.0f}{counted - bare:>13.0f}")
+
+    event = Event(
+        token="bench", name=f"{BaseState.get_full_name()}.require_login", payload={}
+    )
+    events = args.calls // 20
+    start = time.perf_counter_ns()
+    for _ in range(events):
+        async for _ in root._process(event):
+            pass
+    whole = (time.perf_counter_ns() - start) / events
+    print(f"one whole Reflex event (require_login): {whole / 1000:.1f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ["CADASTRO_DB_PATH"] = os.path.join(directory, "metrics.db")
+    os.environ["CADASTRO_AUDIT_LOG_DIR"] = os.path.join(directory, "audit")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
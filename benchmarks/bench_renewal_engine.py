@@ -0,0 +1,69 @@
+"""Days-remaining throughput: per-item strptime vs. RenewalEngine.
+
+Run from the project root:
+
+    python -m benchmarks.bench_renewal_engine --services 1000000
+"""
+
+import argparse
+import datetime
+import random
+import time
+
+from app.renewal_engine import NO_END_DATE, RenewalEngine
+
+
+def per_item_days_remaining(end_date_str):
+    """The previous per-service computation, kept here as the baseline."""
+    if not end_date_str:
+        return NO_END_DATE
+    try:
+        end_date = datetime.datetime.strptime(end_date_str, "%Y-%m-%d").date()
+        return (end_date - datetime.date.today()).days
+    except (ValueError, TypeError):
+        return NO_END_DATE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    today = datetime.date.today()
+    ids = [f"svc-{i}" for i in range(args.services)]
+    end_dates = [
+        (today + datetime.timedelta(days=rng.randint(-90, 720))).isoformat()
+        if rng.random() > 0.05
+        else None
+        for _ in ids
+    ]
+
+    start = time.perf_counter()
+    days_map = {
+        service_id: per_item_days_remaining(end_date)
+        for service_id, end_date in zip(ids, end_dates)
+    }
+    baseline = time.perf_counter() - start
+
+    engine = RenewalEngine()
+    start = time.perf_counter()
+    engine.load(ids, end_dates)
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine_days = engine.days_remaining(today.toordinal())
+    days = time.perf_counter() - start
+
+    assert engine_days == days_map
+
+    n = args.services
+    print(f"{n} services")
+    print(f"per-item strptime days:         {baseline:8.3f}s  {n / baseline:>14,.0f}/s")
+    print(f"engine bulk load (one-off):     {load:8.3f}s  {n / load:>14,.0f}/s")
+    print(f"engine days-remaining map:      {days:8.3f}s  {n / days:>14,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Compares handler data-path latency: per-session lists vs. the SQLite repository.
+
+Run from the project root:
+
+    python -m benchmarks.bench_repository --clients 10000 --services 100000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+from app.repository import Repository
+
+
+def build_portfolio(n_clients: int, n_services: int):
+    clients = []
+    contracts = []
+    services = []
+    for i in range(n_clients):
+        client_id = str(uuid.uuid4())
+        clients.append(
+            {
+                "id": client_id,
+                "company_name": f"Empresa {i}",
+                "contact_person": f"Contato {i}",
+                "contact_email": f"contato{i}@example.com",
+                "datadog_channel": "Enterprise",
+                "bw_account_manager": "Camila Nogueira",
+                "notes": "",
+            }
+        )
+        contracts.append(
+            {
+                "id": str(uuid.uuid4()),
+                "client_id": client_id,
+                "contract_number": f"CT-{i}",
+                "status": "ativo",
+                "notes": "",
+            }
+        )
+    for i in range(n_services):
+        contract = contracts[i % len(contracts)]
+        services.append(
+            {
+                "id": str(uuid.uuid4()),
+                "contract_id": contract["id"],
+                "service_type": "Suporte",
+                "start_date": "2025-01-01",
+                "end_date": f"2026-{(i % 12) + 1:02d}-15",
+                "status": "ativo",
+                "tam_hours": None,
+                "support_type": "Standard",
+                "licensing_provider": None,
+            }
+        )
+    return clients, contracts, services
+
+
+def measure(fn, repeat: int) -> tuple[float, float]:
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--services", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    clients, contracts, services = build_portfolio(args.clients, args.services)
+    state = {"clients": list(clients), "contracts": list(contracts)}
+    state["services"] = list(services)
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    repository = Repository(db_path)
+    repository.insert_clients(clients)
+    repository.insert_contracts(contracts)
+    repository.insert_services(services)
+
+    def list_save_client(i):
+        edited = dict(clients[i % len(clients)], notes=f"edit {i}")
+        original = next(c for c in state["clients"] if c["id"] == edited["id"])
+        state["clients"] = [
+            edited if c["id"] == original["id"] else c for c in state["clients"]
+        ]
+
+    def repo_save_client(i):
+        edited = dict(clients[i % len(clients)], notes=f"edit {i}")
+        repository.get_client(edited["id"])
+        repository.update_client(edited)
+
+    def list_save_service(i):
+        edited = dict(services[i], status="inativo")
+        state["services"] = [
+            edited if s["id"] == edited["id"] else s for s in state["services"]
+        ]
+
+    def repo_save_service(i):
+        repository.update_service(dict(services[i], status="inativo"))
+
+    def list_delete_contract(i):
+        contract_id = contracts[-(i + 1)]["id"]
+        next(c for c in state["contracts"] if c["id"] == contract_id)
+        state["contracts"] = [c for c in state["contracts"] if c["id"] != contract_id]
+        state["services"] = [
+            s for s in state["services"] if s["contract_id"] != contract_id
+        ]
+
+    def repo_delete_contract(i):
+        contract_id = contracts[-(i + 1)]["id"]
+        repository.get_contract(contract_id)
+        repository.delete_contract(contract_id)
+
+    print(f"{args.clients} clients / {args.services} services, {args.repeat} runs")
+    print(f"{'handler':<18}{'lists p50/p99 ms':>22}{'sqlite p50/p99 ms':>22}")
+    for name, list_fn, repo_fn in (
+        ("save_client", list_save_client, repo_save_client),
+        ("save_service", list_save_service, repo_save_service),
+        ("delete_contract", list_delete_contract, repo_delete_contract),
+    ):
+        list_p50, list_p99 = measure(list_fn, args.repeat)
+        repo_p50, repo_p99 = measure(repo_fn, args.repeat)
+        print(
+            f"{name:<18}{list_p50:>12.3f}/{list_p99:<9.3f}"
+            f"{repo_p50:>12.3f}/{repo_p99:<9.3f}"
+        )
+    repository.close()
+
+
+if __name__ == "__main__":
+    main()
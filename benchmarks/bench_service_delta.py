@@ -0,0 +1,91 @@
+"""Websocket delta size of a service edit on the client detail page.
+
+Loads one client with ``--services`` services into a scratch database,
+opens its detail page state and edits one service, measuring the JSON
+delta Reflex would send to the browser. For comparison it also measures a
+full resend of the client's services, which is what every edit used to
+trigger and what adding or deleting a service still does.
+
+Run from the project root:
+
+    python -m benchmarks.bench_service_delta --services 50000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+
+async def measure(root, action) -> tuple[int, float]:
+    """Runs ``action`` and returns the size of the resulting delta and its time."""
+    root._clean()
+    start = time.perf_counter()
+    await action()
+    delta = await root._get_resolved_delta()
+    elapsed = time.perf_counter() - start
+    root._clean()
+    return len(json.dumps(delta, default=str).encode()), elapsed
+
+
+async def run(args):
+    from reflex.state import State
+
+    from app.contract_store import get_contract_store
+    from app.repository import get_repository
+    from app.states.auth_state import AuthState
+    from app.states.client_detail_state import ClientDetailState
+    from benchmarks.bench_repository import build_portfolio
+
+    clients, contracts, services = build_portfolio(1, args.services)
+    get_repository().insert_many(clients, contracts, services)
+    root = State(_reflex_internal_init=True)
+    auth = root.get_substate(AuthState.get_full_name().split(".")[1:])
+    auth.authenticated_user = "bench"
+    detail = root.get_substate(ClientDetailState.get_full_name().split(".")[1:])
+    detail.client = clients[0]
+    detail.client_contracts = get_contract_store().contracts_for_client(
+        clients[0]["id"]
+    )
+    detail._refresh_services()
+    await root._get_resolved_delta()
+
+    async def full_resend():
+        detail._refresh_services()
+
+    async def edit_one():
+        service = get_contract_store().get_service(services[len(services) // 2]["id"])
+        detail.open_edit_service_modal(service)
+        await detail.save_service(
+            {
+                "service_type": service["service_type"],
+                "start_date": service["start_date"],
+                "end_date": "2031-01-31",
+                "status": service["status"],
+            }
+        )
+
+    print(f"{args.services} services on one client")
+    print(f"{'update':<16}{'delta bytes':>14}{'ms':>10}")
+    for name, action in (("full resend", full_resend), ("edit one", edit_one)):
+        size, elapsed = await measure(root, action)
+        print(f"{name:<16}{size:>14,}{elapsed * 1000:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=50_000)
+    args = parser.parse_args()
+
+    # The states use the process-wide repository and audit log, so point
+    # them at scratch locations before anything imports them.
+    directory = tempfile.mkdtemp()
+    os.environ["CADASTRO_DB_PATH"] = os.path.join(directory, "delta.db")
+    os.environ["CADASTRO_AUDIT_LOG_DIR"] = os.path.join(directory, "audit")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
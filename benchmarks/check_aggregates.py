@@ -0,0 +1,193 @@
+"""Consistency check of the incrementally maintained dashboard aggregates.
+
+Generates a synthetic portfolio, then drives random mutations through the
+real event handlers: services added, edited (type, status and end date) and
+deleted, contracts deleted with their services, and clients deleted one at a
+time or in bulk. After every round the contract store rolls over to the
+next day, as the daily rollover task does at midnight, then its aggregates
+are rebuilt from the repository with ``ContractStore.check_aggregates`` and
+the dashboard vars compared with counts made by scanning every service.
+
+Exits with status 1 on the first inconsistency. Run from the project root:
+
+    python -m benchmarks.check_aggregates --rounds 20 --mutations 50
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_handlers import _substate, new_session, open_detail_page
+
+
+def expected_dashboard(services: list[dict], today: datetime.date) -> dict:
+    """Counts the dashboard figures on ``today`` by scanning every service."""
+    from app.states.contract_state import SERVICE_OPTIONS, STATUS_OPTIONS
+
+    active = [service for service in services if service["status"] == "ativo"]
+    end_dates = [
+        datetime.date.fromisoformat(service["end_date"])
+        for service in active
+        if service["end_date"]
+    ]
+    return {
+        "total_services": len(active),
+        "renewals_in_30_days": sum(
+            today <= end <= today + datetime.timedelta(days=30) for end in end_dates
+        ),
+        "expired_contracts": sum(end < today for end in end_dates),
+        "active_services_by_type": [
+            {
+                "label": service_type,
+                "count": sum(s["service_type"] == service_type for s in active),
+            }
+            for service_type in SERVICE_OPTIONS
+        ],
+        "services_by_status": [
+            {
+                "label": status,
+                "count": sum(s["status"] == status for s in services),
+            }
+            for status in STATUS_OPTIONS
+        ],
+    }
+
+
+async def mutate(rng: random.Random):
+    """Applies one random mutation through the event handlers."""
+    from app.client_index import get_client_index
+    from app.contract_store import get_contract_store
+    from app.repository import get_repository
+    from app.states.client_state import ClientState
+    from app.states.contract_state import SERVICE_OPTIONS, STATUS_OPTIONS
+
+    store = get_contract_store()
+    client_ids = get_repository().list_client_ids()
+    root = new_session()
+    client_id = rng.choice(client_ids)
+    contracts = store.contracts_for_client(client_id)
+    services = store.services_for_client(client_id)
+    kind = rng.choice(
+        ["add_service", "edit_service", "edit_service", "delete_service"]
+        + ["delete_contract", "delete_client", "bulk_delete"]
+    )
+    end_date = datetime.date.fromordinal(
+        store.today.toordinal() + rng.randint(-90, 400)
+    ).isoformat()
+    if kind == "add_service" and contracts:
+        detail = await open_detail_page(root, client_id)
+        detail.open_add_service_modal(rng.choice(contracts)["id"])
+        await detail.save_service(
+            {
+                "service_type": rng.choice(SERVICE_OPTIONS),
+                "start_date": "2024-01-01",
+                "end_date": end_date,
+                "status": rng.choice(STATUS_OPTIONS),
+            }
+        )
+    elif kind == "edit_service" and services:
+        service = rng.choice(services)
+        detail = await open_detail_page(root, client_id)
+        detail.open_edit_service_modal(service)
+        await detail.save_service(
+            {
+                **service,
+                "service_type": rng.choice(SERVICE_OPTIONS),
+                "status": rng.choice(STATUS_OPTIONS),
+                "end_date": end_date,
+            }
+        )
+    elif kind == "delete_service" and services:
+        detail = await open_detail_page(root, client_id)
+        detail.confirm_delete_service(rng.choice(services)["id"])
+        await detail.delete_service()
+    elif kind == "delete_contract" and contracts:
+        detail = await open_detail_page(root, client_id)
+        detail.confirm_delete_contract(rng.choice(contracts)["id"])
+        await detail.delete_contract()
+    elif kind == "delete_client":
+        client_state = _substate(root, ClientState)
+        client_state.load_clients()
+        client_state.confirm_delete_client(client_id)
+        await client_state.delete_client()
+    elif kind == "bulk_delete":
+        client_state = _substate(root, ClientState)
+        client_state.load_clients()
+        for selected in rng.sample(client_ids, min(3, len(client_ids))):
+            client_state.toggle_client_selection(selected)
+        client_state.confirm_bulk_delete()
+        await client_state.bulk_delete_clients()
+    assert len(get_client_index()) == get_repository().count_clients()
+
+
+async def run(args) -> int:
+    from app.audit_log import get_audit_log
+    from app.contract_store import get_contract_store
+    from app.repository import get_repository
+    from app.states.client_detail_state import ClientDetailState  # noqa: F401
+    from app.states.client_state import ClientState
+    from benchmarks.synthetic import populate
+
+    populate(
+        get_repository(),
+        get_audit_log(),
+        seed=args.seed,
+        clients=args.clients,
+        services=args.services,
+        audit_events=0,
+    )
+    rng = random.Random(args.seed)
+    store = get_contract_store()
+    for round_number in range(1, args.rounds + 1):
+        for _ in range(args.mutations):
+            await mutate(rng)
+        start = time.perf_counter()
+        store.roll_over(store.today + datetime.timedelta(days=1))
+        rollover_ms = (time.perf_counter() - start) * 1000
+        mismatches = store.check_aggregates()
+        client_state = _substate(new_session(), ClientState)
+        client_state.load_dashboard()
+        expected = expected_dashboard(get_repository().list_services(), store.today)
+        for var, value in expected.items():
+            if getattr(client_state, var) != value:
+                mismatches.append(
+                    f"{var}: {getattr(client_state, var)} shown, {value} expected"
+                )
+        if client_state.total_clients != get_repository().count_clients():
+            mismatches.append("total_clients differs from the repository")
+        if mismatches:
+            print(f"round {round_number}: inconsistent")
+            for mismatch in mismatches:
+                print(f"  {mismatch}")
+            return 1
+        print(
+            f"round {round_number}: consistent on {store.today.isoformat()} "
+            f"({client_state.total_clients} clients, "
+            f"{client_state.total_services} active services, "
+            f"rollover {rollover_ms:.2f} ms)"
+        )
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--services", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--mutations", type=int, default=50)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ["CADASTRO_DB_PATH"] = os.path.join(directory, "aggregates.db")
+    os.environ["CADASTRO_AUDIT_LOG_DIR"] = os.path.join(directory, "audit")
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Checks that the login throttle and the hashing cap hold against floods.
+
+Drives ``AuthState.register`` and ``AuthState.login`` on session roots, with
+the request headers a browser behind the app's proxies would send:
+
+- ``client_ip`` ignores ``X-Forwarded-For`` entries the client made up;
+- registering a new username on every request, each with a different
+  spoofed ``X-Forwarded-For``, is rejected once the peer's IP budget is
+  spent, and the rejected usernames are never created;
+- logging in to one username from many addresses is rejected once the
+  username's budget is spent;
+- concurrent registrations from distinct addresses beyond
+  ``MAX_PENDING_HASHES`` are refused rather than queued on the bcrypt pool.
+
+Exits with status 1 on the first failure. Run from the project root:
+
+    python -m benchmarks.check_login_throttle
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+THROTTLED = "Too many attempts. Please try again later."
+BUSY = "Server busy. Please try again later."
+
+
+def check(name: str, condition: bool, detail=""):
+    print(f"{'ok' if condition else 'FAIL':<6}{name}")
+    if not condition:
+        print(f"      {detail}")
+        sys.exit(1)
+
+
+def session(peer: str, forwarded_for: str = ""):
+    """Returns the AuthState of a fresh session connecting from ``peer``."""
+    from reflex.istate.data import RouterData
+    from reflex.state import State
+
+    from app.states.auth_state import AuthState
+
+    root = State(_reflex_internal_init=True)
+    auth = root.get_substate(AuthState.get_full_name().split(".")[1:])
+    headers = {"asgi-scope-client": peer}
+    if forwarded_for:
+        headers["x-forwarded-for"] = forwarded_for
+    auth.router = RouterData.from_router_data({"headers": headers})
+    return auth
+
+
+async def register(auth, username: str) -> str:
+    await auth.register(
+        {"username": username, "password": "s3nha", "confirm_password": "s3nha"}
+    )
+    return auth.error_message
+
+
+async def login(auth, username: str) -> str:
+    async for _ in auth.login({"username": username, "password": "errada"}):
+        pass
+    return auth.error_message
+
+
+async def run():
+    from app.passwords import MAX_PENDING_HASHES
+    from app.rate_limit import IP_BURST, USERNAME_BURST, client_ip
+    from app.repository import get_repository
+
+    spoofed = {"x-forwarded-for": "1.2.3.4", "asgi-scope-client": "10.0.0.9"}
+    check("spoofed X-Forwarded-For ignored", client_ip(spoofed, 0) == "10.0.0.9")
+    proxied = {
+        "x-forwarded-for": "1.2.3.4, 203.0.113.7",
+        "asgi-scope-client": "10.0.0.1",
+    }
+    check(
+        "proxy-appended address used",
+        client_ip(proxied, 1) == "203.0.113.7",
+        client_ip(proxied, 1),
+    )
+
+    repository = get_repository()
+    errors = [
+        await register(session("198.51.100.1", f"10.9.{i}.1"), f"flood-{i}")
+        for i in range(IP_BURST + 5)
+    ]
+    check(
+        "register flood with rotating spoofed IPs throttled",
+        errors[:IP_BURST] == [""] * IP_BURST and errors[IP_BURST:] == [THROTTLED] * 5,
+        errors,
+    )
+    check(
+        "throttled usernames not created",
+        not any(
+            repository.get_user(f"flood-{i}") for i in range(IP_BURST, IP_BURST + 5)
+        ),
+    )
+
+    errors = [
+        await login(session(f"198.51.100.{100 + i}"), "alvo")
+        for i in range(USERNAME_BURST + 3)
+    ]
+    check(
+        "login flood on one username throttled",
+        THROTTLED not in errors[:USERNAME_BURST]
+        and errors[USERNAME_BURST:] == [THROTTLED] * 3,
+        errors,
+    )
+
+    extra = 4
+    errors = await asyncio.gather(
+        *(
+            register(session(f"192.0.2.{i}"), f"burst-{i}")
+            for i in range(MAX_PENDING_HASHES + extra)
+        )
+    )
+    check(
+        "hashes beyond the cap refused",
+        errors.count(BUSY) >= extra and errors.count("") <= MAX_PENDING_HASHES,
+        errors,
+    )
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    os.environ["CADASTRO_DB_PATH"] = os.path.join(directory, "throttle.db")
+    os.environ["CADASTRO_AUDIT_LOG_DIR"] = os.path.join(directory, "audit")
+    os.environ.setdefault("CADASTRO_HASH_WORKERS", "2")
+    # No refill while the check runs, so the budgets are exact.
+    os.environ["CADASTRO_LOGIN_IP_REFILL_SECONDS"] = "3600"
+    os.environ["CADASTRO_LOGIN_USERNAME_REFILL_SECONDS"] = "3600"
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Consistency check for several backend workers sharing one database.
+
+Starts two worker processes on a scratch database and audit log directory,
+each with its own process-wide repository, client index, contract store and
+audit index, like two Uvicorn workers behind a load balancer. Requests are
+sent to one worker and their effect checked on the other:
+
+- a user registered on A logs in on B;
+- a client with a contract and a service created on A is found on B;
+- a service edited on B shows its new end date on A;
+- audit events appended on both are indexed by both, in the same order;
+- an export link signed on A verifies on B.
+
+Exits with status 1 on the first inconsistency. Run from the project root:
+
+    python -m benchmarks.check_multi_worker
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import uuid
+
+
+async def _handle(command: str, *args):
+    from reflex.state import State
+
+    from app.audit_index import get_audit_index
+    from app.audit_log import get_audit_log
+    from app.client_index import get_client_index
+    from app.contract_store import get_contract_store
+    from app.signing import sign, verify
+    from app.states.audit_state import AuditState
+    from app.states.auth_state import AuthState
+    from app.sync import get_cache_sync
+
+    # What the middleware does before every event.
+    get_cache_sync().sync()
+    root = State(_reflex_internal_init=True)
+    auth = root.get_substate(AuthState.get_full_name().split(".")[1:])
+    if command == "register":
+        username, password = args
+        await auth.register(
+            {"username": username, "password": password, "confirm_password": password}
+        )
+        return auth.authenticated_user or auth.error_message
+    if command == "login":
+        username, password = args
+        async for _ in auth.login({"username": username, "password": password}):
+            pass
+        return auth.authenticated_user or auth.error_message
+    if command == "add_client":
+        client, contract, service = args
+        get_contract_store().add_many([contract], [service], [client])
+        get_client_index().add(client)
+        return True
+    if command == "find_client":
+        name, client_id = args
+        ids = get_client_index().search(name) or []
+        services = get_contract_store().services_for_client(client_id)
+        return client_id in ids, [service["id"] for service in services]
+    if command == "get_service":
+        return get_contract_store().get_service(args[0])
+    if command == "update_service":
+        get_contract_store().update_service(args[0])
+        return True
+    if command == "audit":
+        audit = root.get_substate(AuditState.get_full_name().split(".")[1:])
+        for details in args:
+            await audit.add_event("check", "update", "", "", details)
+        return True
+    if command == "audit_events":
+        audit_log = get_audit_log()
+        index = get_audit_index()
+        return len(index), [event["details"] for event in audit_log.tail(len(index))]
+    if command == "sign":
+        return sign(args[0], 60)
+    if command == "verify":
+        return verify(args[0])
+    raise ValueError(f"Unknown command {command}")
+
+
+def _worker(directory: str, requests, responses):
+    os.environ["CADASTRO_DB_PATH"] = os.path.join(directory, "shared.db")
+    os.environ["CADASTRO_AUDIT_LOG_DIR"] = os.path.join(directory, "audit")
+    loop = asyncio.new_event_loop()
+    for command, args in iter(requests.get, None):
+        responses.put(loop.run_until_complete(_handle(command, *args)))
+
+
+class Worker:
+    def __init__(self, context, directory: str):
+        self._requests = context.Queue()
+        self._responses = context.Queue()
+        self.process = context.Process(
+            target=_worker, args=(directory, self._requests, self._responses)
+        )
+        self.process.start()
+
+    def __call__(self, command: str, *args):
+        self._requests.put((command, args))
+        return self._responses.get(timeout=60)
+
+    def stop(self):
+        self._requests.put(None)
+        self.process.join()
+
+
+def check(name: str, condition: bool, detail=""):
+    print(f"{'ok' if condition else 'FAIL':<6}{name}")
+    if not condition:
+        print(f"      {detail}")
+        sys.exit(1)
+
+
+def main():
+    context = multiprocessing.get_context("spawn")
+    directory = tempfile.mkdtemp()
+    a, b = Worker(context, directory), Worker(context, directory)
+    try:
+        registered = a("register", "maria", "s3nha-forte")
+        check("register on A", registered == "maria", registered)
+        logged_in = b("login", "maria", "s3nha-forte")
+        check("login on B", logged_in == "maria", logged_in)
+
+        client_id = str(uuid.uuid4())
+        contract_id = str(uuid.uuid4())
+        service_id = str(uuid.uuid4())
+        client = {
+            "id": client_id,
+            "company_name": "Padaria Multiworker",
+            "contact_person": "Maria",
+            "contact_email": "maria@example.com",
+            "datadog_channel": "Enterprise",
+            "bw_account_manager": "Camila Nogueira",
+            "notes": "",
+        }
+        contract = {
+            "id": contract_id,
+            "client_id": client_id,
+            "contract_number": "CT-1",
+            "status": "ativo",
+            "notes": "",
+        }
+        service = {
+            "id": service_id,
+            "contract_id": contract_id,
+            "service_type": "TAM",
+            "start_date": "2025-01-01",
+            "end_date": "2026-01-01",
+            "status": "ativo",
+            "tam_hours": 10,
+            "support_type": None,
+            "licensing_provider": None,
+        }
+        a("add_client", client, contract, service)
+        found, service_ids = b("find_client", "Multiworker", client_id)
+        check("client created on A found on B", found, (found, service_ids))
+        check("its service visible on B", service_ids == [service_id], service_ids)
+
+        b("update_service", {**service, "end_date": "2027-06-30"})
+        end_date = a("get_service", service_id)["end_date"]
+        check("service edited on B updated on A", end_date == "2027-06-30", end_date)
+
+        a("audit", "a-1", "a-2")
+        b("audit", "b-1")
+        a("audit", "a-3")
+        events_a, events_b = a("audit_events"), b("audit_events")
+        check(
+            "audit events indexed alike on A and B",
+            events_a == events_b and events_a[0] == 4,
+            (events_a, events_b),
+        )
+
+        token = a("sign", {"format": "csv", "user": "maria"})
+        payload = b("verify", token)
+        check("link signed on A verifies on B", bool(payload), payload)
+    finally:
+        a.stop()
+        b.stop()
+
+
+if __name__ == "__main__":
+    main()
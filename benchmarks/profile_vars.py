@@ -0,0 +1,113 @@
+"""Computed-var recompute profile of a scripted browsing session.
+
+Generates a synthetic portfolio, enables the profiler from
+``app.var_profiler`` and replays a typical session as real events through
+Reflex's event processing. The events cover the dashboard, the client list
+(search, sort, paging, selection), a client's detail page with a service
+edit, and the audit trail. Each event is tagged by the profiler middleware.
+Prints the ranked report; vars with many unchanged recomputes on unrelated
+events are the ones to look at.
+
+Run from the project root:
+
+    python -m benchmarks.profile_vars --clients 2000 --services 20000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+
+
+async def run(args):
+    from reflex.event import Event
+    from reflex.istate.data import RouterData
+    from reflex.state import State
+
+    from app.audit_log import get_audit_log
+    from app.contract_store import get_contract_store
+    from app.repository import get_repository
+    from app.states.audit_state import AuditState
+    from app.states.auth_state import AuthState
+    from app.states.base_state import BaseState
+    from app.states.client_detail_state import ClientDetailState
+    from app.states.client_state import ClientState
+    from app.var_profiler import (
+        VarProfileMiddleware,
+        enable_var_profiling,
+        var_profile,
+    )
+    from benchmarks.synthetic import populate
+
+    clients, _, _ = populate(
+        get_repository(),
+        get_audit_log(),
+        seed=args.seed,
+        clients=args.clients,
+        services=args.services,
+        audit_events=args.audit_events,
+    )
+    enable_var_profiling()
+    middleware = VarProfileMiddleware()
+    root = State(_reflex_internal_init=True)
+    auth = root.get_substate(AuthState.get_full_name().split(".")[1:])
+    auth.authenticated_user = "bench"
+
+    async def fire(state_class, handler: str, **payload):
+        event = Event(
+            token="profile",
+            name=f"{state_class.get_full_name()}.{handler}",
+            payload=payload,
+        )
+        await middleware.preprocess(None, root, event)
+        async for _ in root._process(event):
+            pass
+
+    client = clients[0]
+    service = get_contract_store().services_for_client(client["id"])[0]
+    for _ in range(args.rounds):
+        await fire(BaseState, "require_login")
+        await fire(ClientState, "load_dashboard")
+        await fire(ClientState, "load_clients")
+        await fire(ClientState, "set_client_search", value="horizonte")
+        await fire(ClientState, "sort_clients", column="company_name")
+        await fire(ClientState, "next_clients_page")
+        await fire(ClientState, "toggle_client_selection", client_id=client["id"])
+        await fire(ClientState, "clear_selection")
+        await fire(ClientState, "set_client_search", value="")
+        detail = root.get_substate(ClientDetailState.get_full_name().split(".")[1:])
+        detail.router = RouterData.from_router_data(
+            {"query": {"client_id": client["id"]}}
+        )
+        await fire(ClientDetailState, "load_client_details")
+        await fire(ClientDetailState, "open_edit_service_modal", service=service)
+        await fire(
+            ClientDetailState,
+            "save_service",
+            form_data={**service, "end_date": "2031-01-31"},
+        )
+        await fire(AuditState, "load_audit_events")
+        await fire(AuditState, "set_search_query", value="suporte")
+        await fire(AuditState, "older_audit_events")
+        await fire(AuditState, "set_search_query", value="")
+    print(var_profile.report())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--services", type=int, default=20_000)
+    parser.add_argument("--audit-events", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    os.environ["CADASTRO_DB_PATH"] = os.path.join(directory, "profile.db")
+    os.environ["CADASTRO_AUDIT_LOG_DIR"] = os.path.join(directory, "audit")
+    os.environ["CADASTRO_VAR_PROFILE_REPORT"] = os.path.join(directory, "report.txt")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
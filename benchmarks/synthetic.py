@@ -0,0 +1,266 @@
+"""Deterministic synthetic portfolios for benchmarks.
+
+The same seed and anchor date always produce the same clients, contracts,
+services and audit events, ids included. Values come from the options the
+forms offer (``SERVICE_OPTIONS``, ``STATUS_OPTIONS``, account managers and
+Datadog channels) with the weights below; end dates are spread from a year
+before the anchor date to two years after it, so every renewal bucket is
+populated.
+
+The app modules read ``CADASTRO_DB_PATH`` and ``CADASTRO_AUDIT_LOG_DIR`` on
+import, so benchmarks set them before importing this module. To write a
+portfolio to a database and audit log directory of your choice:
+
+    python -m benchmarks.synthetic --db scratch.db --audit-dir scratch_audit
+"""
+
+import argparse
+import datetime
+import random
+import time
+import unicodedata
+import uuid
+from typing import Iterator, Optional
+
+from app.audit_log import AuditLog
+from app.repository import Repository
+from app.states.client_state import AM_OPTIONS, DATADOG_CHANNEL_OPTIONS
+from app.states.contract_state import (
+    LICENSING_PROVIDER_OPTIONS,
+    SERVICE_OPTIONS,
+    STATUS_OPTIONS,
+    SUPPORT_TYPE_OPTIONS,
+)
+
+SERVICE_WEIGHTS = {
+    "Licenciamento": 24,
+    "Suporte": 22,
+    "Gestão Cloud": 14,
+    "Atendimento 24x7": 10,
+    "TAM": 9,
+    "Onboarding": 8,
+    "Assessment": 8,
+    "Alocação de Recurso": 5,
+}
+STATUS_WEIGHTS = {"ativo": 80, "inativo": 12, "cancelado": 8}
+AUDIT_ACTION_WEIGHTS = {"update": 70, "create": 22, "delete": 8}
+AUDIT_USERS = 25
+AUDIT_BATCH_SIZE = 10_000
+
+_COMPANY_WORDS = (
+    "Alfa", "Atlântica", "Boa Vista", "Cerrado", "Delta", "Estrela", "Horizonte",
+    "Ipê", "Jequitibá", "Litoral", "Mantiqueira", "Nordeste", "Pampa", "Paraná",
+    "Planalto", "Rio Claro", "Serra Azul", "Sol Nascente", "Tocantins", "Vale Verde",
+)
+_COMPANY_SECTORS = (
+    "Alimentos", "Logística", "Tecnologia", "Varejo", "Seguros", "Engenharia",
+    "Saúde", "Energia", "Educação", "Agronegócio", "Financeira", "Telecom",
+)
+_COMPANY_SUFFIXES = ("Ltda", "S.A.", "ME", "Eireli", "Holding")
+_FIRST_NAMES = (
+    "Ana", "Bruno", "Camila", "Diego", "Eduarda", "Felipe", "Gabriela", "Heitor",
+    "Isabela", "João", "Larissa", "Marcos", "Natália", "Otávio", "Patrícia",
+    "Rafael", "Sofia", "Thiago", "Vitória", "Wagner",
+)
+_LAST_NAMES = (
+    "Almeida", "Barbosa", "Cardoso", "Costa", "Ferreira", "Gomes", "Lima",
+    "Martins", "Oliveira", "Pereira", "Ribeiro", "Rodrigues", "Santos", "Souza",
+)
+
+assert set(SERVICE_WEIGHTS) == set(SERVICE_OPTIONS)
+assert set(STATUS_WEIGHTS) == set(STATUS_OPTIONS)
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _ascii(text: str) -> str:
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore")
+    return folded.decode("ascii").lower().replace(" ", "")
+
+
+def _weighted(rng: random.Random, weights: dict[str, int], k: int) -> list[str]:
+    return rng.choices(list(weights), list(weights.values()), k=k)
+
+
+def generate_portfolio(
+    seed: int = 42,
+    clients: int = 10_000,
+    contracts_per_client: int = 5,
+    services: int = 100_000,
+    anchor: Optional[datetime.date] = None,
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """Returns ``(clients, contracts, services)`` rows ready for the repository.
+
+    Services are spread over the contracts at random, so some contracts get
+    several and some none. ``anchor`` (today by default) is the date end
+    dates are spread around.
+    """
+    rng = random.Random(seed)
+    anchor = anchor or datetime.date.today()
+    client_rows = []
+    for i in range(clients):
+        first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+        company = (
+            f"{rng.choice(_COMPANY_WORDS)} {rng.choice(_COMPANY_SECTORS)} "
+            f"{rng.choice(_COMPANY_SUFFIXES)}"
+        )
+        client_rows.append(
+            {
+                "id": _uuid(rng),
+                "company_name": f"{company} {i}",
+                "contact_person": f"{first} {last}",
+                "contact_email": f"{_ascii(first)}.{_ascii(last)}{i}@example.com.br",
+                "datadog_channel": rng.choice(DATADOG_CHANNEL_OPTIONS),
+                "bw_account_manager": rng.choice(AM_OPTIONS),
+                "notes": "",
+            }
+        )
+    contract_rows = []
+    for client in client_rows:
+        statuses = _weighted(rng, STATUS_WEIGHTS, contracts_per_client)
+        for n, status in enumerate(statuses, start=1):
+            year = anchor.year - rng.randrange(5)
+            contract_rows.append(
+                {
+                    "id": _uuid(rng),
+                    "client_id": client["id"],
+                    "contract_number": f"CT-{year}-{n:03d}",
+                    "status": status,
+                    "notes": "",
+                }
+            )
+    service_rows = []
+    service_types = _weighted(rng, SERVICE_WEIGHTS, services)
+    statuses = _weighted(rng, STATUS_WEIGHTS, services)
+    for service_type, status in zip(service_types, statuses):
+        end = anchor + datetime.timedelta(days=rng.randint(-365, 730))
+        start = end - datetime.timedelta(days=365 * rng.randint(1, 3))
+        service_rows.append(
+            {
+                "id": _uuid(rng),
+                "contract_id": rng.choice(contract_rows)["id"],
+                "service_type": service_type,
+                "start_date": start.isoformat(),
+                "end_date": end.isoformat(),
+                "status": status,
+                "tam_hours": rng.choice((10, 20, 40, 80))
+                if service_type == "TAM"
+                else None,
+                "support_type": rng.choice(SUPPORT_TYPE_OPTIONS)
+                if service_type == "Suporte"
+                else None,
+                "licensing_provider": rng.choice(LICENSING_PROVIDER_OPTIONS)
+                if service_type == "Licenciamento"
+                else None,
+            }
+        )
+    return client_rows, contract_rows, service_rows
+
+
+def generate_audit_events(
+    clients: list[dict],
+    count: int = 1_000_000,
+    seed: int = 42,
+    anchor: Optional[datetime.date] = None,
+) -> Iterator[dict]:
+    """Yields ``count`` audit events about ``clients``, oldest first.
+
+    Events are one minute apart and end at midnight of the anchor date.
+    """
+    rng = random.Random(seed + 1)
+    anchor = anchor or datetime.date.today()
+    end = datetime.datetime.combine(anchor, datetime.time(), datetime.timezone.utc)
+    users = [
+        f"{_ascii(rng.choice(_FIRST_NAMES))}.{_ascii(rng.choice(_LAST_NAMES))}"
+        for _ in range(AUDIT_USERS)
+    ]
+    for i, action in enumerate(_weighted(rng, AUDIT_ACTION_WEIGHTS, count)):
+        client = rng.choice(clients)
+        service = rng.choice(SERVICE_OPTIONS)
+        details = {
+            "create": f"Serviço '{service}' adicionado.",
+            "update": f"Serviço '{service}' atualizado.",
+            "delete": f"Serviço '{service}' foi excluído.",
+        }[action]
+        yield {
+            "id": _uuid(rng),
+            "timestamp": (
+                end - datetime.timedelta(minutes=count - i)
+            ).isoformat(),
+            "user": rng.choice(users),
+            "action": action,
+            "client_id": client["id"],
+            "client_name": client["company_name"],
+            "details": details,
+        }
+
+
+def write_audit_events(audit_log: AuditLog, events: Iterator[dict]) -> int:
+    """Appends events to the log in batches; returns how many were written."""
+    written = 0
+    batch = []
+    for event in events:
+        batch.append(event)
+        if len(batch) == AUDIT_BATCH_SIZE:
+            written += len(audit_log.append_many(batch))
+            batch = []
+    written += len(audit_log.append_many(batch))
+    return written
+
+
+def populate(
+    repository: Repository,
+    audit_log: AuditLog,
+    seed: int = 42,
+    clients: int = 10_000,
+    contracts_per_client: int = 5,
+    services: int = 100_000,
+    audit_events: int = 1_000_000,
+    anchor: Optional[datetime.date] = None,
+) -> tuple[list[dict], list[dict], list[dict]]:
+    """Writes a generated portfolio and audit trail; returns the portfolio rows."""
+    portfolio = generate_portfolio(
+        seed, clients, contracts_per_client, services, anchor
+    )
+    client_rows, contract_rows, service_rows = portfolio
+    repository.insert_many(client_rows, contract_rows, service_rows)
+    write_audit_events(
+        audit_log, generate_audit_events(client_rows, audit_events, seed, anchor)
+    )
+    return portfolio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", required=True)
+    parser.add_argument("--audit-dir", required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--contracts-per-client", type=int, default=5)
+    parser.add_argument("--services", type=int, default=100_000)
+    parser.add_argument("--audit-events", type=int, default=1_000_000)
+    parser.add_argument("--anchor", type=datetime.date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    repository = Repository(args.db)
+    audit_log = AuditLog(args.audit_dir)
+    populate(
+        repository,
+        audit_log,
+        args.seed,
+        args.clients,
+        args.contracts_per_client,
+        args.services,
+        args.audit_events,
+        args.anchor,
+    )
+    audit_log.close()
+    repository.close()
+    print(f"Generated in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()